@@ -0,0 +1,107 @@
+"""
+动作执行线程基准：调用线程（GUI）每次分发被占用的时间，inline（原行为）vs 执行线程。
+用带固定耗时的 null 后端模拟注入开销（按键/组合键/点击各 --key-ms，滚动每次 --scroll-ms），
+事件流为 --rate Hz 的连续滚动，每隔若干事件插入一次组合键/点击。
+同时检查滚动合并后总滚动量不变，并给出各动作类型的排队/执行耗时与丢弃/合并计数。
+
+用法：python -m bench.bench_action_executor [--events 600] [--rate 120] [--key-ms 8] [--scroll-ms 2]
+                                              [--queue 64] [--overflow drop_oldest]
+"""
+import argparse
+import time
+
+from config_io import DEFAULT_CONFIG_PATH, load_config
+from control.action_executor import ActionExecutor
+from control.app_context import FakeAppProvider
+from control.dispatcher import Dispatcher
+from control.input_backend import NullBackend
+from control.state import SystemState
+
+
+class _SlowBackend(NullBackend):
+    def __init__(self, key_ms, scroll_ms):
+        super().__init__()
+        self.key_s = key_ms / 1000.0
+        self.scroll_s = scroll_ms / 1000.0
+        self.scrolled = 0
+
+    def scroll(self, amount):
+        super().scroll(amount)
+        self.scrolled += int(amount)
+        time.sleep(self.scroll_s)
+
+    def hotkey(self, *keys):
+        self.calls += 1
+        time.sleep(self.key_s)
+
+    def press_key(self, key):
+        self.calls += 1
+        time.sleep(self.key_s)
+
+    def click(self, button="left", count=1):
+        super().click(button, count)
+        time.sleep(self.key_s)
+
+
+def _run(cfg, events, rate, backend, executor):
+    state = SystemState()
+    if executor is not None:
+        executor.state = state
+    disp = Dispatcher(cfg, state, backend, FakeAppProvider(None), executor=executor)
+    step = 1.0 / rate
+    busy = []
+    t_next = time.perf_counter()
+    for g, extra in events:
+        t0 = time.perf_counter()
+        disp.dispatch(g, 0, extra)
+        busy.append((time.perf_counter() - t0) * 1000.0)
+        t_next += step
+        time.sleep(max(0.0, t_next - time.perf_counter()))
+    if executor is not None:
+        while executor.depth():
+            time.sleep(0.005)
+        time.sleep(0.05)
+    busy.sort()
+    return busy
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    ap.add_argument("--events", type=int, default=600)
+    ap.add_argument("--rate", type=float, default=120.0)
+    ap.add_argument("--key-ms", type=float, default=8.0)
+    ap.add_argument("--scroll-ms", type=float, default=2.0)
+    ap.add_argument("--queue", type=int, default=64)
+    ap.add_argument("--overflow", default="drop_oldest")
+    args = ap.parse_args()
+
+    cfg = load_config(args.config)
+    g = cfg["bindings"]["global"]
+    g.setdefault("__SCROLL_V__", {"type": "scroll_v", "amount": 1})
+    statics = [k for k, a in g.items() if a.get("type") in ("hotkey", "key", "click_right", "double_click_left")]
+    events = [(statics[(i // 15) % len(statics)], None) if i % 15 == 0 else ("__SCROLL_V__", {"amount": 1 + i % 3})
+              for i in range(args.events)]
+    expected = sum(e[1]["amount"] for e in events if e[1])
+
+    for name in ("inline", "executor"):
+        be = _SlowBackend(args.key_ms, args.scroll_ms)
+        ex = None
+        if name == "executor":
+            ex = ActionExecutor(be, None, maxsize=args.queue, overflow=args.overflow)
+            ex.start()
+        busy = _run(cfg, events, args.rate, be, ex)
+        p99 = busy[min(len(busy) - 1, int(0.99 * len(busy)))]
+        print(f"{name:<9} 调用线程占用 mean={sum(busy) / len(busy):6.3f} ms  p99={p99:6.3f} ms  max={busy[-1]:6.3f} ms  "
+              f"滚动量 {be.scrolled}/{expected}  注入调用 {be.calls}")
+        if ex is not None:
+            ex.stop()
+            print(f"{'':<9} 队列最大深度 {ex.max_depth}")
+            for t, st in ex.stats().items():
+                print(f"{'':<9} {t:<20} n={st['count']:4d} wait avg/max={st['avg_wait_ms']:6.2f}/{st['max_wait_ms']:6.2f} ms  "
+                      f"run avg/max={st['avg_run_ms']:6.2f}/{st['max_run_ms']:6.2f} ms  "
+                      f"drop={st['dropped']} merge={st['coalesced']}")
+
+
+if __name__ == "__main__":
+    main()
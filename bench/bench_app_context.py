@@ -0,0 +1,101 @@
+"""
+前台应用查询基准：Dispatcher.resolve_action 在一段以捏合滚动为主的事件流上的耗时与系统查询次数。
+对比：
+  legacy  每次 resolve 都查前台应用（旧实现的行为，TTL=0 且不跳过）
+  cached  只在手势有 per_app 覆盖时查询，且查询结果在 TTL 内复用
+fake provider 无系统依赖，用 --lookup-us 模拟一次前台查询（句柄 + 进程名）的耗时；
+若本机 auto provider 可用，另外测一次真实查询（缓存失效时）的耗时。
+
+用法：python -m bench.bench_app_context [--events 20000] [--rate 60] [--lookup-us 150] [--config ...]
+"""
+import argparse
+import time
+
+from config_io import DEFAULT_CONFIG_PATH, load_config
+from control.app_context import FakeAppProvider, make_app_provider
+from control.dispatcher import Dispatcher
+from control.input_backend import NullBackend
+
+
+class _SlowFake(FakeAppProvider):
+    """每次真正查询前台窗口时忙等 lookup_us，模拟 win32 + psutil 的开销。"""
+    def __init__(self, app, ttl_ms, lookup_us):
+        super().__init__(app, ttl_ms)
+        self.lookup_us = lookup_us
+
+    def _foreground(self):
+        t_end = time.perf_counter() + self.lookup_us / 1e6
+        while time.perf_counter() < t_end:
+            pass
+        return super()._foreground()
+
+
+def _events(n):
+    """约 90% 滚动，其余为静态/挥动手势（含有 per_app 覆盖的 SWIPE_*）。"""
+    rare = ["SWIPE_LEFT", "SWIPE_RIGHT", "FIST", "OPEN_PALM", "INDEX_Z"]
+    return ["__SCROLL_V__" if i % 10 else rare[(i // 10) % len(rare)] for i in range(n)]
+
+
+def _run(disp, events, rate):
+    """按 rate Hz 的时间线推进（只推进 provider 看到的时钟，不真的 sleep）。"""
+    p = disp.app_provider
+    step = 1.0 / rate
+    clock = [time.monotonic()]
+    real = time.monotonic
+    time.monotonic = lambda: clock[0]
+    try:
+        t0 = time.perf_counter()
+        for g in events:
+            disp.resolve_action(g)
+            clock[0] += step
+        dt = time.perf_counter() - t0
+    finally:
+        time.monotonic = real
+    return dt / len(events) * 1e6, p.lookups
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    ap.add_argument("--events", type=int, default=20000)
+    ap.add_argument("--rate", type=float, default=60.0, help="事件频率（Hz）")
+    ap.add_argument("--lookup-us", type=float, default=150.0)
+    ap.add_argument("--ttl-ms", type=float, default=250.0)
+    args = ap.parse_args()
+
+    cfg = load_config(args.config)
+    apps = list(cfg["bindings"].get("per_app", {}).keys())
+    app = apps[0] if apps else "app.exe"
+    events = _events(args.events)
+
+    legacy = Dispatcher(cfg, None, NullBackend(), _SlowFake(app, 0.0, args.lookup_us))
+
+    def resolve_every_time(g):
+        # 旧实现：无条件查询前台应用
+        b = legacy.config.get("bindings", {})
+        per_app = b.get("per_app", {})
+        a = legacy.app_provider.current()
+        if a and a in per_app and g in per_app[a]:
+            return per_app[a][g]
+        return b.get("global", {}).get(g)
+    legacy.resolve_action = resolve_every_time
+    cached = Dispatcher(cfg, None, NullBackend(), _SlowFake(app, args.ttl_ms, args.lookup_us))
+
+    for name, disp in (("legacy", legacy), ("cached", cached)):
+        us, lookups = _run(disp, events, args.rate)
+        print(f"{name:<8} resolve={us:7.2f} us/次  前台查询 {lookups}/{len(events)} 次")
+
+    real = make_app_provider(cfg["general"])
+    if type(real) is not FakeAppProvider:
+        iters = 200
+        t0 = time.perf_counter()
+        for _ in range(iters):
+            real.invalidate()
+            real.current()
+        print(f"{real.name:<8} TTL 过期后一次轮询（窗口未切换） {(time.perf_counter() - t0) / iters * 1e6:7.1f} us  当前={real.current()!r}")
+    else:
+        print("本机没有可用的真实前台应用查询（缺少 win32 / Xlib 或无图形会话）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+自定义模板匹配基准：
+  1) 预编译 (K,64,2) 张量一次向量化打分 vs 旧的逐模板循环；
+  2) euclidean vs protractor：耗时、提前放弃比例、倾斜/起笔角度变化下的识别率。
+
+用法：python -m bench.bench_custom_match [--iters 200]
+"""
+import argparse
+import copy
+import time
+
+import numpy as np
+
+from vision.custom_gestures import CustomGestureManager
+from vision.trajectory import normalize_trajectory, template_distance
+
+
+def legacy_match(cfg, mode, raw_points, threshold):
+    """旧实现：每次调用把 JSON 列表转成数组，逐个模板计算距离，仅用于对比。"""
+    norm = normalize_trajectory(raw_points, n=64)
+    if norm is None:
+        return None
+    best_id, best_dist = None, 1e9
+    for g in cfg.get("custom_gestures", []):
+        if g.get("type") != "dynamic_template":
+            continue
+        if g.get("mode") not in (mode, "both"):
+            continue
+        d = template_distance(norm, np.array(g.get("template", []), dtype=np.float32))
+        if d < best_dist:
+            best_dist, best_id = d, g.get("id")
+    if best_id and best_dist <= threshold:
+        return best_id, float(best_dist)
+    return None
+
+
+def _walk(rng, n):
+    return np.cumsum(rng.normal(0, 5, size=(n, 2)), axis=0) + 300
+
+
+def _shape(kind, rng):
+    """合成几类常见轨迹（圆、V、Z、L、勾）。"""
+    t = np.linspace(0, 1, 40)
+    if kind == "CIRCLE":
+        a = 2 * np.pi * t + rng.uniform(-0.4, 0.4)
+        return np.stack([np.cos(a), np.sin(a)], axis=1) * 100
+    knots = {
+        "V": [(0, 0), (50, 100), (100, 0)],
+        "Z": [(0, 0), (100, 0), (0, 100), (100, 100)],
+        "L": [(0, 0), (0, 100), (60, 100)],
+        "CHECK": [(0, 50), (30, 100), (100, 0)],
+    }[kind]
+    k = np.asarray(knots, dtype=np.float64)
+    u = np.linspace(0, len(k) - 1, 40)
+    return np.stack([np.interp(u, np.arange(len(k)), k[:, 0]),
+                     np.interp(u, np.arange(len(k)), k[:, 1])], axis=1)
+
+
+def _rotate(p, deg):
+    a = np.radians(deg)
+    r = np.array([[np.cos(a), -np.sin(a)], [np.sin(a), np.cos(a)]])
+    return p @ r.T
+
+
+def compare_matchers(iters):
+    rng = np.random.default_rng(7)
+    kinds = ["CIRCLE", "V", "Z", "L", "CHECK"]
+    print("\neuclidean vs protractor (threshold=0.32, protractor_max_rotation_deg=45)")
+
+    cfg = {"general": {"protractor_max_rotation_deg": 45}, "custom_gestures": []}
+    mgr = CustomGestureManager(cfg)
+    for kd in kinds:
+        mgr.add_template(kd, "bare", _shape(kd, rng))
+
+    for tilt in (0, 15, 30):
+        hit = {"euclidean": 0, "protractor": 0}
+        n = 0
+        for kd in kinds:
+            for _ in range(40):
+                q = _rotate(_shape(kd, rng), rng.uniform(-tilt, tilt) if tilt else 0.0)
+                q = q * rng.uniform(0.6, 1.4) + rng.normal(0, 2.5, size=q.shape)
+                n += 1
+                for m in hit:
+                    r = mgr.match("bare", q, threshold=0.32, matcher=m)
+                    hit[m] += int(r is not None and r[0] == kd)
+        print(f"  tilt ±{tilt:>2} deg: recall euclidean={hit['euclidean'] / n:5.1%}  "
+              f"protractor={hit['protractor'] / n:5.1%}")
+
+    # 模板库很大时的耗时与提前放弃比例
+    for k in (100, 1000):
+        for i in range(k):
+            mgr.add_template(f"N{i}", "bare", _walk(rng, 30))
+        q = _rotate(_shape("Z", rng), 10)
+        for m in ("euclidean", "protractor"):
+            mgr.stats = {"scored": 0, "abandoned": 0}
+            t0 = time.perf_counter()
+            for _ in range(iters):
+                mgr.match("bare", q, threshold=0.32, matcher=m)
+            ms = (time.perf_counter() - t0) / iters * 1e3
+            extra = ""
+            if m == "protractor":
+                extra = f"  abandoned={mgr.stats['abandoned'] / max(1, mgr.stats['scored']):5.1%}"
+            print(f"  K={len(mgr.list_ids('bare')):>5} {m:<10}: {ms:7.3f} ms/match{extra}")
+        cfg["custom_gestures"] = [g for g in cfg["custom_gestures"] if g["id"] in kinds]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iters", type=int, default=200)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = [_walk(rng, int(rng.integers(20, 40))) for _ in range(16)]
+    for k in (1, 10, 100, 300, 1000):
+        cfg = {"custom_gestures": []}
+        mgr = CustomGestureManager(cfg)
+        for i in range(k):
+            mgr.add_template(f"G{i}", ("bare", "glove", "both")[i % 3], _walk(rng, 30))
+        ref = copy.deepcopy(cfg)
+
+        for q in queries:
+            a = legacy_match(ref, "bare", q, 10.0)
+            b = mgr.match("bare", q, threshold=10.0)
+            assert (a is None) == (b is None), (a, b)
+            if a is not None:
+                assert a[0] == b[0] and abs(a[1] - b[1]) < 1e-5, (a, b)
+
+        t0 = time.perf_counter()
+        for i in range(args.iters):
+            legacy_match(ref, "bare", queries[i % len(queries)], 0.32)
+        t1 = time.perf_counter()
+        for i in range(args.iters):
+            mgr.match("bare", queries[i % len(queries)], threshold=0.32)
+        t2 = time.perf_counter()
+        old = (t1 - t0) / args.iters * 1e3
+        new = (t2 - t1) / args.iters * 1e3
+        print(f"K={k:>5}: batched={new:7.3f} ms  legacy={old:7.3f} ms  speedup={old / new:5.1f}x")
+
+    compare_matchers(args.iters)
+
+
+if __name__ == "__main__":
+    main()
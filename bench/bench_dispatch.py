@@ -0,0 +1,68 @@
+"""
+动作分发基准：每次分发的耗时（null 后端，只计分发本身）。
+  legacy    旧实现：逐层查 bindings 字典、带动态字段时 dict(action) 复制合并，再按类型 if/elif 执行
+  compiled  预编译绑定表：一次字典查找 + 处理函数调用，动态字段原样交给处理函数
+事件流为连续滚动（__SCROLL_V__，带 amount）与静态手势交替。
+
+用法：python -m bench.bench_dispatch [--events 50000] [--config ...]
+"""
+import argparse
+import time
+
+from config_io import DEFAULT_CONFIG_PATH, load_config
+from control.actions import do_action
+from control.app_context import FakeAppProvider
+from control.dispatcher import Dispatcher
+from control.input_backend import NullBackend
+from control.state import SystemState
+
+
+def _legacy_dispatch(disp, gesture_name, extra_payload=None):
+    b = disp.config.get("bindings", {})
+    per_app = b.get("per_app", {})
+    glob = b.get("global", {})
+    app = disp.app_provider.current()
+    if app and app in per_app and gesture_name in per_app[app]:
+        action = per_app[app][gesture_name]
+    else:
+        action = glob.get(gesture_name)
+    if not action:
+        return None
+    if extra_payload:
+        merged = dict(action)
+        merged.update(extra_payload)
+        action = merged
+    do_action(action, disp.state, disp.backend)
+    return action
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    ap.add_argument("--events", type=int, default=50000)
+    args = ap.parse_args()
+
+    cfg = load_config(args.config)
+    cfg["bindings"]["global"].setdefault("__SCROLL_V__", {"type": "scroll_v", "amount": 1})
+    # TTL 足够长：两边都只比较分发本身，不含前台应用查询
+    disp = Dispatcher(cfg, SystemState(), NullBackend(), FakeAppProvider("other.exe", ttl_ms=1e9))
+    if disp.binding_errors:
+        print("无效绑定：", disp.binding_errors)
+
+    payloads = [{"amount": (i % 7) - 3 or 1} for i in range(64)]
+    statics = ["SWIPE_UP", "SWIPE_DOWN", "PINCH_RIGHT_CLICK", "THUMBS_UP"]
+    events = [("__SCROLL_V__", payloads[i % 64]) if i % 4 else (statics[(i // 4) % 4], None)
+              for i in range(args.events)]
+
+    for name, fn in (("legacy", lambda g, p: _legacy_dispatch(disp, g, p)),
+                     ("compiled", lambda g, p: disp.dispatch(g, 0, p))):
+        for g, p in events[:1000]:
+            fn(g, p)
+        t0 = time.perf_counter()
+        for g, p in events:
+            fn(g, p)
+        print(f"{name:<9} {(time.perf_counter() - t0) / len(events) * 1e6:6.2f} us/次")
+
+
+if __name__ == "__main__":
+    main()
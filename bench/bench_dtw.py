@@ -0,0 +1,107 @@
+"""
+DTW 匹配器基准与准确率对比（euclidean / protractor / dtw）。
+
+默认使用合成轨迹：各段相对长短随机伸缩、起笔处停顿、叠加抖动；
+也可用录制数据：--npz 文件需包含 trajs（object 数组，每项 (N,2)）与 labels，
+每个标签的第一条作为模板，其余作为查询。
+
+用法：python -m bench.bench_dtw [--npz rec.npz] [--per-class 40] [--iters 100]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from vision.custom_gestures import CustomGestureManager
+
+KNOTS = {
+    "V": [(0, 0), (50, 100), (100, 0)],
+    "Z": [(0, 0), (100, 0), (0, 100), (100, 100)],
+    "L": [(0, 0), (0, 100), (60, 100)],
+    "N": [(0, 100), (0, 0), (80, 100), (80, 0)],
+    "CHECK": [(0, 50), (30, 100), (100, 0)],
+    "M": [(0, 100), (0, 0), (50, 60), (100, 0), (100, 100)],
+}
+
+
+def _shape(kind, rng, warp=0.0):
+    """按折线生成轨迹；warp>0 时各段采样密度和拐点位置随机变化，末尾加停顿。"""
+    k = np.asarray(KNOTS[kind], dtype=np.float64)
+    if warp:
+        k = k + rng.normal(0, 12 * warp, size=k.shape)
+    seg = len(k) - 1
+    dens = rng.uniform(1 - warp, 1 + warp, size=seg) if warp else np.ones(seg)
+    u = np.concatenate([np.linspace(i, i + 1, max(2, int(14 * d)), endpoint=False)
+                        for i, d in enumerate(dens)] + [[seg]])
+    p = np.stack([np.interp(u, np.arange(len(k)), k[:, 0]),
+                  np.interp(u, np.arange(len(k)), k[:, 1])], axis=1)
+    if warp:
+        p = np.concatenate([np.repeat(p[:1], 5, axis=0), p])  # 起笔停顿
+        p = p + rng.normal(0, 2.0, size=p.shape)
+    return p
+
+
+def _synthetic(per_class, rng):
+    templates = {kd: _shape(kd, rng) for kd in KNOTS}
+    queries = [(kd, _shape(kd, rng, warp=0.5)) for kd in KNOTS for _ in range(per_class)]
+    return templates, queries
+
+
+def _load_npz(path):
+    z = np.load(path, allow_pickle=True)
+    templates, queries = {}, []
+    for p, lab in zip(z["trajs"], z["labels"]):
+        lab = str(lab)
+        if lab not in templates:
+            templates[lab] = np.asarray(p, dtype=np.float32)
+        else:
+            queries.append((lab, np.asarray(p, dtype=np.float32)))
+    return templates, queries
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--npz", default="")
+    ap.add_argument("--per-class", type=int, default=40)
+    ap.add_argument("--iters", type=int, default=100)
+    ap.add_argument("--threshold", type=float, default=0.32)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(11)
+    templates, queries = _load_npz(args.npz) if args.npz else _synthetic(args.per_class, rng)
+    negatives = [np.cumsum(rng.normal(0, 6, size=(40, 2)), axis=0) for _ in range(len(queries))]
+
+    cfg = {"general": {"dtw_band_ratio": 0.1}, "custom_gestures": []}
+    mgr = CustomGestureManager(cfg)
+    for gid, pts in templates.items():
+        mgr.add_template(gid, "bare", pts)
+
+    print(f"{len(templates)} templates, {len(queries)} queries, {len(negatives)} negatives, "
+          f"threshold={args.threshold}")
+    for m in ("euclidean", "protractor", "dtw"):
+        ok = sum(1 for lab, q in queries
+                 if (mgr.match("bare", q, threshold=args.threshold, matcher=m) or (None,))[0] == lab)
+        fa = sum(1 for q in negatives if mgr.match("bare", q, threshold=args.threshold, matcher=m))
+        print(f"  {m:<10}: recall={ok / len(queries):6.1%}  false_accept={fa / len(negatives):6.1%}")
+
+    print("timing (query = warped Z):")
+    q = _shape("Z", rng, warp=0.5)
+    for extra in (0, 100, 1000):
+        for i in range(extra):
+            mgr.add_template(f"RND{i}", "bare", np.cumsum(rng.normal(0, 6, size=(40, 2)), axis=0))
+        k = len(mgr.list_ids("bare"))
+        for m in ("euclidean", "protractor", "dtw"):
+            mgr.stats = {"scored": 0, "abandoned": 0, "dtw_full": 0}
+            t0 = time.perf_counter()
+            for _ in range(args.iters):
+                mgr.match("bare", q, threshold=args.threshold, matcher=m)
+            ms = (time.perf_counter() - t0) / args.iters * 1e3
+            extra_s = ""
+            if m == "dtw":
+                extra_s = f"  full_dtw/match={mgr.stats['dtw_full'] / args.iters:6.1f}"
+            print(f"  K={k:>5} {m:<10}: {ms:7.3f} ms/match{extra_s}")
+        cfg["custom_gestures"] = [g for g in cfg["custom_gestures"] if g["id"] in templates]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+帧缓冲复用检查：走真实路径
+  CameraThread.run（FramePool + 镜像写入预分配缓冲）-> FrameMailbox
+  -> InferencePipeline.process（_infer_buf 缩放 + 跟踪/引擎）
+  -> MainWindow._show_frame（预览 RGB 缓冲）
+用 tracemalloc 统计稳态下的内存增长（采集线程与推理/预览同时在跑），并检查各整帧缓冲在稳态下不再更换。
+帧来源为合成画面（不需要摄像头）；需要 PyQt6（offscreen 平台即可）与 mediapipe（InferencePipeline 构造时加载）。
+
+用法：python -m bench.bench_frame_alloc [--frames 900] [--fps 60] [--width 640] [--height 480] [--mode bare|glove]
+"""
+import argparse
+import os
+import tracemalloc
+from types import SimpleNamespace
+
+import numpy as np
+
+from config_io import DEFAULT_CONFIG_PATH, load_config
+from control.state import SystemState
+from vision.frame_buffers import FrameMailbox, FramePool
+from vision.frame_source import FrameSource
+from vision.pipeline import InferencePipeline
+
+
+class _SyntheticSource(FrameSource):
+    """固定数量的合成帧：一块黄色方块在噪声背景上移动；按 fps 节奏输出，传入 image 时写入该缓冲。"""
+    name = "synthetic"
+
+    def __init__(self, frames, fps, width, height):
+        super().__init__(realtime=True)
+        self.frames = int(frames)
+        self.fps = float(fps)
+        rng = np.random.default_rng(0)
+        self._bg = rng.integers(0, 80, size=(height, width, 3), dtype=np.uint8)
+        self._img = self._bg.copy()
+        self._idx = 0
+
+    def open(self):
+        return True
+
+    def read(self, image=None):
+        if self._idx >= self.frames:
+            self.finished = True
+            return False, None, 0
+        h, w = self._bg.shape[:2]
+        np.copyto(self._img, self._bg)
+        x = int((self._idx * 7) % max(1, w - 120))
+        self._img[h // 3:h // 3 + 120, x:x + 120] = (0, 220, 220)
+        t_rel = self._idx / self.fps
+        self._pace(t_rel)
+        self._idx += 1
+        return True, self._into(image, self._img), int(t_rel * 1e9)
+
+
+def run(frames: int, fps: float, width: int, height: int, mode: str, warmup: int = 60):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication, QLabel
+    from ui.main_window import MainWindow
+    from vision.camera import CameraThread
+
+    app = QApplication.instance() or QApplication([])
+    cfg = load_config(DEFAULT_CONFIG_PATH)
+    pipe = InferencePipeline(cfg, SystemState(execution_enabled=False))
+
+    pool = FramePool()
+    box = FrameMailbox(pool=pool)
+    cam = CameraThread(box, _SyntheticSource(frames, fps, width, height), mirror=True)
+    # MainWindow._show_frame 只用到 _rgb_buf 与 preview；预览前的拷贝与 _tick 一致写入 _vis_buf
+    win = SimpleNamespace(_rgb_buf=None, _vis_buf=None, preview=QLabel())
+    win.preview.resize(640, 480)
+
+    cam.start()
+    seq = 0
+    n = 0
+    base = None
+    bufs = None
+    samples = []
+    try:
+        while True:
+            got = box.wait_latest(seq, 0.5)
+            if got is None:
+                if cam.isFinished():
+                    break
+                continue
+            seq, frame, t_ns = got
+            try:
+                pipe.process(frame, mode, seq=seq, t_ns=t_ns)
+                if win._vis_buf is None or win._vis_buf.shape != frame.shape:
+                    win._vis_buf = np.empty_like(frame)
+                np.copyto(win._vis_buf, frame)
+                MainWindow._show_frame(win, win._vis_buf)
+                app.processEvents()
+            finally:
+                box.release(frame)
+            n += 1
+            if n == warmup:
+                tracemalloc.start()
+                base = tracemalloc.get_traced_memory()[0]
+                bufs = (pipe._infer_buf, win._rgb_buf, win._vis_buf)
+            elif base is not None and n % 200 == 0:
+                samples.append(tracemalloc.get_traced_memory()[0] - base)
+    finally:
+        cam.stop()
+        cam.wait(2000)
+    if base is None:
+        raise SystemExit(f"只处理了 {n} 帧，不足预热帧数 {warmup}")
+    cur, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    frame_bytes = width * height * 3
+    steady = n - warmup
+    growth = cur - base
+    st = box.stats()
+    print(f"mode={mode} processed={n} published={st['cam_published']} size={width}x{height} frame_bytes={frame_bytes}")
+    print(f"traced growth={growth} B  peak_over_base={peak - base} B  per_frame={growth / max(1, steady):.2f} B")
+    print(f"samples={samples}")
+    print(f"pool={pool.stats()}")
+
+    same = [a is b for a, b in zip(bufs, (pipe._infer_buf, win._rgb_buf, win._vis_buf))]
+    assert all(same), f"steady-state buffer replaced (infer, rgb, vis) = {same}"
+    assert pool.allocated <= pool.max_free + 3, "pool kept allocating new buffers"
+    # 稳态不累积整帧：总增长小于一帧
+    assert growth < frame_bytes, "frame-sized memory growth in steady state"
+    return growth
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=900)
+    ap.add_argument("--fps", type=float, default=60.0)
+    ap.add_argument("--width", type=int, default=640)
+    ap.add_argument("--height", type=int, default=480)
+    ap.add_argument("--mode", default="bare", choices=["bare", "glove"])
+    args = ap.parse_args()
+    run(args.frames, args.fps, args.width, args.height, args.mode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+手套跟踪模式并排基准：全帧轮廓 / ROI 轮廓 / CamShift 反投影跟踪。
+以全帧轮廓检测的结果为参照，统计每帧耗时、丢失率、中心偏差（> 8px 视为跟错）与 CamShift 回退次数。
+
+输入：--video 录制的视频（HSV 阈值与 hs_hist 取自 --config 的 glove 段）；
+不给视频时用 bench_glove_roi 的合成场景（slow / fast / jump）。
+
+用法：python -m bench.bench_glove_camshift [--video rec.mp4] [--config config/default_config.json] [--frames 300]
+"""
+import argparse
+import json
+import time
+
+import cv2
+import numpy as np
+
+from bench.bench_glove_roi import _background, _draw_glove, _path
+from vision.glove_tracker_c import GloveTrackerC
+
+VARIANTS = (("full", {"track_roi": False}), ("roi", {}), ("camshift", {"track_mode": "camshift"}))
+
+
+def _make(glove, kw, scale):
+    return GloveTrackerC(hsv_lower=glove.get("hsv_lower", (20, 80, 80)), hsv_upper=glove.get("hsv_upper", (40, 255, 255)),
+                         erode=glove.get("erode", 1), dilate=glove.get("dilate", 2),
+                         min_area=int(glove.get("min_area", 1500) * scale * scale),
+                         track_hist=glove.get("hs_hist"), **kw)
+
+
+def compare(label, frames, glove, scale=1.0):
+    res = {}
+    for name, kw in VARIANTS:
+        tr = _make(glove, kw, scale)
+        cost = 0.0
+        centers = []
+        for img in frames:
+            t0 = time.perf_counter()
+            f = tr.process(img)
+            cost += time.perf_counter() - t0
+            centers.append(f.center)
+        res[name] = (cost / len(frames) * 1000.0, centers, dict(tr.stats))
+
+    full_ms, ref, _ = res["full"]
+    seen = max(1, sum(1 for c in ref if c is not None))
+    line = [f"  {label:<8} full={full_ms:5.2f} ms"]
+    for name, _ in VARIANTS[1:]:
+        ms, cs, st = res[name]
+        lost = sum(1 for a, b in zip(ref, cs) if a is not None and b is None)
+        off = sum(1 for a, b in zip(ref, cs)
+                  if a is not None and b is not None and abs(a[0] - b[0]) + abs(a[1] - b[1]) > 8)
+        extra = f" camshift={st['camshift']} lost={st['camshift_lost']}" if name == "camshift" else ""
+        line.append(f"{name}={ms:5.2f} ms ({full_ms / ms:3.1f}x) loss={lost / seen:5.1%} off={off / seen:4.1%}"
+                    f" full_search={st['full']}{extra}")
+    print(" | ".join(line))
+
+
+def _synthetic(w, h, n, scene):
+    rng = np.random.default_rng(3)
+    bg = _background(w, h, rng)
+    out = []
+    for i in range(n):
+        cx, cy, vis = _path(scene, i, w, h, 17)
+        img = bg.copy()
+        if vis:
+            _draw_glove(img, cx, cy, w / 640.0)
+        out.append(img)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--video", default=None)
+    ap.add_argument("--config", default="config/default_config.json")
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--infer-scale", type=float, default=0.6, help="视频帧先按推理缩放（与 general.infer_scale 一致）")
+    args = ap.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        glove = json.load(f).get("glove", {})
+
+    if args.video:
+        cap = cv2.VideoCapture(args.video)
+        frames = []
+        while len(frames) < args.frames:
+            ok, fr = cap.read()
+            if not ok:
+                break
+            if 0.2 < args.infer_scale < 1.0:
+                fr = cv2.resize(fr, None, fx=args.infer_scale, fy=args.infer_scale)
+            frames.append(fr)
+        cap.release()
+        if not frames:
+            raise SystemExit(f"无法读取视频：{args.video}")
+        h, w = frames[0].shape[:2]
+        print(f"{args.video} ({len(frames)} 帧, {w}x{h}):")
+        compare("video", frames, glove)
+        return
+
+    for w, h in ((640, 480), (1280, 720)):
+        print(f"{w}x{h}:")
+        for scene in ("slow", "fast", "jump"):
+            compare(scene, _synthetic(w, h, args.frames, scene), glove, w / 640.0)
+
+
+if __name__ == "__main__":
+    main()
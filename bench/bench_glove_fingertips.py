@@ -0,0 +1,79 @@
+"""
+手套指尖检测基准：凸包缺陷（find_fingertips）vs 旧的“凸包点按 y 排序 + 逐个去重”。
+合成 0–5 指的手套并旋转（含手指朝侧面/朝下），统计指尖数正确率与每次耗时。
+
+用法：python -m bench.bench_glove_fingertips [--iters 200]
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from vision.glove_tracker_c import GloveTrackerC, find_fingertips
+
+YELLOW = (0, 215, 235)
+
+
+def legacy_fingertips(cnt):
+    """旧实现，仅用于对比。"""
+    fingertips = []
+    hull = cv2.convexHull(cnt, returnPoints=True)
+    if hull is not None and len(hull) > 5:
+        pts = hull[:, 0, :]
+        pts_sorted = pts[np.argsort(pts[:, 1])]
+        for p in pts_sorted[:12]:
+            if all(np.linalg.norm(p - np.array(q)) > 25 for q in fingertips):
+                fingertips.append((int(p[0]), int(p[1])))
+        fingertips = fingertips[:5]
+    return fingertips
+
+
+def _draw(n, rot, spread, w=640, h=480):
+    img = np.zeros((h, w, 3), dtype=np.uint8)
+    cx, cy = w // 2, h // 2
+    cv2.ellipse(img, (cx, cy), (40, 50), rot, 0, 360, YELLOW, -1)
+    for k, ang in enumerate((-70, -35, -10, 15, 40)[:n]):
+        a = np.radians(ang * spread - 90 + rot)
+        ln = 55 if k else 40
+        p0 = (int(cx + np.cos(a) * 30), int(cy + np.sin(a) * 30))
+        p1 = (int(cx + np.cos(a) * (45 + ln)), int(cy + np.sin(a) * (45 + ln)))
+        cv2.line(img, p0, p1, YELLOW, 14)
+    return img
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iters", type=int, default=200)
+    args = ap.parse_args()
+
+    tr = GloveTrackerC(track_roi=False)
+    ok_new = ok_old = total = 0
+    t_new = t_old = 0.0
+    for rot in (0, 30, 90, 180, -90):
+        row = []
+        for spread in (1.0, 1.3):
+            for n in range(6):
+                f = tr.process(_draw(n, rot, spread))
+                cnt = f.contour
+                t0 = time.perf_counter()
+                for _ in range(args.iters):
+                    tips, _, _ = find_fingertips(cnt, f.center)
+                t1 = time.perf_counter()
+                for _ in range(args.iters):
+                    old = legacy_fingertips(cnt)
+                t2 = time.perf_counter()
+                t_new += t1 - t0
+                t_old += t2 - t1
+                total += 1
+                ok_new += len(tips) == n
+                ok_old += len(old) == n
+                row.append(f"{n}:{len(tips)}/{len(old)}")
+        print(f"  rot={rot:>4}  expected:new/legacy  " + " ".join(row))
+    per = total * args.iters
+    print(f"count accuracy: convexity defects={ok_new / total:5.1%}  legacy={ok_old / total:5.1%}")
+    print(f"cost per contour: convexity defects={t_new / per * 1e6:6.1f} us  legacy={t_old / per * 1e6:6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+手套 HSV 阈值在线自适应基准：模拟房间光照缓慢变暗、偏暖后再恢复，中间有一段手套离开画面。
+对比固定阈值与自适应阈值的丢失率，并给出自适应的摊销耗时、阈值轨迹与回滚次数。
+
+用法：python -m bench.bench_glove_hsv_adapt [--frames 900]
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from bench.bench_glove_roi import _background, _draw_glove
+from vision.glove_tracker_c import GloveTrackerC
+
+YELLOW = np.array((0, 215, 235), dtype=np.float32)
+
+
+def _light(i, n):
+    """前 45% 帧变暗到 50% 亮度并偏暖，之后恢复。返回 (亮度, 暖色增益 BGR)。"""
+    u = i / n
+    k = min(u / 0.45, 1.0) if u < 0.55 else max(0.0, 1.0 - (u - 0.55) / 0.35)
+    return 1.0 - 0.5 * k, np.array((1.0 - 0.25 * k, 1.0, 1.0 + 0.1 * k), dtype=np.float32)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=900)
+    args = ap.parse_args()
+
+    w, h = 640, 480
+    rng = np.random.default_rng(5)
+    bg = _background(w, h, rng).astype(np.float32)
+    hidden = range(int(args.frames * 0.47), int(args.frames * 0.47) + 40)   # 最暗时离开画面一段
+    frames = []
+    for i in range(args.frames):
+        glove = np.zeros((h, w, 3), dtype=np.uint8)
+        if i not in hidden:
+            _draw_glove(glove, int(w / 2 + 150 * np.sin(i * 0.03)), int(h / 2 + 80 * np.sin(i * 0.05)), 1.0)
+        img = np.where(glove.any(axis=2, keepdims=True), YELLOW, bg)
+        gain, tint = _light(i, args.frames)
+        img = np.clip(img * gain * tint + rng.normal(0, 4, img.shape), 0, 255).astype(np.uint8)
+        frames.append((img, i not in hidden))
+
+    for name, kw in (("fixed", {}), ("adapt", {"hsv_adapt": True})):
+        tr = GloveTrackerC(hsv_lower=(20, 120, 150), hsv_upper=(36, 255, 255), **kw)
+        lost = seen = 0
+        trace = []
+        t0 = time.perf_counter()
+        for i, (img, vis) in enumerate(frames):
+            f = tr.process(img)
+            if vis:
+                seen += 1
+                lost += f.center is None
+            if i % (args.frames // 6) == 0:
+                trace.append(f"{i}:{tr.hsv_lower.tolist()}")
+        ms = (time.perf_counter() - t0) / len(frames) * 1000.0
+        st = tr.stats
+        print(f"{name:<6} loss={lost / seen:6.1%}  process={ms:5.2f} ms/frame  "
+              f"adapt={st['hsv_adapt_ms'] / len(frames) * 1000:5.1f} us/frame (updates={st['hsv_adapt']}, "
+              f"rollback={st['hsv_rollback']})")
+        print(f"       lower bound trace: {'  '.join(trace)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+手套颜色分割基准：cvtColor + inRange vs 量化 BGR 查找表（calcBackProject 查表 / NumPy 查表）。
+同时给出查表结果与 HSV 阈值结果的不一致像素比例（量化误差只出现在阈值边界附近）。
+
+用法：python -m bench.bench_glove_lut [--iters 200]
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from vision.glove_tracker_c import GloveTrackerC, color_bin_index, learn_color_bins
+
+
+def _timeit(fn, iters):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return (time.perf_counter() - t0) / iters * 1000.0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iters", type=int, default=200)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    for w, h in ((640, 480), (1280, 720)):
+        small = rng.integers(0, 255, size=(h // 8, w // 8, 3), dtype=np.uint8)
+        img = cv2.resize(small, (w, h), interpolation=cv2.INTER_LINEAR)
+
+        tr = GloveTrackerC(erode=0, dilate=0)
+        tr.color_lut = False
+        ref = tr._color_mask(img)
+        hsv_ms = _timeit(lambda: tr._color_mask(img), args.iters)
+
+        tr.color_lut = True
+        lut_mask = tr._color_mask(img)
+        lut_ms = _timeit(lambda: tr._color_mask(img), args.iters)
+
+        lut_u8 = tr._lut[2].reshape(-1)
+        np_ms = _timeit(lambda: lut_u8[color_bin_index(img)], max(10, args.iters // 10))
+
+        # 学到的非盒状区域：取 HSV 盒内像素学习，再用查表分割
+        bins = learn_color_bins(img[ref > 0])
+        tr.update_hsv(tr.hsv_lower, tr.hsv_upper, bins)
+        learned_ms = _timeit(lambda: tr._color_mask(img), args.iters)
+
+        print(f"{w}x{h}: cvtColor+inRange={hsv_ms:5.2f} ms  lut(calcBackProject)={lut_ms:5.2f} ms  "
+              f"lut(numpy)={np_ms:5.2f} ms  learned_bins({len(bins)})={learned_ms:5.2f} ms  "
+              f"mismatch_vs_hsv={(lut_mask != ref).mean():.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+GloveTrackerC ROI 跟踪基准：全帧搜索 vs ROI 窗口搜索的每帧耗时与丢失率。
+
+合成画面：杂色背景 + 黄色“手套”（掌心椭圆 + 五指），沿利萨如曲线运动；
+fast 场景速度约 25 像素/帧，jump 场景每 60 帧瞬移一次，每 120 帧有 8 帧完全遮挡。
+
+用法：python -m bench.bench_glove_roi [--frames 300]
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from vision.glove_tracker_c import GloveTrackerC
+
+YELLOW = (0, 215, 235)  # BGR，HSV 约 (27, 255, 235)
+
+
+def _background(w, h, rng):
+    small = rng.integers(0, 255, size=(h // 16, w // 16, 3), dtype=np.uint8)
+    bg = cv2.resize(small, (w, h), interpolation=cv2.INTER_LINEAR)
+    # 去掉背景中的黄色，避免干扰真值
+    hsv = cv2.cvtColor(bg, cv2.COLOR_BGR2HSV)
+    hsv[..., 0] = (hsv[..., 0].astype(np.int32) % 90 + 60).astype(np.uint8)
+    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+
+
+def _draw_glove(img, cx, cy, s):
+    cv2.ellipse(img, (cx, cy), (int(40 * s), int(50 * s)), 0, 0, 360, YELLOW, -1)
+    for k, ang in enumerate((-70, -35, -10, 15, 40)):
+        a = np.radians(ang - 90)
+        ln = (55 if k else 40) * s
+        x1 = int(cx + np.cos(a) * (45 * s + ln))
+        y1 = int(cy + np.sin(a) * (45 * s + ln))
+        cv2.line(img, (int(cx + np.cos(a) * 30 * s), int(cy + np.sin(a) * 30 * s)), (x1, y1), YELLOW, int(14 * s))
+
+
+def _path(scene, i, w, h, rng_state):
+    if scene == "slow":
+        t = i * 0.02
+    else:
+        t = i * 0.12
+    cx = w / 2 + (w * 0.32) * np.sin(t)
+    cy = h / 2 + (h * 0.28) * np.sin(1.7 * t)
+    visible = True
+    if scene == "jump":
+        k = i // 60
+        r = np.random.default_rng(k + rng_state)
+        cx = r.uniform(0.2, 0.8) * w + 20 * np.sin(i * 0.1)
+        cy = r.uniform(0.25, 0.75) * h
+        visible = (i % 120) >= 8  # 每隔一次瞬移伴随遮挡
+    return int(cx), int(cy), visible
+
+
+def run(w, h, frames):
+    rng = np.random.default_rng(3)
+    bg = _background(w, h, rng)
+    img = np.empty_like(bg)
+    s = w / 640.0
+    min_area = int(1500 * s * s)
+    print(f"{w}x{h}:")
+    variants = (("full", {"track_roi": False}), ("roi", {}), ("roi_n3", {"roi_max_misses": 3}))
+    for scene in ("slow", "fast", "jump"):
+        res = {}
+        for name, kw in variants:
+            tr = GloveTrackerC(hsv_lower=(20, 80, 80), hsv_upper=(40, 255, 255), min_area=min_area, **kw)
+            cost = 0.0
+            centers = []
+            for i in range(frames):
+                cx, cy, vis = _path(scene, i, w, h, 17)
+                np.copyto(img, bg)
+                if vis:
+                    _draw_glove(img, cx, cy, s)
+                t0 = time.perf_counter()
+                f = tr.process(img)
+                cost += time.perf_counter() - t0
+                centers.append((vis, f.center))
+            res[name] = (cost / frames * 1000.0, centers, dict(tr.stats))
+
+        full_ms, full_c, _ = res["full"]
+        vis_n = sum(1 for v, _ in full_c if v)
+        line = [f"  {scene:<5} full={full_ms:5.2f} ms loss={sum(1 for v, c in full_c if v and c is None) / vis_n:5.1%}"]
+        for name, _ in variants[1:]:
+            ms, cs, st = res[name]
+            lost = sum(1 for v, c in cs if v and c is None)
+            # 与全帧结果不一致（中心偏差 > 6px）视为跟错
+            off = sum(1 for (v, a), (_, b) in zip(full_c, cs)
+                      if v and a is not None and b is not None and abs(a[0] - b[0]) + abs(a[1] - b[1]) > 6)
+            line.append(f"{name}={ms:5.2f} ms ({full_ms / ms:3.1f}x) loss={lost / vis_n:5.1%} "
+                        f"off={off / vis_n:4.1%} full_search={st['full']}/{st['frames']}")
+        print(" | ".join(line))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=300)
+    args = ap.parse_args()
+    for w, h in ((640, 480), (1280, 720)):
+        run(w, h, args.frames)
+
+
+if __name__ == "__main__":
+    main()
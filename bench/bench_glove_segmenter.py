@@ -0,0 +1,78 @@
+"""
+手套 ROI 精修分割基准：颜色阈值轮廓 vs 色调-饱和度直方图反投影（HistBackprojSegmenter）。
+合成带亮度渐变与噪声的手套画面（HSV 盒的亮度下界会切掉暗部，反投影只看色调/饱和度），
+统计轮廓与真值 mask 的 IoU、每次精修耗时，以及不同缩小比例 / 时间预算下的表现。
+
+用法：python -m bench.bench_glove_segmenter [--frames 200]
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from vision.glove_tracker_c import GloveTrackerC, HistBackprojSegmenter, learn_hs_hist
+
+YELLOW = (0, 215, 235)
+
+
+def _scene(rng, t, w=640, h=480):
+    """返回 (画面, 真值 mask)。手套沿圆周移动，右侧逐渐变暗。"""
+    gt = np.zeros((h, w), dtype=np.uint8)
+    cx = int(w / 2 + 140 * np.cos(t * 0.05))
+    cy = int(h / 2 + 90 * np.sin(t * 0.05))
+    cv2.ellipse(gt, (cx, cy), (45, 55), 0, 0, 360, 255, -1)
+    for ang in (-70, -35, -10, 15, 40):
+        a = np.radians(ang - 90)
+        cv2.line(gt, (cx, cy), (int(cx + np.cos(a) * 110), int(cy + np.sin(a) * 110)), 255, 16)
+    img = np.full((h, w, 3), (90, 70, 60), dtype=np.uint8)
+    img[gt > 0] = YELLOW
+    shade = np.linspace(1.0, 0.3, w, dtype=np.float32)[None, :, None]
+    img = np.clip(img * shade + rng.normal(0, 6, img.shape), 0, 255).astype(np.uint8)
+    return img, gt
+
+
+def _iou(cnt, gt):
+    if cnt is None:
+        return 0.0
+    m = np.zeros_like(gt)
+    cv2.drawContours(m, [cnt], -1, 255, -1)
+    a, b = m > 0, gt > 0
+    return float((a & b).sum()) / max(1, int((a | b).sum()))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=200)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [_scene(rng, t) for t in range(args.frames)]
+    # “校准”：取第一帧手套中心附近的像素
+    img0, gt0 = frames[0]
+    hist = learn_hs_hist(img0[gt0 > 0][:4000])
+
+    variants = [("hsv_only", None)]
+    for scale, budget in ((1.0, 50.0), (0.5, 50.0), (0.35, 50.0), (0.5, 0.3)):
+        variants.append((f"backproj s={scale} budget={budget}ms",
+                         HistBackprojSegmenter(hist=hist, scale=scale, budget_ms=budget)))
+
+    for name, seg in variants:
+        tr = GloveTrackerC(hsv_lower=(20, 80, 120), hsv_upper=(40, 255, 255), segmenter=seg)
+        ious = []
+        t0 = time.perf_counter()
+        for img, gt in frames:
+            f = tr.process(img)
+            ious.append(_iou(f.contour, gt))
+        ms = (time.perf_counter() - t0) / len(frames) * 1000.0
+        line = f"{name:<32} IoU mean={np.mean(ious):.3f} min={np.min(ious):.3f}  process={ms:5.2f} ms/frame"
+        if seg is not None:
+            st = seg.stats
+            line += (f"  segment avg={st['avg_ms']:.3f} max={st['max_ms']:.3f} ms  "
+                     f"scale={st['scale']:.2f} skipped={st['skipped']} over_budget={st['over_budget']} "
+                     f"learned={st['learned']}")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+输入注入后端基准：pyautogui / pynput（常驻控制器）/ null 的每次调用耗时。
+测 position()、move_to()（鼠标线程与光标映射的热路径），以及一次 move_to + position 的组合。
+需要图形会话；某个后端不可用时跳过并给出原因。光标会在屏幕中央附近小范围移动。
+
+用法：python -m bench.bench_input_backend [--iters 500]
+"""
+import argparse
+import time
+
+from control.input_backend import NullBackend, PyAutoGuiBackend, PynputBackend
+
+
+def _per_call_us(fn, iters):
+    fn(0)
+    t0 = time.perf_counter()
+    for i in range(iters):
+        fn(i)
+    return (time.perf_counter() - t0) / iters * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iters", type=int, default=500)
+    args = ap.parse_args()
+
+    for name, cls in (("pyautogui", PyAutoGuiBackend), ("pynput", PynputBackend), ("null", NullBackend)):
+        try:
+            be = cls()
+            w, h = be.screen_size()
+        except Exception as ex:
+            print(f"{name:<10} 不可用：{ex!r}")
+            continue
+        cx, cy = w // 2, h // 2
+        home = be.position()
+
+        def move(i):
+            be.move_to(cx + (i % 40) - 20, cy + (i % 30) - 15)
+
+        def both(i):
+            move(i)
+            be.position()
+
+        pos_us = _per_call_us(lambda i: be.position(), args.iters)
+        move_us = _per_call_us(move, args.iters)
+        both_us = _per_call_us(both, args.iters)
+        be.move_to(*home)
+        print(f"{name:<10} position={pos_us:8.1f} us  move_to={move_us:8.1f} us  move_to+position={both_us:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+鼠标输出线程基准：模拟手在屏幕上画圆，推理以 infer_fps 给出带采集时刻的目标点（含固定 采集->目标 延迟与检测噪声），
+统计光标相对“此刻真实手位置”的误差、每秒发送次数、节拍唤醒偏差与进程 CPU 占用。
+对比：旧行为（60 Hz 重发最新目标，等价于 hz=60 / 不外推 / 不跟随）、插值（渲染落后一段）、
+外推补偿全部延迟（默认 delay=0，外推上限 120 ms；对比不同上限与小延后）。
+
+用法：python -m bench.bench_mouse_worker [--seconds 3] [--infer-fps 12] [--latency-ms 70]
+"""
+import argparse
+import math
+import threading
+import time
+
+import numpy as np
+
+from control.input_backend import NullBackend
+from control.mouse_worker import MouseMoveWorker
+
+
+class _RecordingBackend(NullBackend):
+    def __init__(self):
+        super().__init__()
+        self.log = []
+
+    def move_to(self, x, y):
+        super().move_to(x, y)
+        self.log.append((time.perf_counter(), float(x), float(y)))
+
+
+def _hand(t, period_s):
+    a = 2 * math.pi * t / period_s
+    return 960 + 400 * math.cos(a), 540 + 300 * math.sin(a)
+
+
+def run(name, kw, args):
+    be = _RecordingBackend()
+    w = MouseMoveWorker(be, **kw)
+    rng = np.random.default_rng(1)
+    t0 = time.perf_counter()
+    cpu0 = time.process_time()
+    w.start()
+    stop = threading.Event()
+
+    def infer():
+        n = 0
+        while not stop.is_set():
+            t_cap = t0 + n / args.infer_fps
+            t_deliver = t_cap + args.latency_ms / 1000.0
+            d = t_deliver - time.perf_counter()
+            if d > 0:
+                time.sleep(d)
+            x, y = _hand(t_cap - t0, args.period)
+            cap_ns = time.monotonic_ns() - int((time.perf_counter() - t_cap) * 1e9)
+            w.set_target(x + rng.normal(0, args.noise_px), y + rng.normal(0, args.noise_px), cap_ns)
+            n += 1
+
+    th = threading.Thread(target=infer, daemon=True)
+    th.start()
+    time.sleep(args.seconds)
+    stop.set()
+    w.stop()
+    th.join()
+    # 进程 CPU 占用（其余线程基本都在 sleep，主要是输出线程）
+    cpu = (time.process_time() - cpu0) / args.seconds * 100.0
+
+    log = [r for r in be.log if r[0] - t0 > 0.5]        # 去掉起步阶段
+    err = np.array([math.hypot(x - hx, y - hy) for (t, x, y) in log for hx, hy in [_hand(t - t0, args.period)]])
+    # 抖动：相邻两次输出位移之差（二阶差分），外推把检测噪声放大时明显变大
+    xy = np.array([(x, y) for (_, x, y) in log])
+    shake = np.hypot(*np.diff(xy, n=2, axis=0).T).mean() if len(xy) > 2 else 0.0
+    js = w.jitter_stats()
+    print(f"{name:<24} err mean={err.mean():6.1f}px p95={np.percentile(err, 95):6.1f}px shake={shake:5.2f}px  "
+          f"moves/s={len(log) / (args.seconds - 0.5):6.1f}  late mean={js.get('late_mean_us', 0):6.1f}us "
+          f"p99={js.get('late_p99_us', 0):7.1f}us max={js.get('late_max_us', 0):7.1f}us missed={js['missed']}  cpu={cpu:5.1f}%")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=3.0)
+    ap.add_argument("--infer-fps", type=float, default=12.0)
+    ap.add_argument("--latency-ms", type=float, default=70.0)
+    ap.add_argument("--period", type=float, default=2.0, help="手画一圈的时长（秒）")
+    ap.add_argument("--noise-px", type=float, default=3.0)
+    args = ap.parse_args()
+
+    variants = (
+        ("legacy 60Hz hold", dict(hz=60, render_delay_ms=0, max_extrapolate_ms=0, tau_ms=0)),
+        ("interp 120Hz delay=150", dict(hz=120, render_delay_ms=150)),
+        ("extrap 120Hz cap=150", dict(hz=120, render_delay_ms=0, max_extrapolate_ms=150)),
+        ("delay=0 cap=80", dict(hz=120, render_delay_ms=0, max_extrapolate_ms=80)),
+        ("delay=40 cap=80", dict(hz=120, render_delay_ms=40, max_extrapolate_ms=80)),
+        ("default 120Hz", dict(hz=120)),
+        ("default 240Hz", dict(hz=240)),
+    )
+    for name, kw in variants:
+        run(name, kw, args)
+
+
+if __name__ == "__main__":
+    main()
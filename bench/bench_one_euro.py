@@ -0,0 +1,94 @@
+"""
+光标滤波基准：EMA（固定系数）vs One-Euro（按速度自适应截止频率）。
+合成一条按推理帧率采样的光标轨迹：静止段（只有检测噪声）与快速直线移动段交替，
+统计静止段的输出抖动（相对真值的 RMS 与相邻帧位移均值）和移动段的跟随滞后（相对真值的平均误差），
+以及 One-Euro 每次调用的耗时（光标 (2,) 与 21 个关键点 (21,2)）。
+
+用法：python -m bench.bench_one_euro [--fps 15] [--noise 3] [--speed 2500] [--betas 0.003,0.007,0.02]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from vision.one_euro import OneEuroFilter
+
+
+def _make_path(fps, noise, speed, seconds=20.0, seed=0):
+    """返回 (t, 真值, 观测, 是否移动段)；每 2 秒一段，静止与移动交替，移动段在屏幕内来回。"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * fps)
+    t = np.arange(n) / fps
+    truth = np.empty((n, 2))
+    moving = np.zeros(n, dtype=bool)
+    pos = np.array([960.0, 540.0])
+    vel = np.array([speed, speed * 0.4])
+    for i in range(n):
+        seg = int(t[i] // 2.0)
+        if seg % 2 == 1:
+            moving[i] = True
+            pos = pos + vel / fps
+            for k, hi in ((0, 1900.0), (1, 1060.0)):
+                if not 20.0 <= pos[k] <= hi:
+                    vel[k] = -vel[k]
+                    pos[k] = min(hi, max(20.0, pos[k]))
+        truth[i] = pos
+    obs = truth + rng.normal(0.0, noise, size=truth.shape)
+    return t, truth, obs, moving
+
+
+def _ema(obs, a):
+    out = np.empty_like(obs)
+    s = obs[0].copy()
+    for i, x in enumerate(obs):
+        s = s * a + x * (1 - a)
+        out[i] = s
+    return out
+
+
+def _euro(t, obs, min_cutoff, beta, d_cutoff):
+    f = OneEuroFilter(min_cutoff, beta, d_cutoff)
+    return np.array([f(x, ts) for ts, x in zip(t, obs)])
+
+
+def _report(name, out, truth, moving):
+    still = ~moving
+    # 静止段去掉每段开头 0.5 秒（刚停下的收敛过程算滞后，不算抖动）
+    settle = np.convolve(moving.astype(float), np.ones(8), mode="full")[:len(moving)] > 0
+    calm = still & ~settle
+    err = np.linalg.norm(out - truth, axis=1)
+    step = np.r_[0.0, np.linalg.norm(np.diff(out, axis=0), axis=1)]
+    print(f"{name:<28} 静止 RMS={np.sqrt(np.mean(err[calm] ** 2)):6.2f}px  静止帧间位移={step[calm].mean():6.2f}px  "
+          f"移动段平均误差={err[moving].mean():7.1f}px")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fps", type=float, default=15.0)
+    ap.add_argument("--noise", type=float, default=3.0, help="检测噪声标准差（屏幕像素）")
+    ap.add_argument("--speed", type=float, default=2500.0, help="移动段水平速度（像素/秒）")
+    ap.add_argument("--smoothing", type=float, default=0.35)
+    ap.add_argument("--min-cutoff", type=float, default=1.0)
+    ap.add_argument("--d-cutoff", type=float, default=1.0)
+    ap.add_argument("--betas", default="0.003,0.007,0.02")
+    args = ap.parse_args()
+
+    t, truth, obs, moving = _make_path(args.fps, args.noise, args.speed)
+    _report("raw", obs, truth, moving)
+    for a in sorted({args.smoothing, 0.6, 0.8}):
+        _report(f"ema smoothing={a:.2f}", _ema(obs, a), truth, moving)
+    for beta in (float(b) for b in args.betas.split(",")):
+        _report(f"one_euro beta={beta:g}", _euro(t, obs, args.min_cutoff, beta, args.d_cutoff), truth, moving)
+
+    for shape in ((2,), (21, 2)):
+        f = OneEuroFilter(args.min_cutoff, 0.007, args.d_cutoff)
+        x = np.zeros(shape)
+        iters = 5000
+        t0 = time.perf_counter()
+        for i in range(iters):
+            f(x, i / args.fps)
+        print(f"one_euro {str(shape):<8} {(time.perf_counter() - t0) / iters * 1e6:6.1f} us/次")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+TrackWindow 基准：环形缓冲增量统计 vs 旧的 list + 每次重建数组实现。
+每帧模拟 update_bare 的调用：add + length + delta + direction_consistency(x/y)。
+
+用法：python -m bench.bench_track_window [--seconds 20]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from vision.dynamic_track import TrackWindow
+
+
+class LegacyTrackWindow:
+    """旧实现（list.pop(0) + 每次调用重建 NumPy 数组），仅用于对比。"""
+    def __init__(self, window_ms=450):
+        self.window_ms = int(window_ms)
+        self.pts = []
+
+    def add(self, x, y, t_ms):
+        self.pts.append((t_ms, float(x), float(y)))
+        cutoff = t_ms - self.window_ms
+        while self.pts and self.pts[0][0] < cutoff:
+            self.pts.pop(0)
+
+    def delta(self):
+        if len(self.pts) < 6:
+            return 0.0, 0.0
+        _, x0, y0 = self.pts[0]
+        _, x1, y1 = self.pts[-1]
+        return x1 - x0, y1 - y0
+
+    def length(self):
+        if len(self.pts) < 2:
+            return 0.0
+        arr = np.array([(x, y) for _, x, y in self.pts], dtype=np.float32)
+        return float(np.linalg.norm(np.diff(arr, axis=0), axis=1).sum())
+
+    def direction_consistency(self, axis="x"):
+        if len(self.pts) < 3:
+            return 0.0
+        arr = np.array([(x, y) for _, x, y in self.pts], dtype=np.float32)
+        diffs = np.diff(arr[:, 0] if axis == "x" else arr[:, 1])
+        pos = np.sum(diffs > 0)
+        neg = np.sum(diffs < 0)
+        tot = pos + neg
+        return 0.0 if tot == 0 else float(max(pos, neg) / tot)
+
+
+def _drive(tw, pts, ts):
+    acc = 0.0
+    t0 = time.perf_counter()
+    for (x, y), t in zip(pts, ts):
+        tw.add(x, y, t)
+        acc += tw.length()
+        dx, dy = tw.delta()
+        acc += tw.direction_consistency("x") + tw.direction_consistency("y") + dx + dy
+    return (time.perf_counter() - t0), acc
+
+
+def run(seconds: float, window_ms: int):
+    rng = np.random.default_rng(1)
+    print(f"window_ms={window_ms}")
+    for hz in (30, 60, 120):
+        n = int(seconds * hz)
+        ts = np.arange(n) * (1000.0 / hz)
+        pts = np.cumsum(rng.normal(0, 4, size=(n, 2)), axis=0) + 300
+
+        new_s, a = _drive(TrackWindow(window_ms=window_ms), pts, ts)
+        old_s, b = _drive(LegacyTrackWindow(window_ms=window_ms), pts, ts)
+        # 结果一致性（旧实现 float32 累加，允许微小误差）
+        assert abs(a - b) <= 1e-3 * max(1.0, abs(b)), (a, b)
+        print(f"  {hz:>3} Hz ({int(window_ms * hz / 1000)} pts/window): "
+              f"ring={new_s / n * 1e6:7.2f} us/frame  legacy={old_s / n * 1e6:7.2f} us/frame  "
+              f"speedup={old_s / new_s:5.1f}x")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=20.0)
+    args = ap.parse_args()
+    for w in (450, 900):
+        run(args.seconds, w)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+轨迹重采样基准：向量化 resample_polyline / 批量 normalize_trajectories vs 旧的逐目标循环。
+数值一致性（含零长度、重复点、n=1 等边界）由 tests/test_trajectory.py 检查，这里只打印最大差值。
+
+用法：python -m bench.bench_trajectory [--count 2000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from vision.trajectory import normalize_trajectory, normalize_trajectories
+
+
+def legacy_resample(points, n=64):
+    """旧实现（逐个目标点 while/for 推进），仅用于对比。"""
+    if points is None or len(points) < 2:
+        return None
+    pts = points.astype(np.float32)
+    seg = np.linalg.norm(np.diff(pts, axis=0), axis=1)
+    s = np.concatenate([[0.0], np.cumsum(seg)])
+    total = float(s[-1])
+    if total < 1e-6:
+        return np.repeat(pts[:1], n, axis=0)
+    target = np.linspace(0.0, total, n, dtype=np.float32)
+    out = []
+    j = 0
+    for t in target:
+        while j < len(s) - 2 and s[j + 1] < t:
+            j += 1
+        s0, s1 = s[j], s[j + 1]
+        p0, p1 = pts[j], pts[j + 1]
+        if s1 - s0 < 1e-6:
+            out.append(p0)
+        else:
+            a = (t - s0) / (s1 - s0)
+            out.append(p0 * (1 - a) + p1 * a)
+    return np.stack(out, axis=0)
+
+
+def legacy_normalize(points, n=64):
+    rs = legacy_resample(points, n=n)
+    if rs is None:
+        return None
+    rs = rs - rs.mean(axis=0, keepdims=True)
+    scale = np.sqrt((rs ** 2).sum(axis=1).mean())
+    if scale < 1e-6:
+        scale = 1.0
+    return (rs / scale).astype(np.float32)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--count", type=int, default=2000)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    trajs = [np.cumsum(rng.normal(0, 5, size=(int(rng.integers(20, 110)), 2)), axis=0)
+             for _ in range(args.count)]
+
+    t0 = time.perf_counter()
+    ref = [legacy_normalize(p) for p in trajs]
+    t1 = time.perf_counter()
+    new = [normalize_trajectory(p) for p in trajs]
+    t2 = time.perf_counter()
+    batch, valid = normalize_trajectories(trajs)
+    t3 = time.perf_counter()
+
+    err = max(float(np.abs(a - b).max()) for a, b in zip(ref, new))
+    err_b = float(np.abs(np.stack(ref) - batch).max())
+
+    old = (t1 - t0) / args.count * 1e6
+    vec = (t2 - t1) / args.count * 1e6
+    bat = (t3 - t2) / args.count * 1e6
+    print(f"{args.count} trajectories, n=64  (max abs diff: single={err:.2e} batch={err_b:.2e})")
+    print(f"  legacy      : {old:8.2f} us/traj")
+    print(f"  vectorized  : {vec:8.2f} us/traj  ({old / vec:4.1f}x)")
+    print(f"  batched     : {bat:8.2f} us/traj  ({old / bat:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
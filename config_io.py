@@ -13,6 +13,12 @@ DEFAULT_CONFIG = {
     "camera_height": 480,
     "camera_fps": 30,
 
+    # 帧来源：camera（摄像头）/ video（视频文件）/ recording（图片目录或 .npz 录制）
+    "frame_source": "camera",
+    "frame_source_path": "",
+    "frame_source_realtime": True,
+    "frame_source_loop": True,
+
     "mirror_camera": True,
     "show_camera_preview": True,
     "osd_enabled": True,
@@ -31,6 +37,33 @@ DEFAULT_CONFIG = {
     "mouse_smoothing": 0.35,
     "mouse_sensitivity": 1.0,
     "mouse_deadzone_px": 2,
+    # 光标平滑：ema（mouse_smoothing）/ one_euro；one_euro_* 同时用于 landmark_filter（送入手势引擎的 21 个关键点）
+    "mouse_filter": "ema",
+    "one_euro_min_cutoff": 1.0,
+    "one_euro_beta": 0.007,
+    "one_euro_d_cutoff": 1.0,
+    "landmark_filter": False,
+
+    # 输入注入后端：auto（优先 pynput，常驻控制器）/ pynput / pyautogui / null（不注入）
+    "input_backend": "auto",
+    # pyautogui 滚动量 -> 后端滚动单位的换算；None 为按平台默认（Windows 1/120，其它 1）
+    "input_scroll_scale": None,
+
+    # 前台应用查询（per_app 绑定）：auto（Windows win32 / Linux x11）/ win32 / x11 / fake；缓存有效期内不做系统调用
+    "app_provider": "auto",
+    "app_context_ttl_ms": 250,
+
+    # 动作执行线程：非开关动作入有界队列异步执行；连续滚动在队尾合并；队满策略 drop_oldest / drop_newest / block
+    "action_executor": True,
+    "action_queue_size": 64,
+    "action_queue_overflow": "drop_oldest",
+
+    # 鼠标输出线程：频率、渲染时刻相对现在的延后（0 = 按测得的 采集->目标 延迟外推到现在）、外推上限、一阶跟随时间常数。
+    # 默认补偿全部延迟并把外推限制在 120 ms：跟手误差与不设上限几乎相同，丢手时不会外推太远
+    "mouse_worker_hz": 120,
+    "mouse_render_delay_ms": 0,
+    "mouse_max_extrapolate_ms": 120,
+    "mouse_follow_tau_ms": 20,
 
     "pinch_threshold_ratio": 0.33,
     "two_finger_close_ratio": 0.22,
@@ -39,7 +72,20 @@ DEFAULT_CONFIG = {
     "scroll_deadzone_px": 6,
     "scroll_max_step": 120,
     "dynamic_window_ms": 450,
-    "swipe_thresh_px": 80
+    "swipe_thresh_px": 80,
+
+    # 自定义模板匹配器：euclidean（逐点距离）/ protractor（旋转不变，闭式求最优旋转）/ dtw（带约束动态时间规整）
+    "custom_matcher": "euclidean",
+    "protractor_max_rotation_deg": 45,
+    "dtw_band_ratio": 0.1,
+
+    # 自定义手势流式检出：候选起点覆盖 [min_ms, window_ms] 的时长，距离不再下降 settle_ms 后发出
+    "custom_spot_window_ms": 1200,
+    "custom_spot_min_ms": 300,
+    "custom_spot_min_points": 10,
+    "custom_spot_min_path_px": 60,
+    "custom_spot_settle_ms": 0,
+    "custom_spot_max_candidates": 12
   },
 
   "gesture_catalog": [
@@ -186,6 +232,72 @@ DEFAULT_CONFIG = {
       "enable_when": {},
       "params": {"cooldown_ms": 450, "stable_frames": 2}
     },
+    {
+      "id": "GLOVE_FINGERS_0",
+      "title": "手套握拳（无指尖）",
+      "type": "static",
+      "mode": "glove",
+      "description": "手套轮廓检出 0 个指尖（凸包缺陷）并稳定若干帧",
+      "default_use": "custom_bind",
+      "notes": "仅手套模式",
+      "enable_when": {},
+      "params": {"cooldown_ms": 800, "stable_frames": 3}
+    },
+    {
+      "id": "GLOVE_FINGERS_1",
+      "title": "手套一指",
+      "type": "static",
+      "mode": "glove",
+      "description": "手套轮廓检出 1 个指尖（凸包缺陷）并稳定若干帧",
+      "default_use": "custom_bind",
+      "notes": "仅手套模式",
+      "enable_when": {},
+      "params": {"cooldown_ms": 800, "stable_frames": 3}
+    },
+    {
+      "id": "GLOVE_FINGERS_2",
+      "title": "手套两指",
+      "type": "static",
+      "mode": "glove",
+      "description": "手套轮廓检出 2 个指尖（凸包缺陷）并稳定若干帧",
+      "default_use": "custom_bind",
+      "notes": "仅手套模式；两指及以上同时是鼠标移动模式的条件，绑定动作时注意与移动冲突",
+      "enable_when": {},
+      "params": {"cooldown_ms": 800, "stable_frames": 3}
+    },
+    {
+      "id": "GLOVE_FINGERS_3",
+      "title": "手套三指",
+      "type": "static",
+      "mode": "glove",
+      "description": "手套轮廓检出 3 个指尖（凸包缺陷）并稳定若干帧",
+      "default_use": "custom_bind",
+      "notes": "仅手套模式；两指及以上同时是鼠标移动模式的条件，绑定动作时注意与移动冲突",
+      "enable_when": {},
+      "params": {"cooldown_ms": 800, "stable_frames": 3}
+    },
+    {
+      "id": "GLOVE_FINGERS_4",
+      "title": "手套四指",
+      "type": "static",
+      "mode": "glove",
+      "description": "手套轮廓检出 4 个指尖（凸包缺陷）并稳定若干帧",
+      "default_use": "custom_bind",
+      "notes": "仅手套模式；两指及以上同时是鼠标移动模式的条件，绑定动作时注意与移动冲突",
+      "enable_when": {},
+      "params": {"cooldown_ms": 800, "stable_frames": 3}
+    },
+    {
+      "id": "GLOVE_FINGERS_5",
+      "title": "手套五指张开",
+      "type": "static",
+      "mode": "glove",
+      "description": "手套轮廓检出 5 个指尖（凸包缺陷）并稳定若干帧",
+      "default_use": "custom_bind",
+      "notes": "仅手套模式；两指及以上同时是鼠标移动模式的条件，绑定动作时注意与移动冲突",
+      "enable_when": {},
+      "params": {"cooldown_ms": 800, "stable_frames": 3}
+    },
     {
       "id": "UNKNOWN",
       "title": "无法识别",
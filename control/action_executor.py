@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from control.input_backend import InputBackend
+
+# 执行线程忙时，队尾同一绑定的连续滚动合并为一次（滚动量相加）
+COALESCE_TYPES = frozenset(("scroll_v", "scroll_h_shiftwheel"))
+# 按下/抬起成对出现，丢掉任何一个都会让左键卡住：溢出时不丢
+_NEVER_DROP = frozenset(("mouse_down_left", "mouse_up_left"))
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+class _Item:
+    __slots__ = ("prep", "gesture", "extra", "amount", "t_capture_ns", "t_enq")
+
+    def __init__(self, prep, gesture, extra, amount, t_capture_ns, t_enq):
+        self.prep = prep
+        self.gesture = gesture
+        self.extra = extra
+        self.amount = amount
+        self.t_capture_ns = t_capture_ns
+        self.t_enq = t_enq
+
+
+class ActionExecutor:
+    """
+    动作执行线程：GUI 线程只把编译好的动作放进有界队列，按键/点击/启动程序等可能耗时数毫秒到数十毫秒的注入
+    在这里串行执行，不阻塞预览与推理。开关类动作仍由 Dispatcher 在调用线程内直接执行。
+    队满策略：drop_oldest（丢最旧，默认）/ drop_newest（丢新来的）/ block（调用方最多等 block_ms，仍满则丢新来的）。
+    stats() 按动作类型给出 执行次数 / 丢弃 / 合并 / 排队等待与执行耗时（平均与最大，ms）。
+    """
+    def __init__(self, backend: InputBackend, state, maxsize=64, overflow="drop_oldest", block_ms=20.0):
+        self.backend = backend
+        self.state = state
+        self.maxsize = max(1, int(maxsize))
+        self.overflow = overflow if overflow in OVERFLOW_POLICIES else "drop_oldest"
+        self.block_ms = float(block_ms)
+        self._q = deque()
+        self._cv = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._types = {}
+        self.max_depth = 0
+        self.errors = 0
+        self.last_error = None
+        # 最近一次执行完成的 采集->动作 延迟（ms）及对应手势
+        self.last_latency_ms = None
+        self.last_latency_gesture = None
+
+    def configure(self, general: dict):
+        self.maxsize = max(1, int(general.get("action_queue_size", 64)))
+        p = str(general.get("action_queue_overflow", "drop_oldest"))
+        self.overflow = p if p in OVERFLOW_POLICIES else "drop_oldest"
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cv:
+            self._running = False
+            self._q.clear()
+            self._cv.notify_all()
+
+    def depth(self) -> int:
+        return len(self._q)
+
+    def _type_stats(self, t):
+        st = self._types.get(t)
+        if st is None:
+            st = self._types[t] = {"count": 0, "dropped": 0, "coalesced": 0, "errors": 0,
+                                   "wait_ms": 0.0, "run_ms": 0.0, "max_wait_ms": 0.0, "max_run_ms": 0.0}
+        return st
+
+    def stats(self) -> dict:
+        """{动作类型: {count, dropped, coalesced, errors, avg_wait_ms, avg_run_ms, max_wait_ms, max_run_ms}}"""
+        out = {}
+        for t, st in list(self._types.items()):
+            n = max(1, st["count"])
+            out[t] = {"count": st["count"], "dropped": st["dropped"], "coalesced": st["coalesced"],
+                      "errors": st["errors"], "avg_wait_ms": st["wait_ms"] / n, "avg_run_ms": st["run_ms"] / n,
+                      "max_wait_ms": st["max_wait_ms"], "max_run_ms": st["max_run_ms"]}
+        return out
+
+    def submit(self, prep, gesture: str, extra: Optional[dict] = None, t_capture_ns: Optional[int] = None) -> bool:
+        """prep：Dispatcher 编译好的 PreparedAction。返回 False 表示因队满被丢弃。"""
+        t = prep.type
+        coalesce = t in COALESCE_TYPES
+        amount = 0
+        if coalesce:
+            # 有效滚动量：事件携带的优先，否则用绑定里的静态值（与 inline 执行一致）
+            amount = int(extra["amount"] if extra and "amount" in extra else prep.action.get("amount", 0))
+        with self._cv:
+            q = self._q
+            if coalesce and q:
+                tail = q[-1]
+                if tail.prep is prep:
+                    tail.amount += amount
+                    self._type_stats(t)["coalesced"] += 1
+                    return True
+
+            if len(q) >= self.maxsize:
+                if self.overflow == "block":
+                    end = time.perf_counter() + self.block_ms / 1000.0
+                    while len(q) >= self.maxsize and self._running:
+                        remain = end - time.perf_counter()
+                        if remain <= 0:
+                            break
+                        self._cv.wait(remain)
+                if len(q) >= self.maxsize and t not in _NEVER_DROP:
+                    if self.overflow == "drop_oldest":
+                        victim = next((it for it in q if it.prep.type not in _NEVER_DROP), None)
+                        if victim is None:
+                            self._type_stats(t)["dropped"] += 1
+                            return False
+                        q.remove(victim)
+                        self._type_stats(victim.prep.type)["dropped"] += 1
+                    else:
+                        self._type_stats(t)["dropped"] += 1
+                        return False
+
+            q.append(_Item(prep, gesture, None if coalesce else extra, amount, t_capture_ns, time.perf_counter()))
+            if len(q) > self.max_depth:
+                self.max_depth = len(q)
+            self._cv.notify_all()
+        return True
+
+    def _run(self):
+        while True:
+            with self._cv:
+                while self._running and not self._q:
+                    self._cv.wait()
+                if not self._running:
+                    return
+                it = self._q.popleft()
+                # 唤醒 block 策略下等待空位的调用方
+                self._cv.notify_all()
+
+            prep = it.prep
+            st = self._type_stats(prep.type)
+            # 入队后关闭了执行开关：不再执行
+            if not self.state.execution_enabled:
+                st["dropped"] += 1
+                continue
+
+            t0 = time.perf_counter()
+            extra = {"amount": it.amount} if prep.type in COALESCE_TYPES else it.extra
+            try:
+                prep.handler(prep.action, self.state, self.backend, extra)
+            except Exception as ex:
+                st["errors"] += 1
+                self.errors += 1
+                self.last_error = repr(ex)
+            t1 = time.perf_counter()
+
+            wait_ms = (t0 - it.t_enq) * 1000.0
+            run_ms = (t1 - t0) * 1000.0
+            st["count"] += 1
+            st["wait_ms"] += wait_ms
+            st["run_ms"] += run_ms
+            if wait_ms > st["max_wait_ms"]:
+                st["max_wait_ms"] = wait_ms
+            if run_ms > st["max_run_ms"]:
+                st["max_run_ms"] = run_ms
+            if it.t_capture_ns:
+                self.last_latency_ms = (time.monotonic_ns() - int(it.t_capture_ns)) / 1e6
+                self.last_latency_gesture = it.gesture
@@ -1,90 +1,142 @@
 import subprocess
-import pyautogui
-from pynput.mouse import Controller as MouseController, Button
+from typing import Callable, Dict, Optional
 
-pyautogui.FAILSAFE = False
-pyautogui.PAUSE = 0
+from control.input_backend import InputBackend
 
-mouse = MouseController()
+# 处理函数签名：handler(action, state, backend, extra)
+#   action：绑定里的静态动作（编译时已校验），extra：事件携带的动态字段（如滚动量 amount），可为 None
+Handler = Callable[[dict, object, InputBackend, Optional[dict]], None]
 
-def do_action(action: dict, state):
-    if not action:
-        return
 
-    t = action.get("type")
+def _field(action: dict, extra: Optional[dict], key: str, default=None):
+    if extra is not None and key in extra:
+        return extra[key]
+    return action.get(key, default)
 
-    # 开关类：永远允许执行
-    if t == "toggle_recognition":
-        state.recognition_enabled = not state.recognition_enabled
-        return
 
-    if t == "toggle_execution":
-        state.execution_enabled = not state.execution_enabled
-        if not state.execution_enabled:
-            try:
-                mouse.release(Button.left)
-            except Exception:
-                pass
-        return
+# ---------------- 开关类：永远允许执行 ----------------
+def _toggle_recognition(action, state, backend, extra=None):
+    state.recognition_enabled = not state.recognition_enabled
 
-    if t == "toggle_camera_preview":
-        state.camera_preview_enabled = not state.camera_preview_enabled
-        return
 
-    if t == "toggle_mouse_move_output":
-        state.mouse_move_output_enabled = not state.mouse_move_output_enabled
-        return
+def _toggle_execution(action, state, backend, extra=None):
+    state.execution_enabled = not state.execution_enabled
+    if not state.execution_enabled:
+        try:
+            backend.release("left")
+        except Exception:
+            pass
 
-    if t == "toggle_camera_device":
-        state.camera_device_enabled = not state.camera_device_enabled
-        return
 
-    # 其余动作受 execution_enabled 门控
-    if not state.execution_enabled:
-        return
+def _toggle_camera_preview(action, state, backend, extra=None):
+    state.camera_preview_enabled = not state.camera_preview_enabled
 
-    if t == "scroll_v":
-        pyautogui.scroll(int(action.get("amount", 0)))
 
-    elif t == "scroll_h_shiftwheel":
-        amt = int(action.get("amount", 0))
-        pyautogui.keyDown("shift")
-        try:
-            pyautogui.scroll(amt)
-        finally:
-            pyautogui.keyUp("shift")
+def _toggle_mouse_move_output(action, state, backend, extra=None):
+    state.mouse_move_output_enabled = not state.mouse_move_output_enabled
+
+
+def _toggle_camera_device(action, state, backend, extra=None):
+    state.camera_device_enabled = not state.camera_device_enabled
+
+
+# ---------------- 其余动作：受 execution_enabled 门控 ----------------
+def _scroll_v(action, state, backend, extra=None):
+    backend.scroll(int(_field(action, extra, "amount", 0)))
+
+
+def _scroll_h_shiftwheel(action, state, backend, extra=None):
+    amt = int(_field(action, extra, "amount", 0))
+    backend.key_down("shift")
+    try:
+        backend.scroll(amt)
+    finally:
+        backend.key_up("shift")
+
 
-    elif t == "key":
-        key = action.get("key")
-        if key:
-            pyautogui.press(key)
+def _key(action, state, backend, extra=None):
+    key = action.get("key")
+    if key:
+        backend.press_key(key)
 
-    elif t == "hotkey":
-        keys = action.get("keys", [])
-        if keys:
-            pyautogui.hotkey(*keys)
 
-    elif t == "click_left":
-        pyautogui.click(button="left")
+def _hotkey(action, state, backend, extra=None):
+    keys = action.get("keys", [])
+    if keys:
+        backend.hotkey(*keys)
 
-    elif t == "double_click_left":
-        pyautogui.doubleClick(button="left")
 
-    elif t == "click_right":
-        pyautogui.click(button="right")
+def _click_left(action, state, backend, extra=None):
+    backend.click("left")
 
-    elif t == "mouse_down_left":
-        mouse.press(Button.left)
 
-    elif t == "mouse_up_left":
-        mouse.release(Button.left)
+def _double_click_left(action, state, backend, extra=None):
+    backend.click("left", 2)
 
-    elif t == "open_program":
-        path = action.get("path")
-        if path:
-            subprocess.Popen([path], shell=False)
 
-    elif t == "shell":
-        cmd = action.get("cmd")
-        if cmd:
-            subprocess.Popen(cmd, shell=True)
\ No newline at end of file
+def _click_right(action, state, backend, extra=None):
+    backend.click("right")
+
+
+def _mouse_down_left(action, state, backend, extra=None):
+    backend.press("left")
+
+
+def _mouse_up_left(action, state, backend, extra=None):
+    backend.release("left")
+
+
+def _open_program(action, state, backend, extra=None):
+    path = action.get("path")
+    if path:
+        subprocess.Popen([path], shell=False)
+
+
+def _shell(action, state, backend, extra=None):
+    cmd = action.get("cmd")
+    if cmd:
+        subprocess.Popen(cmd, shell=True)
+
+
+HANDLERS: Dict[str, Handler] = {
+    "toggle_recognition": _toggle_recognition,
+    "toggle_execution": _toggle_execution,
+    "toggle_camera_preview": _toggle_camera_preview,
+    "toggle_mouse_move_output": _toggle_mouse_move_output,
+    "toggle_camera_device": _toggle_camera_device,
+    "scroll_v": _scroll_v,
+    "scroll_h_shiftwheel": _scroll_h_shiftwheel,
+    "key": _key,
+    "hotkey": _hotkey,
+    "click_left": _click_left,
+    "double_click_left": _double_click_left,
+    "click_right": _click_right,
+    "mouse_down_left": _mouse_down_left,
+    "mouse_up_left": _mouse_up_left,
+    "open_program": _open_program,
+    "shell": _shell,
+}
+
+TOGGLE_TYPES = frozenset((
+    "toggle_recognition", "toggle_execution",
+    "toggle_camera_preview", "toggle_mouse_move_output",
+    "toggle_camera_device",
+))
+
+# 由事件在分发时提供的字段（绑定里可以不写，编译校验时不算缺失）
+PAYLOAD_FIELDS = {
+    "scroll_v": ("amount",),
+    "scroll_h_shiftwheel": ("amount",),
+}
+
+
+def do_action(action: dict, state, backend: InputBackend, extra: Optional[dict] = None):
+    if not action:
+        return
+    t = action.get("type")
+    fn = HANDLERS.get(t)
+    if fn is None:
+        return
+    if t not in TOGGLE_TYPES and not state.execution_enabled:
+        return
+    fn(action, state, backend, extra)
@@ -1,14 +1,170 @@
 import platform
+import time
+from typing import Optional
 
-def get_foreground_process_name():
-    if platform.system() != "Windows":
-        return None
-    try:
+
+class AppContextProvider:
+    """
+    前台应用名（进程名，如 "firefox.exe"）查询接口。
+    current() 在 ttl_ms 内直接返回缓存，不做任何系统调用；过期后先取前台窗口句柄，
+    句柄未变则沿用缓存的进程名，只有窗口切换时才去查 pid -> 进程名。
+    """
+    name = "base"
+
+    def __init__(self, ttl_ms: float = 250.0):
+        self.ttl_ms = float(ttl_ms)
+        self._app: Optional[str] = None
+        self._win = None
+        self._t_next = 0.0
+        self.stats = {"calls": 0, "cached": 0, "polls": 0, "changes": 0, "resolves": 0}
+
+    def _foreground(self):
+        """返回 (窗口句柄, pid)；取不到时返回 (None, None)。"""
+        raise NotImplementedError
+
+    def _process_name(self, pid: int) -> Optional[str]:
+        raise NotImplementedError
+
+    def invalidate(self):
+        self._t_next = 0.0
+
+    def current(self) -> Optional[str]:
+        st = self.stats
+        st["calls"] += 1
+        now = time.monotonic()
+        if now < self._t_next:
+            st["cached"] += 1
+            return self._app
+        self._t_next = now + self.ttl_ms / 1000.0
+
+        st["polls"] += 1
+        try:
+            win, pid = self._foreground()
+        except Exception:
+            win, pid = None, None
+        if win == self._win and win is not None:
+            return self._app
+        st["changes"] += 1
+        self._win = win
+        if pid is None:
+            self._app = None
+            return None
+
+        st["resolves"] += 1
+        try:
+            app = self._process_name(pid)
+        except Exception:
+            app = None
+        self._app = app or None
+        return self._app
+
+
+class Win32AppProvider(AppContextProvider):
+    """GetForegroundWindow + GetWindowThreadProcessId；进程名经 psutil 查询（只在切换窗口时发生）。"""
+    name = "win32"
+
+    def __init__(self, ttl_ms: float = 250.0):
+        super().__init__(ttl_ms)
         import win32gui
         import win32process
         import psutil
-        hwnd = win32gui.GetForegroundWindow()
-        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-        return psutil.Process(pid).name()
-    except Exception:
-        return None
\ No newline at end of file
+        self._gui = win32gui
+        self._proc = win32process
+        self._psutil = psutil
+
+    def _foreground(self):
+        hwnd = self._gui.GetForegroundWindow()
+        if not hwnd:
+            return None, None
+        _, pid = self._proc.GetWindowThreadProcessId(hwnd)
+        return hwnd, (pid or None)
+
+    def _process_name(self, pid):
+        return self._psutil.Process(pid).name()
+
+
+class X11AppProvider(AppContextProvider):
+    """_NET_ACTIVE_WINDOW + _NET_WM_PID（python-xlib，pyautogui 在 Linux 上的依赖）；进程名读 /proc/<pid>/comm。"""
+    name = "x11"
+
+    def __init__(self, ttl_ms: float = 250.0):
+        super().__init__(ttl_ms)
+        from Xlib import X, display
+        self._X = X
+        self._dpy = display.Display()
+        self._root = self._dpy.screen().root
+        self._active = self._dpy.intern_atom("_NET_ACTIVE_WINDOW")
+        self._pid = self._dpy.intern_atom("_NET_WM_PID")
+
+    def _foreground(self):
+        prop = self._root.get_full_property(self._active, self._X.AnyPropertyType)
+        if prop is None or not prop.value or not prop.value[0]:
+            return None, None
+        wid = int(prop.value[0])
+        win = self._dpy.create_resource_object("window", wid)
+        p = win.get_full_property(self._pid, self._X.AnyPropertyType)
+        pid = int(p.value[0]) if p is not None and len(p.value) else None
+        return wid, pid
+
+    def _process_name(self, pid):
+        with open(f"/proc/{pid}/comm", "r", encoding="utf-8", errors="replace") as f:
+            return f.read().strip() or None
+
+
+class FakeAppProvider(AppContextProvider):
+    """无系统依赖：前台应用由 set_app() 指定（测试 / 基准 / 不支持的平台）；lookups 记录实际查询次数。"""
+    name = "fake"
+
+    def __init__(self, app: Optional[str] = None, ttl_ms: float = 250.0):
+        super().__init__(ttl_ms)
+        self._fake = app
+        self._seq = 0
+        self.lookups = 0
+
+    def set_app(self, app: Optional[str]):
+        """模拟切换前台窗口：生成新的窗口句柄（缓存要等 TTL 过期后才会看到）。"""
+        self._fake = app
+        self._seq += 1
+
+    def _foreground(self):
+        self.lookups += 1
+        if self._fake is None:
+            return None, None
+        return self._seq, self._seq
+
+    def _process_name(self, pid):
+        return self._fake
+
+
+_PROVIDERS = {}
+
+
+def make_app_provider(general: dict) -> AppContextProvider:
+    """
+    按 general.app_provider 选择：auto（Windows -> win32，Linux -> x11）/ win32 / x11 / fake。
+    依赖缺失或无图形会话时退回 fake（始终返回 None，只走全局绑定）。同类进程内只创建一次。
+    """
+    kind = str(general.get("app_provider", "auto")).lower()
+    ttl_ms = float(general.get("app_context_ttl_ms", 250))
+    if kind == "auto":
+        kind = {"Windows": "win32", "Linux": "x11"}.get(platform.system(), "fake")
+    p = _PROVIDERS.get(kind)
+    if p is None:
+        try:
+            if kind == "win32":
+                p = Win32AppProvider(ttl_ms)
+            elif kind == "x11":
+                p = X11AppProvider(ttl_ms)
+            else:
+                p = FakeAppProvider(ttl_ms=ttl_ms)
+        except Exception:
+            p = _PROVIDERS.get("fake") or FakeAppProvider(ttl_ms=ttl_ms)
+            kind = "fake"
+        _PROVIDERS[kind] = p
+    p.ttl_ms = ttl_ms
+    return p
+
+
+def get_foreground_process_name():
+    """兼容旧接口：经默认 provider（带缓存）查询。"""
+    return make_app_provider({}).current()
@@ -1,59 +1,143 @@
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+from config.schema_runtime import action_schema_from_catalog, validate_object
+from control.action_executor import ActionExecutor
+from control.app_context import AppContextProvider, make_app_provider
+from control.actions import HANDLERS, TOGGLE_TYPES, PAYLOAD_FIELDS, Handler
+from control.input_backend import InputBackend, make_input_backend
+
+_BLOCKED = {"type": "blocked_execution"}
+
+
+class PreparedAction:
+    """编译后的绑定：动作类型已解析为处理函数，静态字段已按 action_catalog 校验。"""
+    __slots__ = ("type", "action", "handler", "is_toggle")
+
+    def __init__(self, action: dict, handler: Handler):
+        self.type = action.get("type")
+        self.action = action
+        self.handler = handler
+        self.is_toggle = self.type in TOGGLE_TYPES
 
-from control.app_context import get_foreground_process_name
-from control.actions import do_action
 
 class Dispatcher:
-    def __init__(self, config: dict, state):
+    def __init__(self, config: dict, state, backend: Optional[InputBackend] = None,
+                 app_provider: Optional[AppContextProvider] = None, executor: Optional[ActionExecutor] = None):
         self.config = config
         self.state = state
+        self.backend = backend or make_input_backend(config.get("general", {}))
+        self.app_provider = app_provider or make_app_provider(config.get("general", {}))
+        # 非开关类动作交给执行线程；None 则在调用线程内直接执行
+        self.executor = executor
         self.last_fire = {}
+        # 最近一次执行动作的 采集->动作 延迟（ms）及对应手势
+        self.last_latency_ms = None
+        self.last_latency_gesture = None
+        self.compile()
+
+    def compile(self):
+        """
+        把 bindings 编译成一张扁平表：全局绑定以手势名为键，应用绑定以 (应用名, 手势名) 为键。
+        配置加载或绑定编辑后调用；未知类型或校验失败的绑定不进表，原因记在 binding_errors。
+        """
+        b = self.config.get("bindings", {}) or {}
+        catalog = self.config.get("action_catalog", []) or []
+        schemas = {}
+        table = {}
+        app_gestures = set()
+        errors: List[str] = []
+
+        def prepare(action, path):
+            if not isinstance(action, dict):
+                errors.append(f"{path}: 不是对象(dict)")
+                return None
+            t = action.get("type")
+            fn = HANDLERS.get(t)
+            if fn is None:
+                errors.append(f"{path}.type: 未知动作类型 {t!r}")
+                return None
+            if t not in schemas:
+                schemas[t] = action_schema_from_catalog(catalog, t)
+            schema = schemas[t]
+            if schema is not None:
+                # 与绑定编辑器一致：校验除 type 以外的字段；事件在分发时提供的字段可以不写
+                payload = {k: v for k, v in action.items() if k != "type"}
+                dyn = PAYLOAD_FIELDS.get(t, ())
+                errs = [e for e in validate_object(payload, schema, path)
+                        if not (e.message == "缺少必填字段" and e.path.rsplit(".", 1)[-1] in dyn)]
+                if errs:
+                    errors.extend(f"{e.path}: {e.message}" for e in errs)
+                    return None
+            return PreparedAction(action, fn)
+
+        for g, a in (b.get("global", {}) or {}).items():
+            p = prepare(a, f"bindings.global.{g}")
+            if p is not None:
+                table[g] = p
+        for app, m in (b.get("per_app", {}) or {}).items():
+            for g, a in (m or {}).items():
+                p = prepare(a, f"bindings.per_app.{app}.{g}")
+                if p is not None:
+                    table[(app, g)] = p
+                    app_gestures.add(g)
+
+        self._table = table
+        self._app_gestures = frozenset(app_gestures)
+        self.binding_errors = errors
 
     def _cooldown_ok(self, key: str, cd_ms: int):
-        now = time.time() * 1000
-        last = self.last_fire.get(key, 0)
-        if now - last >= cd_ms:
+        now = time.monotonic_ns() / 1e6
+        last = self.last_fire.get(key)
+        if last is None or now - last >= cd_ms:
             self.last_fire[key] = now
             return True
         return False
 
-    def resolve_action(self, gesture_name: str):
-        b = self.config.get("bindings", {})
-        per_app = b.get("per_app", {})
-        glob = b.get("global", {})
+    def resolve(self, gesture_name: str) -> Optional[PreparedAction]:
+        # 只有某个应用覆盖了该手势时才查询前台应用（滚动等高频事件通常没有覆盖，不触发任何系统调用）
+        if gesture_name in self._app_gestures:
+            app = self.app_provider.current()
+            if app:
+                p = self._table.get((app, gesture_name))
+                if p is not None:
+                    return p
+        return self._table.get(gesture_name)
 
-        app = get_foreground_process_name()
-        if app and app in per_app and gesture_name in per_app[app]:
-            return per_app[app][gesture_name]
-        return glob.get(gesture_name)
+    def resolve_action(self, gesture_name: str):
+        p = self.resolve(gesture_name)
+        return p.action if p is not None else None
 
-    def dispatch(self, gesture_name: str, cooldown_ms: int, extra_payload: Optional[Dict[str, Any]] = None):
+    def dispatch(self, gesture_name: str, cooldown_ms: int, extra_payload: Optional[Dict[str, Any]] = None,
+                 t_capture_ns: Optional[int] = None):
+        """
+        extra_payload：事件携带的动态字段（如滚动量），直接交给处理函数，不复制绑定。
+        t_capture_ns：触发该事件的帧的采集时刻（time.monotonic_ns），用于统计 采集->动作 延迟。
+        返回实际执行的动作（带动态字段时为绑定与 extra_payload 的合并，供 OSD/日志显示；静态动作直接返回绑定本身，
+        不分配）；被执行开关拦截时返回 {"type": "blocked_execution"}。
+        有执行线程时非开关动作只入队即返回，延迟统计由执行线程在执行完成时记录。
+        """
         if not gesture_name:
             return None
 
-        action = self.resolve_action(gesture_name)
-        if not action:
+        p = self.resolve(gesture_name)
+        if p is None:
             return None
 
-        typ = action.get("type")
-        is_toggle = typ in (
-            "toggle_recognition", "toggle_execution",
-            "toggle_camera_preview", "toggle_mouse_move_output",
-            "toggle_camera_device"
-        )
-
-        if not is_toggle and not self.state.execution_enabled:
-            return {"type": "blocked_execution"}
+        if not p.is_toggle and not self.state.execution_enabled:
+            return _BLOCKED
 
         if cooldown_ms and cooldown_ms > 0:
             if not self._cooldown_ok(gesture_name, int(cooldown_ms)):
                 return None
 
+        if self.executor is not None and not p.is_toggle:
+            self.executor.submit(p, gesture_name, extra_payload, t_capture_ns)
+        else:
+            p.handler(p.action, self.state, self.backend, extra_payload)
+            if t_capture_ns:
+                self.last_latency_ms = (time.monotonic_ns() - int(t_capture_ns)) / 1e6
+                self.last_latency_gesture = gesture_name
         if extra_payload:
-            merged = dict(action)
-            merged.update(extra_payload)
-            action = merged
-
-        do_action(action, self.state)
-        return action
\ No newline at end of file
+            return {**p.action, **extra_payload}
+        return p.action
@@ -0,0 +1,259 @@
+import platform
+from typing import Optional, Tuple
+
+
+class InputBackend:
+    """
+    鼠标/键盘注入接口：热路径（move_to / position）与动作执行共用一个实例，控制器句柄常驻。
+    按键名沿用 pyautogui 的写法（不区分大小写，如 "ctrl" / "PageUp" / "volumeup"）；
+    scroll 的 amount 也沿用 pyautogui 的单位（Windows 为滚轮原始增量，120 为一格；其他平台为格数）。
+    """
+    name = "base"
+
+    def screen_size(self) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    def position(self) -> Tuple[float, float]:
+        raise NotImplementedError
+
+    def move_to(self, x: float, y: float):
+        raise NotImplementedError
+
+    def press(self, button: str = "left"):
+        raise NotImplementedError
+
+    def release(self, button: str = "left"):
+        raise NotImplementedError
+
+    def click(self, button: str = "left", count: int = 1):
+        raise NotImplementedError
+
+    def scroll(self, amount: int):
+        raise NotImplementedError
+
+    def key_down(self, key: str):
+        raise NotImplementedError
+
+    def key_up(self, key: str):
+        raise NotImplementedError
+
+    def press_key(self, key: str):
+        self.key_down(key)
+        self.key_up(key)
+
+    def hotkey(self, *keys: str):
+        pressed = []
+        try:
+            for k in keys:
+                self.key_down(k)
+                pressed.append(k)
+        finally:
+            for k in reversed(pressed):
+                self.key_up(k)
+
+
+class PyAutoGuiBackend(InputBackend):
+    """原实现：每次调用都经过 pyautogui 的参数校验与失败保护层。"""
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        pyautogui.FAILSAFE = False
+        pyautogui.PAUSE = 0
+        self._pg = pyautogui
+        self._size = None
+
+    def screen_size(self):
+        if self._size is None:
+            s = self._pg.size()
+            self._size = (int(s[0]), int(s[1]))
+        return self._size
+
+    def position(self):
+        p = self._pg.position()
+        return float(p[0]), float(p[1])
+
+    def move_to(self, x, y):
+        self._pg.moveTo(x, y)
+
+    def press(self, button="left"):
+        self._pg.mouseDown(button=button)
+
+    def release(self, button="left"):
+        self._pg.mouseUp(button=button)
+
+    def click(self, button="left", count=1):
+        self._pg.click(button=button, clicks=int(count))
+
+    def scroll(self, amount):
+        self._pg.scroll(int(amount))
+
+    def key_down(self, key):
+        self._pg.keyDown(key)
+
+    def key_up(self, key):
+        self._pg.keyUp(key)
+
+    def press_key(self, key):
+        self._pg.press(key)
+
+    def hotkey(self, *keys):
+        self._pg.hotkey(*keys)
+
+
+# pyautogui 键名 -> pynput Key 属性名（未列出的多字符键名直接按同名属性查找）
+_PYNPUT_KEY_ALIASES = {
+    "control": "ctrl", "ctrlleft": "ctrl_l", "ctrlright": "ctrl_r",
+    "shiftleft": "shift_l", "shiftright": "shift_r",
+    "altleft": "alt_l", "altright": "alt_r", "option": "alt",
+    "win": "cmd", "winleft": "cmd_l", "winright": "cmd_r", "command": "cmd", "super": "cmd",
+    "return": "enter", "escape": "esc", "del": "delete",
+    "pgup": "page_up", "pageup": "page_up", "pgdn": "page_down", "pagedown": "page_down",
+    "capslock": "caps_lock", "numlock": "num_lock", "scrolllock": "scroll_lock",
+    "printscreen": "print_screen", "prtsc": "print_screen", "prntscrn": "print_screen",
+    "volumeup": "media_volume_up", "volumedown": "media_volume_down", "volumemute": "media_volume_mute",
+    "playpause": "media_play_pause", "nexttrack": "media_next", "prevtrack": "media_previous",
+    "apps": "menu",
+}
+
+# pyautogui.scroll 的 amount -> pynput scroll 的 dy：Windows 下 pyautogui 发送原始滚轮增量，pynput 以格为单位（×120）
+_SCROLL_SCALE = {"Windows": 1.0 / 120.0}
+
+
+class PynputBackend(InputBackend):
+    """pynput 控制器常驻，直接调用系统注入接口（Windows SendInput / X11 XTest / macOS Quartz），无额外校验层。"""
+    name = "pynput"
+
+    def __init__(self, scroll_scale: Optional[float] = None):
+        from pynput import mouse, keyboard
+        self._mouse = mouse.Controller()
+        self._kbd = keyboard.Controller()
+        self._buttons = {"left": mouse.Button.left, "right": mouse.Button.right, "middle": mouse.Button.middle}
+        self._Key = keyboard.Key
+        self._keys = {}
+        self._size = None
+        self.scroll_scale = float(scroll_scale) if scroll_scale is not None else \
+            _SCROLL_SCALE.get(platform.system(), 1.0)
+
+    def _key(self, name: str):
+        k = self._keys.get(name)
+        if k is None:
+            if len(name) == 1:
+                k = name
+            else:
+                low = name.lower()
+                k = getattr(self._Key, _PYNPUT_KEY_ALIASES.get(low, low), None)
+            if k is None:
+                # 与 pyautogui 一致：未知键名忽略
+                return None
+            self._keys[name] = k
+        return k
+
+    def screen_size(self):
+        if self._size is None:
+            # pynput 不提供屏幕尺寸，只在启动时查一次
+            import pyautogui
+            s = pyautogui.size()
+            self._size = (int(s[0]), int(s[1]))
+        return self._size
+
+    def position(self):
+        x, y = self._mouse.position
+        return float(x), float(y)
+
+    def move_to(self, x, y):
+        self._mouse.position = (int(x), int(y))
+
+    def press(self, button="left"):
+        self._mouse.press(self._buttons[button])
+
+    def release(self, button="left"):
+        self._mouse.release(self._buttons[button])
+
+    def click(self, button="left", count=1):
+        self._mouse.click(self._buttons[button], int(count))
+
+    def scroll(self, amount):
+        self._mouse.scroll(0, amount * self.scroll_scale)
+
+    def key_down(self, key):
+        k = self._key(key)
+        if k is not None:
+            self._kbd.press(k)
+
+    def key_up(self, key):
+        k = self._key(key)
+        if k is not None:
+            self._kbd.release(k)
+
+
+class NullBackend(InputBackend):
+    """不注入任何输入（无界面回放 / 基准），只记录光标位置与调用次数。"""
+    name = "null"
+
+    def __init__(self, size=(1920, 1080)):
+        self._size = (int(size[0]), int(size[1]))
+        self._pos = (self._size[0] / 2.0, self._size[1] / 2.0)
+        self.calls = 0
+
+    def screen_size(self):
+        return self._size
+
+    def position(self):
+        return self._pos
+
+    def move_to(self, x, y):
+        self.calls += 1
+        self._pos = (float(x), float(y))
+
+    def press(self, button="left"):
+        self.calls += 1
+
+    def release(self, button="left"):
+        self.calls += 1
+
+    def click(self, button="left", count=1):
+        self.calls += 1
+
+    def scroll(self, amount):
+        self.calls += 1
+
+    def key_down(self, key):
+        self.calls += 1
+
+    def key_up(self, key):
+        self.calls += 1
+
+
+_BACKENDS = {}
+
+
+def make_input_backend(general: dict) -> InputBackend:
+    """
+    按 general.input_backend 选择注入后端：auto（优先 pynput）/ pynput / pyautogui / null。
+    同类后端进程内只创建一次，鼠标线程、光标映射与动作执行共用同一组控制器。
+    """
+    kind = str(general.get("input_backend", "auto")).lower()
+    scale = general.get("input_scroll_scale")
+    order = {"auto": ("pynput", "pyautogui"), "pynput": ("pynput", "pyautogui"),
+             "pyautogui": ("pyautogui",), "null": ("null",)}.get(kind, ("pynput", "pyautogui"))
+    last_err = None
+    for name in order:
+        be = _BACKENDS.get(name)
+        if be is None:
+            try:
+                if name == "pynput":
+                    be = PynputBackend()
+                elif name == "pyautogui":
+                    be = PyAutoGuiBackend()
+                else:
+                    be = NullBackend()
+            except Exception as ex:
+                # 缺少依赖或无图形会话：退到下一个
+                last_err = ex
+                continue
+            _BACKENDS[name] = be
+        if isinstance(be, PynputBackend):
+            be.scroll_scale = float(scale) if scale is not None else _SCROLL_SCALE.get(platform.system(), 1.0)
+        return be
+    raise RuntimeError(f"没有可用的输入后端：{kind}（{last_err}）")
@@ -1,27 +1,45 @@
+import time
 from dataclasses import dataclass
-import pyautogui
+from typing import Optional
+
+from control.input_backend import InputBackend
+from vision.one_euro import OneEuroFilter
 
 @dataclass
 class MouseParams:
     smoothing: float = 0.35
     sensitivity: float = 1.0
     deadzone_px: int = 2
+    # 光标平滑：ema（固定系数 smoothing）/ one_euro（按速度自适应截止频率，参数单位为屏幕像素）
+    filter: str = "ema"
+    min_cutoff: float = 1.0
+    beta: float = 0.007
+    d_cutoff: float = 1.0
 
 class MouseController:
-    def __init__(self, params: MouseParams):
+    def __init__(self, params: MouseParams, backend: InputBackend):
         self.params = params
+        self.backend = backend
         self._sx = None
         self._sy = None
-        self._sw, self._sh = pyautogui.size()
+        self._sw, self._sh = backend.screen_size()
+        self._euro = OneEuroFilter(params.min_cutoff, params.beta, params.d_cutoff)
 
     def update(self, params: MouseParams):
+        if params.filter != self.params.filter:
+            self.reset()
         self.params = params
+        self._euro.min_cutoff = float(params.min_cutoff)
+        self._euro.beta = float(params.beta)
+        self._euro.d_cutoff = float(params.d_cutoff)
 
     def reset(self):
         self._sx = None
         self._sy = None
+        self._euro.reset()
 
-    def compute_target(self, x_px: float, y_px: float, frame_w: int, frame_h: int):
+    def compute_target(self, x_px: float, y_px: float, frame_w: int, frame_h: int, t_s: Optional[float] = None):
+        """t_s：该帧的采集时刻（秒，单调时钟），one_euro 按真实帧间隔计算速度；缺省取现在。"""
         if frame_w <= 1 or frame_h <= 1:
             return None
 
@@ -35,14 +53,17 @@ class MouseController:
         tx = max(0, min(self._sw - 1, tx))
         ty = max(0, min(self._sh - 1, ty))
 
-        if self._sx is None:
+        if self.params.filter == "one_euro":
+            fx, fy = self._euro((tx, ty), time.monotonic() if t_s is None else t_s)
+            self._sx, self._sy = float(fx), float(fy)
+        elif self._sx is None:
             self._sx, self._sy = tx, ty
         else:
             a = float(self.params.smoothing)
             self._sx = self._sx * a + tx * (1 - a)
             self._sy = self._sy * a + ty * (1 - a)
 
-        cur = pyautogui.position()
-        if abs(self._sx - cur.x) < self.params.deadzone_px and abs(self._sy - cur.y) < self.params.deadzone_px:
+        px, py = self.backend.position()
+        if abs(self._sx - px) < self.params.deadzone_px and abs(self._sy - py) < self.params.deadzone_px:
             return None
         return (self._sx, self._sy)
\ No newline at end of file
@@ -1,24 +1,43 @@
+import math
 import time
 import threading
-from dataclasses import dataclass
-import pyautogui
+from collections import deque
+from typing import Optional
 
-pyautogui.FAILSAFE = False
-pyautogui.PAUSE = 0
+from control.input_backend import InputBackend
 
-@dataclass
-class Target:
-    x: float = 0.0
-    y: float = 0.0
-    valid: bool = False
 
 class MouseMoveWorker:
-    def __init__(self, hz=60):
-        self.hz = max(10, int(hz))
+    """
+    高频光标输出线程（默认 120 Hz，可到 240 Hz）。
+    推理只以 infer_fps 给出目标点；这里保留最近几个带采集时刻的目标点，
+    在 渲染时刻 = 现在 − render_delay 处插值（落在两点之间）或线性外推（晚于最新点，最多 max_extrapolate_ms），
+    render_delay=0 即按测得的 采集->目标 延迟把光标外推到“现在”。输出再经时间常数 tau 的一阶跟随，
+    新目标到来时不跳变。按绝对截止时刻调度（不累计漂移），落后超过一个周期则跳过错过的节拍。
+    等待全部用 sleep（先睡到截止前 wake_early_us，再睡剩余部分），不忙等占满一个核。
+    默认补偿全部测得延迟（render_delay=0），外推上限 120 ms：比 采集->目标 延迟 + 一个推理间隔略短，
+    跟手误差与不设上限几乎相同，丢手/停顿时也不会外推太远；上限再短光标会在两次推理之间停顿再跳。
+    """
+    def __init__(self, backend: InputBackend, hz=120, render_delay_ms=0.0, max_extrapolate_ms=120.0, tau_ms=20.0,
+                 wake_early_us=1000):
+        self.backend = backend
+        self.hz = min(240, max(10, int(hz)))
+        self.render_delay_ms = float(render_delay_ms)
+        self.max_extrapolate_ms = float(max_extrapolate_ms)
+        self.tau_ms = float(tau_ms)
+        self.wake_early_us = int(wake_early_us)
         self._lock = threading.Lock()
-        self._tgt = Target()
+        # (t_perf_s, x, y)：t 为该目标对应帧的采集时刻（换算到 perf_counter 时钟）
+        self._samples = deque(maxlen=4)
         self._running = False
         self._thread = None
+        self._reset_stats()
+
+    def configure(self, general: dict):
+        self.hz = min(240, max(10, int(general.get("mouse_worker_hz", 120))))
+        self.render_delay_ms = float(general.get("mouse_render_delay_ms", 0.0))
+        self.max_extrapolate_ms = float(general.get("mouse_max_extrapolate_ms", 120.0))
+        self.tau_ms = float(general.get("mouse_follow_tau_ms", 20.0))
 
     def start(self):
         if self._running:
@@ -30,26 +49,110 @@ class MouseMoveWorker:
     def stop(self):
         self._running = False
 
-    def set_target(self, x, y):
+    def set_target(self, x, y, t_capture_ns: Optional[int] = None):
+        """t_capture_ns：目标所属帧的采集时刻（time.monotonic_ns）；缺省视为现在。"""
+        now = time.perf_counter()
+        age = 0.0
+        if t_capture_ns:
+            age = max(0.0, (time.monotonic_ns() - int(t_capture_ns)) / 1e9)
         with self._lock:
-            self._tgt = Target(float(x), float(y), True)
+            if self._samples and now - age <= self._samples[-1][0]:
+                # 时间戳不递增（同一帧重复投递等）：替换最新点
+                self._samples.pop()
+            self._samples.append((now - age, float(x), float(y)))
+        st = self.stats
+        st["latency_ms"] = age * 1000.0 if st["latency_ms"] is None else 0.9 * st["latency_ms"] + 0.1 * age * 1000.0
 
     def invalidate(self):
         with self._lock:
-            self._tgt.valid = False
+            self._samples.clear()
+
+    def _reset_stats(self):
+        self.stats = {"ticks": 0, "missed": 0, "moves": 0, "extrapolated": 0, "latency_ms": None}
+        self._late_us = deque(maxlen=1024)
+
+    def jitter_stats(self) -> dict:
+        """节拍唤醒偏差（实际唤醒 − 截止时刻，us）的均值 / p99 / 最大值，以及计数与平均 采集->目标 延迟。"""
+        late = sorted(self._late_us)
+        out = dict(self.stats)
+        if late:
+            out["late_mean_us"] = sum(late) / len(late)
+            out["late_p99_us"] = late[min(len(late) - 1, int(0.99 * len(late)))]
+            out["late_max_us"] = late[-1]
+        return out
+
+    def _sample_at(self, samples, rt: float):
+        """rt 时刻的目标位置：落在样本之间线性插值，晚于最新样本则按最后两点的速度外推（有上限）。"""
+        t1, x1, y1 = samples[-1]
+        if len(samples) == 1:
+            return x1, y1, False
+        if rt >= t1:
+            t0, x0, y0 = samples[-2]
+            dt = min(rt - t1, self.max_extrapolate_ms / 1000.0)
+            k = dt / max(1e-3, t1 - t0)
+            return x1 + (x1 - x0) * k, y1 + (y1 - y0) * k, dt > 0
+        for i in range(len(samples) - 1, 0, -1):
+            t0, x0, y0 = samples[i - 1]
+            if rt >= t0:
+                t1, x1, y1 = samples[i]
+                u = (rt - t0) / max(1e-6, t1 - t0)
+                return x0 + (x1 - x0) * u, y0 + (y1 - y0) * u, False
+        _, x0, y0 = samples[0]
+        return x0, y0, False
 
     def _run(self):
+        st = self.stats
+        sw, sh = self.backend.screen_size()
+        out = None          # 当前输出位置（浮点）
+        sent = None         # 上次实际发送的整数位置
         interval = 1.0 / self.hz
+        deadline = time.perf_counter() + interval
         while self._running:
-            t0 = time.time()
+            # 绝对截止时刻调度：粗睡到截止前 wake_early_us，醒来后再睡剩余的一小段（不忙等）
+            remain = deadline - time.perf_counter() - self.wake_early_us / 1e6
+            if remain > 0:
+                time.sleep(remain)
+            remain = deadline - time.perf_counter()
+            if remain > 0:
+                time.sleep(remain)
+            now = time.perf_counter()
+            self._late_us.append((now - deadline) * 1e6)
+            st["ticks"] += 1
+
+            if interval != 1.0 / self.hz:
+                # 运行中改了频率：从现在重新起算
+                interval = 1.0 / self.hz
+                deadline = now
+            deadline += interval
+            if now > deadline:
+                # 落后超过一个周期：跳过错过的节拍，不追赶
+                skip = int((now - deadline) / interval) + 1
+                st["missed"] += skip
+                deadline += skip * interval
+
             with self._lock:
-                tgt = Target(self._tgt.x, self._tgt.y, self._tgt.valid)
-            if tgt.valid:
+                samples = tuple(self._samples)
+            if not samples:
+                out = None
+                sent = None
+                continue
+
+            x, y, extra = self._sample_at(samples, now - self.render_delay_ms / 1000.0)
+            if extra:
+                st["extrapolated"] += 1
+            x = min(sw - 1.0, max(0.0, x))
+            y = min(sh - 1.0, max(0.0, y))
+            if out is None or self.tau_ms <= 0:
+                out = (x, y)
+            else:
+                a = 1.0 - math.exp(-interval * 1000.0 / self.tau_ms)
+                out = (out[0] + (x - out[0]) * a, out[1] + (y - out[1]) * a)
+
+            pos = (int(round(out[0])), int(round(out[1])))
+            if pos != sent:
                 try:
-                    pyautogui.moveTo(tgt.x, tgt.y)
+                    self.backend.move_to(pos[0], pos[1])
+                    st["moves"] += 1
                 except Exception:
                     pass
-            dt = time.time() - t0
-            sleep = interval - dt
-            if sleep > 0:
-                time.sleep(sleep)
\ No newline at end of file
+                sent = pos
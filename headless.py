@@ -0,0 +1,86 @@
+"""
+无界面运行：帧来源 -> InferencePipeline，不依赖摄像头和 Qt 窗口，便于在 Linux CI 上回放录制做回归/基准。
+
+用法：
+  python headless.py --source video --path clip.mp4 --fast
+  python headless.py --source recording --path session.npz --mode glove
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from config_io import load_config, DEFAULT_CONFIG_PATH
+from control.state import SystemState
+from vision.frame_source import make_frame_source
+from vision.pipeline import InferencePipeline
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    ap.add_argument("--source", default=None, help="覆盖 general.frame_source：camera/video/recording")
+    ap.add_argument("--path", default=None, help="覆盖 general.frame_source_path")
+    ap.add_argument("--fast", action="store_true", help="回放不按原始节奏，尽可能快")
+    ap.add_argument("--mode", default="bare", choices=["bare", "glove"])
+    ap.add_argument("--frames", type=int, default=0, help="最多处理帧数（0=直到来源结束）")
+    args = ap.parse_args()
+
+    cfg = load_config(args.config)
+    g = cfg["general"]
+    if args.source:
+        g["frame_source"] = args.source
+    if args.path:
+        g["frame_source_path"] = args.path
+    if args.fast:
+        g["frame_source_realtime"] = False
+    # 回放跑完即结束
+    g["frame_source_loop"] = False
+
+    state = SystemState(execution_enabled=False)
+    pipe = InferencePipeline(cfg, state)
+    src = make_frame_source(g)
+    if not src.open():
+        raise SystemExit(f"无法打开帧来源：{g.get('frame_source')} {g.get('frame_source_path')}")
+
+    timings = {}
+    events = []
+    n = 0
+    t0 = time.perf_counter()
+    # 回放帧用媒体时间戳驱动引擎（停留/冷却/挥动/自定义检出的计时与回放速度无关，结果可复现）；
+    # 加上一个固定起点，使时间戳与相机源一样为正的单调时钟量级
+    base_ns = 0 if src.name == "camera" else time.monotonic_ns()
+    try:
+        while not src.finished:
+            ok, frame, ts_ns = src.read()
+            if not ok:
+                continue
+            # 与 CameraThread 一致的镜像处理
+            if g.get("mirror_camera", True):
+                frame = cv2.flip(frame, 1)
+            res = pipe.process(frame, args.mode, seq=n + 1, t_ns=base_ns + ts_ns)
+            for k, v in res.timings.items():
+                # 快速回放时 采集->结果 相对媒体时间没有意义
+                if args.fast and k == "capture_to_result_ms":
+                    continue
+                timings.setdefault(k, []).append(v)
+            if res.event:
+                events.append((n, res.event))
+            n += 1
+            if args.frames and n >= args.frames:
+                break
+    finally:
+        src.release()
+    dt = time.perf_counter() - t0
+
+    print(f"frames={n} wall={dt:.2f}s fps={n / max(dt, 1e-6):.1f}")
+    for k, v in timings.items():
+        a = np.asarray(v)
+        print(f"{k:>12}: mean={a.mean():.2f}ms p95={np.percentile(a, 95):.2f}ms max={a.max():.2f}ms")
+    for i, e in events:
+        print(f"event @frame {i}: {e}")
+
+
+if __name__ == "__main__":
+    main()
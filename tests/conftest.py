@@ -0,0 +1,68 @@
+import sys
+import threading
+import types
+
+
+def _install_qthread_fallback():
+    """
+    没装 PyQt6 时给 vision.camera 提供一个最小的 QThread（基于 threading.Thread），
+    采集线程的测试只用到 start / run / wait / isFinished。装了 PyQt6 时用真的。
+    """
+    try:
+        import PyQt6.QtCore  # noqa: F401
+        return
+    except ImportError:
+        pass
+
+    class QThread:
+        def __init__(self, parent=None):
+            self._th = None
+
+        def run(self):
+            pass
+
+        def start(self):
+            self._th = threading.Thread(target=self.run, daemon=True)
+            self._th.start()
+
+        def isFinished(self):
+            return self._th is not None and not self._th.is_alive()
+
+        def wait(self, ms=None):
+            if self._th is not None:
+                self._th.join(None if ms is None else ms / 1000.0)
+            return self._th is None or not self._th.is_alive()
+
+    qtcore = types.ModuleType("PyQt6.QtCore")
+    qtcore.QThread = QThread
+    pkg = types.ModuleType("PyQt6")
+    pkg.QtCore = qtcore
+    sys.modules["PyQt6"] = pkg
+    sys.modules["PyQt6.QtCore"] = qtcore
+
+
+def _install_mediapipe_fallback():
+    """
+    没装 mediapipe 时让 vision.bare_mediapipe 可以导入：Hands.process 永远检测不到手。
+    需要手部关键点的测试自行替换 pipeline.tracker。
+    """
+    try:
+        import mediapipe  # noqa: F401
+        return
+    except ImportError:
+        pass
+
+    class Hands:
+        def __init__(self, **kw):
+            pass
+
+        def process(self, rgb):
+            return types.SimpleNamespace(multi_hand_landmarks=None)
+
+    mp = types.ModuleType("mediapipe")
+    mp.solutions = types.SimpleNamespace(hands=types.SimpleNamespace(Hands=Hands))
+    sys.modules["mediapipe"] = mp
+
+
+_install_qthread_fallback()
+_install_mediapipe_fallback()
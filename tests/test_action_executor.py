@@ -0,0 +1,71 @@
+import time
+
+from control.action_executor import ActionExecutor
+from control.app_context import FakeAppProvider
+from control.dispatcher import Dispatcher
+from control.input_backend import NullBackend
+from control.state import SystemState
+
+
+class _ScrollBackend(NullBackend):
+    def __init__(self):
+        super().__init__()
+        self.scrolled = []
+
+    def scroll(self, amount):
+        super().scroll(amount)
+        self.scrolled.append(int(amount))
+
+
+def _wait_idle(ex, timeout=1.0):
+    end = time.monotonic() + timeout
+    while ex.depth() and time.monotonic() < end:
+        time.sleep(0.005)
+    time.sleep(0.05)
+
+
+def _dispatcher(binding, executor, backend, state):
+    cfg = {"bindings": {"global": {"__SCROLL_V__": binding}}, "action_catalog": []}
+    return Dispatcher(cfg, state, backend, FakeAppProvider(), executor=executor)
+
+
+def test_static_scroll_binding_keeps_amount_on_executor():
+    be = _ScrollBackend()
+    state = SystemState()
+    ex = ActionExecutor(be, state)
+    ex.start()
+    try:
+        d = _dispatcher({"type": "scroll_v", "amount": 10}, ex, be, state)
+        d.dispatch("__SCROLL_V__", 0)
+        _wait_idle(ex)
+    finally:
+        ex.stop()
+    assert be.scrolled == [10]
+
+
+def test_static_and_payload_scrolls_coalesce_on_effective_amount():
+    be = _ScrollBackend()
+    state = SystemState()
+    # 未启动的执行线程：事件全部留在队列里，便于检查合并结果
+    ex = ActionExecutor(be, state)
+    ex._running = True
+    d = _dispatcher({"type": "scroll_v", "amount": 10}, ex, be, state)
+    d.dispatch("__SCROLL_V__", 0)
+    d.dispatch("__SCROLL_V__", 0, {"amount": 3})
+    assert [it.amount for it in ex._q] == [13]
+
+
+def test_inline_and_executor_scroll_the_same():
+    for use_executor in (False, True):
+        be = _ScrollBackend()
+        state = SystemState()
+        ex = ActionExecutor(be, state) if use_executor else None
+        if ex is not None:
+            ex.start()
+        d = _dispatcher({"type": "scroll_v", "amount": 7}, ex, be, state)
+        d.dispatch("__SCROLL_V__", 0)
+        d.dispatch("__SCROLL_V__", 0, {"amount": -2})
+        if ex is not None:
+            _wait_idle(ex)
+            ex.stop()
+        assert sum(be.scrolled) == 5
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from vision.custom_gestures import CustomGestureManager, CustomGestureSpotter
+
+
+def _entry(gid, pts):
+    return {"id": gid, "mode": "bare", "type": "dynamic_template", "template": pts.tolist()}
+
+
+def _line(n=64):
+    t = np.linspace(0.0, 1.0, n, dtype=np.float32)
+    return np.stack([t - 0.5, np.zeros_like(t)], axis=1)
+
+
+def test_same_length_list_replacement_rebuilds_bank():
+    cfg = {"custom_gestures": [_entry("A", _line())]}
+    mgr = CustomGestureManager(cfg)
+    assert mgr._compiled("bare").ids == ["A"]
+
+    # 长度相同的新列表（例如重新加载配置）：不能沿用旧模板
+    cfg["custom_gestures"] = [_entry("B", _line())]
+    assert mgr._compiled("bare").ids == ["B"]
+
+
+def test_in_place_edit_rebuilds_after_invalidate():
+    lst = [_entry("A", _line())]
+    mgr = CustomGestureManager({"custom_gestures": lst})
+    assert mgr._compiled("bare").ids == ["A"]
+
+    lst[0] = _entry("C", _line())
+    mgr.invalidate()
+    assert mgr._compiled("bare").ids == ["C"]
+
+    del lst[0]
+    mgr.invalidate()
+    assert mgr._compiled("bare").ids == []
+
+
+def test_add_template_overrides_same_id():
+    mgr = CustomGestureManager({"custom_gestures": []})
+    pts = np.cumsum(np.ones((30, 2), dtype=np.float32), axis=0)
+    assert mgr.add_template("A", "bare", pts)
+    assert mgr.add_template("A", "bare", pts[::-1].copy())
+    bank = mgr._compiled("bare")
+    assert bank.ids == ["A"] and bank.templ.shape[0] == 1
+
+
+def _zigzag(n=31):
+    """Z 字：(0,0)->(120,0)->(0,120)->(120,120)，按弧长均匀取 n 点。"""
+    knots = np.array([[0, 0], [120, 0], [0, 120], [120, 120]], dtype=np.float64)
+    seg = np.linalg.norm(np.diff(knots, axis=0), axis=1)
+    s = np.concatenate([[0.0], np.cumsum(seg)])
+    u = np.linspace(0.0, s[-1], n)
+    return np.stack([np.interp(u, s, knots[:, 0]), np.interp(u, s, knots[:, 1])], axis=1) + 200.0
+
+
+def _spotter(templates=True, mode="bare"):
+    mgr = CustomGestureManager({"general": {"custom_match_threshold": 0.25}, "custom_gestures": []})
+    if templates:
+        assert mgr.add_template("ZIG", mode, _zigzag())
+    return CustomGestureSpotter(mgr, mode="bare")
+
+
+def test_spotter_emits_one_match_with_stroke_stamps():
+    sp = _spotter()
+    pts = _zigzag()
+    t0 = 1000.0
+    fired = []
+    for i, (x, y) in enumerate(pts):
+        m = sp.push(x, y, t0 + 20.0 * i)
+        if m is not None:
+            fired.append(m)
+    t_end = t0 + 20.0 * (len(pts) - 1)
+    # 停住不动：距离不再下降，待定匹配在下一帧发出
+    t = t_end
+    for _ in range(5):
+        t += 20.0
+        m = sp.push(*pts[-1], t)
+        if m is not None:
+            fired.append(m)
+
+    assert len(fired) == 1
+    m = fired[0]
+    assert m.gid == "ZIG" and m.dist <= 0.25
+    assert m.t_start_ms == pytest.approx(t0)
+    assert m.t_end_ms == pytest.approx(t_end)
+
+
+def _draw_twice(sp):
+    """连着画两遍 Z（中间只停两帧），返回发出匹配的时刻。"""
+    pts = _zigzag()
+    t = 0.0
+    fire_t = []
+    for _ in range(2):
+        for x, y in list(pts) + [pts[-1]] * 2:
+            t += 20.0
+            if sp.push(x, y, t) is not None:
+                fire_t.append(t)
+    return fire_t, t
+
+
+def test_refractory_suppresses_immediate_refire():
+    # 对照：没有不应期时两遍都会发出
+    sp = _spotter()
+    sp.REFRACTORY_MS = 0
+    assert len(_draw_twice(sp)[0]) == 2
+
+    sp = _spotter()
+    fire_t, t_last = _draw_twice(sp)
+    assert len(fire_t) == 1
+    # 第二遍完全落在不应期内
+    assert t_last - fire_t[0] < CustomGestureSpotter.REFRACTORY_MS
+
+
+def test_spotter_skips_candidates_without_templates(monkeypatch):
+    for sp in (_spotter(templates=False), _spotter(mode="glove")):
+        def boom(*a, **k):
+            raise AssertionError("no templates for this mode: nothing to score")
+        monkeypatch.setattr(sp, "_candidates", boom)
+        monkeypatch.setattr(sp, "_normalize", boom)
+        for i, (x, y) in enumerate(_zigzag()):
+            assert sp.push(x, y, 20.0 * i) is None
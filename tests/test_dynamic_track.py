@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from vision.dynamic_track import TrackWindow
+
+
+class _LegacyTrackWindow:
+    """环形缓冲之前的列表实现（原样保留，作为对照）；capacity 模拟新实现满了丢最旧点。"""
+    def __init__(self, window_ms=450, capacity=None):
+        self.window_ms = int(window_ms)
+        self.capacity = capacity
+        self.pts = []
+
+    def add(self, x, y, t_ms):
+        if self.capacity is not None and len(self.pts) == self.capacity:
+            self.pts.pop(0)
+        now = float(t_ms)
+        self.pts.append((now, float(x), float(y)))
+        cutoff = now - self.window_ms
+        while self.pts and self.pts[0][0] < cutoff:
+            self.pts.pop(0)
+
+    def first(self):
+        return self.pts[0] if self.pts else None
+
+    def last(self):
+        return self.pts[-1] if self.pts else None
+
+    def delta(self):
+        if len(self.pts) < 6:
+            return 0.0, 0.0
+        _, x0, y0 = self.pts[0]
+        _, x1, y1 = self.pts[-1]
+        return x1 - x0, y1 - y0
+
+    def length(self):
+        if len(self.pts) < 2:
+            return 0.0
+        arr = np.array([(x, y) for _, x, y in self.pts], dtype=np.float32)
+        return float(np.linalg.norm(np.diff(arr, axis=0), axis=1).sum())
+
+    def direction_consistency(self, axis="x"):
+        if len(self.pts) < 3:
+            return 0.0
+        arr = np.array([(x, y) for _, x, y in self.pts], dtype=np.float32)
+        diffs = np.diff(arr[:, 0] if axis == "x" else arr[:, 1])
+        positive = np.sum(diffs > 0)
+        negative = np.sum(diffs < 0)
+        total = positive + negative
+        if total == 0:
+            return 0.0
+        return float(max(positive, negative) / total)
+
+
+def _assert_same(w, ref):
+    assert len(w) == len(ref.pts)
+    for got, exp in ((w.first(), ref.first()), (w.last(), ref.last())):
+        if exp is None:
+            assert got is None
+        else:
+            assert tuple(got) == pytest.approx(exp)
+    assert w.delta() == pytest.approx(ref.delta())
+    assert w.length() == pytest.approx(ref.length(), rel=1e-4, abs=1e-3)
+    for axis in ("x", "y"):
+        assert w.direction_consistency(axis) == pytest.approx(ref.direction_consistency(axis))
+    if ref.pts:
+        np.testing.assert_allclose(w.points(), np.array([p[1:] for p in ref.pts]), atol=1e-3)
+        np.testing.assert_allclose(w.times(), [p[0] for p in ref.pts])
+
+
+def _feed(w, ref, steps, rng, t=0.0, dt_range=(5, 40)):
+    x = y = 0.0
+    for _ in range(steps):
+        t += float(rng.integers(*dt_range))
+        # 整数步长：含 0（不动）与正负来回，方向统计与旧实现的 float32 差分一致
+        x += float(rng.integers(-6, 9))
+        y += float(rng.integers(-4, 4))
+        w.add(x, y, t)
+        ref.add(x, y, t)
+        _assert_same(w, ref)
+    return t
+
+
+def test_matches_list_implementation_with_time_eviction():
+    rng = np.random.default_rng(0)
+    w = TrackWindow(window_ms=300)
+    ref = _LegacyTrackWindow(window_ms=300)
+    t = _feed(w, ref, 400, rng)
+    # 长时间停顿后：窗口只剩新点
+    w.add(1.0, 2.0, t + 5000)
+    ref.add(1.0, 2.0, t + 5000)
+    _assert_same(w, ref)
+    _feed(w, ref, 50, rng, t=t + 5000)
+
+
+def test_wraparound_past_capacity():
+    rng = np.random.default_rng(1)
+    w = TrackWindow(window_ms=10 ** 9, capacity=512)
+    ref = _LegacyTrackWindow(window_ms=10 ** 9, capacity=512)
+    _feed(w, ref, 512 * 3 + 17, rng, dt_range=(1, 3))
+    assert len(w) == 512
+
+
+def test_wraparound_with_time_eviction_and_small_capacity():
+    rng = np.random.default_rng(2)
+    w = TrackWindow(window_ms=200, capacity=8)
+    ref = _LegacyTrackWindow(window_ms=200, capacity=8)
+    _feed(w, ref, 300, rng, dt_range=(5, 60))
+
+
+def test_empty_and_single_point_window():
+    w = TrackWindow(window_ms=100)
+    assert len(w) == 0 and w.first() is None and w.last() is None
+    assert w.delta() == (0.0, 0.0) and w.length() == 0.0 and w.direction_consistency("x") == 0.0
+    assert w.points().shape == (0, 2)
+
+    w.add(3.0, 4.0, 10.0)
+    assert tuple(w.first()) == tuple(w.last()) == (10.0, 3.0, 4.0)
+    assert w.length() == 0.0 and w.direction_consistency("y") == 0.0
+
+    # 首点被时间裁掉后只剩一个点：不残留旧路径与方向统计
+    w.add(13.0, 4.0, 100.0)
+    w.add(20.0, 4.0, 205.0)
+    assert len(w) == 1
+    assert w.length() == 0.0 and w.direction_consistency("x") == 0.0
+
+    w.reset()
+    assert len(w) == 0 and w.last() is None
+    w.add(0.0, 0.0, 300.0)
+    w.add(5.0, 0.0, 310.0)
+    assert w.length() == pytest.approx(5.0)
@@ -0,0 +1,109 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from config_io import DEFAULT_CONFIG_PATH, load_config
+from control.state import SystemState
+from vision.camera import CameraThread
+from vision.frame_buffers import FrameMailbox, FramePool
+from vision.frame_source import FrameSource
+from vision.pipeline import InferencePipeline
+
+W, H = 320, 240
+FRAMES = 400
+WARMUP = 60
+HOLDERS = 3
+
+
+class _SyntheticSource(FrameSource):
+    """固定数量的合成帧：黄色方块在噪声背景上移动，传入 image 时写入该缓冲。"""
+    name = "synthetic"
+
+    def __init__(self, frames, fps):
+        super().__init__(realtime=True)
+        self.frames = frames
+        self.fps = fps
+        rng = np.random.default_rng(0)
+        self._bg = rng.integers(0, 80, size=(H, W, 3), dtype=np.uint8)
+        self._img = self._bg.copy()
+        self._idx = 0
+
+    def open(self):
+        return True
+
+    def read(self, image=None):
+        if self._idx >= self.frames:
+            self.finished = True
+            return False, None, 0
+        np.copyto(self._img, self._bg)
+        x = (self._idx * 5) % (W - 60)
+        self._img[H // 3:H // 3 + 60, x:x + 60] = (0, 220, 220)
+        t_rel = self._idx / self.fps
+        self._pace(t_rel)
+        self._idx += 1
+        return True, self._into(image, self._img), int(t_rel * 1e9)
+
+
+class _FakeTracker:
+    """代替 mediapipe：返回随帧平移的一组固定关键点（张开的手）。"""
+    def __init__(self):
+        base = [(0.0, 0.0)]
+        for k, ang in enumerate((-0.9, -0.35, 0.0, 0.3, 0.6)):
+            d = np.array([np.sin(ang), -np.cos(ang)])
+            base += [tuple(d * r) for r in ((25, 45, 60, 75) if k else (20, 35, 45, 55))]
+        self._base = np.array(base, dtype=np.float32)
+        self._n = 0
+
+    def process(self, frame_bgr):
+        self._n += 1
+        h, w = frame_bgr.shape[:2]
+        return self._base + np.array([w * 0.3 + (self._n % 40), h * 0.6], dtype=np.float32)
+
+
+@pytest.mark.parametrize("mode", ["bare", "glove"])
+def test_capture_to_inference_allocations_stay_flat(mode):
+    pipe = InferencePipeline(load_config(DEFAULT_CONFIG_PATH), SystemState(execution_enabled=False))
+    pipe.tracker = _FakeTracker()
+    pool = FramePool()
+    # 预先备好同时持有整帧的至多三份（采集线程正在写的、信箱里的、推理正在用的），
+    # 稳态下池子不应再分配任何整帧
+    for buf in [pool.acquire((H, W, 3)) for _ in range(HOLDERS)]:
+        pool.release(buf)
+    box = FrameMailbox(pool=pool)
+    cam = CameraThread(box, _SyntheticSource(FRAMES, fps=400.0), mirror=True)
+
+    cam.start()
+    seq = n = 0
+    base = None
+    try:
+        while True:
+            got = box.wait_latest(seq, 0.5, reader="infer")
+            if got is None:
+                if cam.isFinished():
+                    break
+                continue
+            seq, frame, t_ns = got
+            try:
+                pipe.process(frame, mode, seq=seq, t_ns=t_ns)
+            finally:
+                box.release(frame)
+            n += 1
+            if n == WARMUP:
+                tracemalloc.start()
+                base = tracemalloc.get_traced_memory()[0]
+                alloc0 = pool.allocated
+                infer_buf = pipe._infer_buf
+    finally:
+        cam.stop()
+        cam.wait(2000)
+    assert base is not None, f"only {n} frames processed"
+    growth = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    assert n > WARMUP + 50
+    assert pool.allocated == alloc0 == HOLDERS, "pool kept allocating frame buffers after warm-up"
+    assert pipe._infer_buf is infer_buf, "inference resize buffer was replaced"
+    assert growth < W * H * 3, f"steady-state growth {growth} B is at least one frame"
+    box.clear()
+    assert pool.stats()["pool_in_use"] == 0
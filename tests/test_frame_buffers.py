@@ -0,0 +1,92 @@
+import threading
+
+import numpy as np
+
+from vision.frame_buffers import FrameMailbox, FramePool
+
+SHAPE = (4, 6, 3)
+
+
+def _put(box, pool, value, t_ns):
+    f = pool.acquire(SHAPE)
+    f[...] = value
+    box.put(f, t_ns)
+
+
+def test_drops_are_counted_per_reader_and_refs_return_to_zero():
+    pool = FramePool()
+    box = FrameMailbox(pool=pool)
+    infer_seq = preview_seq = 0
+
+    # 两个消费者先登记（第一次取时还没有帧）
+    assert box.get_latest(0, reader="infer") is None
+    assert box.get_latest(0, reader="preview") is None
+
+    held = []
+    for i in range(1, 11):
+        _put(box, pool, i, 1000 + i)
+        # 推理每 3 帧取一次，预览每 2 帧取一次：其余帧被覆盖
+        if i % 3 == 0:
+            seq, f, t_ns = box.get_latest(infer_seq, reader="infer")
+            assert seq == i and t_ns == 1000 + i and f[0, 0, 0] == i
+            infer_seq = seq
+            held.append(f)
+        if i % 2 == 0:
+            seq, f, _ = box.get_latest(preview_seq, reader="preview")
+            assert seq == i and f[0, 0, 0] == i
+            preview_seq = seq
+            held.append(f)
+    # 同一帧不会被同一消费者读两次
+    assert box.get_latest(preview_seq, reader="preview") is None
+
+    # 覆盖发生在第 2..10 次 put：被覆盖的是第 1..9 帧
+    infer_missed = sum(1 for i in range(1, 10) if i % 3)
+    preview_missed = sum(1 for i in range(1, 10) if i % 2)
+    assert box.missed["infer"] == infer_missed == 6
+    assert box.missed["preview"] == preview_missed == 5
+    # 推理丢帧不因为预览读过而少算
+    assert box.overwritten == infer_missed
+    st = box.stats()
+    assert st["cam_published"] == 10 and st["cam_overwritten"] == 6
+    assert st["infer_missed"] == 6 and st["preview_missed"] == 5
+
+    for f in held:
+        box.release(f)
+    box.clear()
+    assert pool.stats()["pool_in_use"] == 0
+    assert pool._refs == {}
+    # 缓冲都回到了空闲列表，再申请不分配新内存
+    before = pool.allocated
+    pool.release(pool.acquire(SHAPE))
+    assert pool.allocated == before
+
+
+def test_frame_shared_by_two_readers_is_returned_once_both_release():
+    pool = FramePool()
+    box = FrameMailbox(pool=pool)
+    _put(box, pool, 7, 1)
+    _, a, _ = box.get_latest(0, reader="infer")
+    _, b, _ = box.get_latest(0, reader="preview")
+    assert a is b
+    _put(box, pool, 8, 2)          # 信箱放掉自己那份引用
+    box.release(a)
+    assert pool.stats()["pool_in_use"] == 2
+    box.release(b)
+    assert pool.stats()["pool_in_use"] == 1
+    box.clear()
+    assert pool.stats()["pool_in_use"] == 0
+
+
+def test_wait_latest_wakes_on_put_and_times_out():
+    box = FrameMailbox()
+    assert box.wait_latest(0, 0.01, reader="infer") is None
+
+    got = []
+    th = threading.Thread(target=lambda: got.append(box.wait_latest(0, 2.0, reader="infer")))
+    th.start()
+    frame = np.zeros(SHAPE, dtype=np.uint8)
+    box.put(frame, 42)
+    th.join(2.0)
+    assert got and got[0][0] == 1 and got[0][1] is frame and got[0][2] == 42
+    # 已取过的 seq：超时返回 None
+    assert box.wait_latest(1, 0.01, reader="infer") is None
@@ -0,0 +1,62 @@
+import numpy as np
+
+from vision.camera import CameraThread
+from vision.frame_buffers import FrameMailbox, FramePool
+from vision.frame_source import RecordingSource
+
+
+class _RecordingMailbox(FrameMailbox):
+    """记下每一帧的拷贝；收满 limit 帧后停掉采集线程。"""
+    def __init__(self, limit, pool=None):
+        super().__init__(pool=pool)
+        self.limit = limit
+        self.got = []
+        self.cam = None
+
+    def put(self, frame, t_ns=None):
+        self.got.append(frame.copy())
+        super().put(frame, t_ns)
+        if len(self.got) >= self.limit:
+            self.cam.stop()
+
+
+def _npz(tmp_path, n=3, h=4, w=5):
+    frames = np.stack([np.full((h, w, 3), i, dtype=np.uint8) for i in range(n)])
+    # 每帧左右不对称，镜像后仍能区分
+    frames[:, :, 0, 0] = 200 + np.arange(n, dtype=np.uint8)[:, None]
+    path = tmp_path / "rec.npz"
+    np.savez(path, frames=frames)
+    return str(path), frames
+
+
+def _replay(path, limit, mirror, pool):
+    box = _RecordingMailbox(limit, pool=pool)
+    cam = CameraThread(box, RecordingSource(path, realtime=False, loop=True), mirror=mirror)
+    box.cam = cam
+    cam.run()
+    return box.got
+
+
+def test_looped_npz_replay_through_camera_thread_is_unchanged(tmp_path):
+    path, frames = _npz(tmp_path)
+    for mirror in (True, False):
+        for pool in (FramePool(), None):
+            got = _replay(path, 2 * len(frames), mirror, pool)
+            expect = [frames[i % len(frames)] for i in range(len(got))]
+            if mirror:
+                expect = [f[:, ::-1] for f in expect]
+            assert len(got) == 2 * len(frames)
+            for i, (g, e) in enumerate(zip(got, expect)):
+                assert np.array_equal(g, e), f"mirror={mirror} pool={pool is not None} frame {i}"
+
+
+def test_recording_read_never_returns_stored_array(tmp_path):
+    path, frames = _npz(tmp_path)
+    src = RecordingSource(path, realtime=False, loop=True)
+    assert src.open()
+    ok, f0, _ = src.read()
+    assert ok and f0 is not src._frames[0] and not np.shares_memory(f0, src._frames)
+    # 把拿到的数组当 image= 缓冲传回：写入的是它自己，而不是录制内容
+    for _ in range(len(frames) * 2):
+        ok, f0, _ = src.read(image=f0)
+    assert np.array_equal(src._frames, frames)
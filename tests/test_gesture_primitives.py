@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+from vision.gesture_primitives import (
+    FINGERS, MCP, PIP, TIP, FingerRules, HandFeatures, _default_rules, classify_static, cos_sim, dist,
+    finger_states, is_extended_y, is_finger_extended_dir, palm_center, palm_width,
+)
+
+
+def _legacy_finger_states(lm, rules_cfg=None):
+    """向量化之前逐指调用标量原语的实现（原样保留，作为对照）。"""
+    rules = _default_rules()
+    if isinstance(rules_cfg, dict):
+        rules.update({k: v for k, v in rules_cfg.items() if k in rules})
+    pw = palm_width(lm)
+    c = palm_center(lm)
+    len_ratio = {k: dist(lm[TIP[k]], lm[MCP[k]]) / pw for k in FINGERS}
+    if bool(rules.get("use_direction", True)):
+        ext = [is_finger_extended_dir(lm, MCP[k], TIP[k], c, pw, rules[k]["len_thr"], rules[k]["cos_thr"])
+               for k in FINGERS[1:]]
+    else:
+        ext = [is_extended_y(lm, TIP[k], PIP[k]) for k in FINGERS[1:]]
+    thumb_dir = cos_sim(lm[TIP["thumb"]] - lm[MCP["thumb"]], lm[TIP["thumb"]] - c)
+    thumb_ext = (len_ratio["thumb"] > float(rules["thumb"]["len_thr"])) and (thumb_dir > float(rules["thumb"]["cos_thr"]))
+    return (thumb_ext, *ext, len_ratio)
+
+
+def _legacy_classify(lm, pinch_thr_ratio=0.33, rules_cfg=None):
+    thumb_ext, ext_index, ext_middle, ext_ring, ext_pinky, len_ratio = _legacy_finger_states(lm, rules_cfg)
+    n_other = sum([ext_index, ext_middle, ext_ring, ext_pinky])
+    if n_other == 4 and thumb_ext:
+        c = palm_center(lm)
+        if lm[TIP["index"]][1] < c[1] and lm[TIP["pinky"]][1] < c[1]:
+            return "OPEN_PALM"
+    if n_other == 0 and (not thumb_ext):
+        return "FIST"
+    rules = _default_rules()
+    if isinstance(rules_cfg, dict):
+        rules.update({k: v for k, v in rules_cfg.items() if k in rules})
+    enhance = bool(rules.get("single_finger_enhance", True))
+    thr = float(rules.get("others_fold_len_thr", 0.45))
+
+    def others_fold(exclude):
+        return all(len_ratio[k] < thr for k in FINGERS if k not in exclude)
+
+    if thumb_ext and n_other == 0:
+        if (not enhance) or others_fold({"thumb"}):
+            return "THUMBS_UP"
+    if ext_index and ext_middle and (not ext_ring) and (not ext_pinky):
+        return "V_SIGN"
+    if ext_index and (not ext_middle) and (not ext_ring) and (not ext_pinky):
+        if (not enhance) or others_fold({"index"}):
+            return "INDEX_ONLY"
+    if thumb_ext and ext_pinky and (not ext_index) and (not ext_middle) and (not ext_ring):
+        if (not enhance) or others_fold({"thumb", "pinky"}):
+            return "THUMB_PINKY"
+    pinch = dist(lm[TIP["thumb"]], lm[TIP["index"]]) / palm_width(lm)
+    if pinch < pinch_thr_ratio and sum([ext_middle, ext_ring, ext_pinky]) >= 2:
+        return "OK_SIGN"
+    return None
+
+
+# 手掌朝上、指尖向上（图像坐标 y 向下）的 21 点手模型
+_WRIST = (0.0, 100.0)
+_FINGER_MCP = {"index": (-30.0, 40.0), "middle": (-10.0, 35.0), "ring": (10.0, 38.0), "pinky": (28.0, 45.0)}
+_THUMB_BASE = [(-25.0, 85.0), (-45.0, 70.0)]            # CMC, MCP
+_THUMB_OUT = [(-60.0, 55.0), (-70.0, 40.0)]             # IP, TIP：向外伸出
+_THUMB_IN = [(-35.0, 70.0), (-28.0, 68.0)]              # 收在掌侧
+
+
+def _hand(extended, thumb="out", index_tip=None):
+    pts = [_WRIST] + _THUMB_BASE + (_THUMB_OUT if thumb == "out" else _THUMB_IN if thumb == "in" else thumb)
+    for k in ("index", "middle", "ring", "pinky"):
+        mx, my = _FINGER_MCP[k]
+        if k in extended:
+            chain = [(mx, my), (mx, my - 25), (mx, my - 45), (mx, my - 60)]
+        else:
+            chain = [(mx, my), (mx, my - 15), (mx + 2, my - 5), (mx + 2, my + 10)]
+        if k == "index" and index_tip is not None:
+            chain[-1] = index_tip
+        pts += chain
+    return np.array(pts, dtype=np.float32)
+
+
+HANDS = {
+    "open_palm": (_hand({"index", "middle", "ring", "pinky"}), "OPEN_PALM"),
+    "fist": (_hand(set(), thumb="in"), "FIST"),
+    "thumbs_up": (_hand(set()), "THUMBS_UP"),
+    # 拇指与食指指尖捏合，其余三指伸出
+    "pinch_ok": (_hand({"middle", "ring", "pinky"}, thumb=[(-52.0, 50.0), (-48.0, 28.0)],
+                       index_tip=(-45.0, 25.0)), "OK_SIGN"),
+    "index_only": (_hand({"index"}, thumb="in"), "INDEX_ONLY"),
+    "v_sign": (_hand({"index", "middle"}, thumb="in"), "V_SIGN"),
+    "thumb_pinky": (_hand({"pinky"}), "THUMB_PINKY"),
+}
+
+RULES = [
+    None,
+    {"use_direction": False},
+    {"single_finger_enhance": False},
+    {"index": {"len_thr": 0.3, "cos_thr": 0.9}, "thumb": {"len_thr": 0.8, "cos_thr": 0.0}, "others_fold_len_thr": 0.2},
+]
+
+
+def _rotate(lm, deg):
+    a = np.deg2rad(deg)
+    r = np.array([[np.cos(a), -np.sin(a)], [np.sin(a), np.cos(a)]], dtype=np.float32)
+    c = lm[0]
+    return ((lm - c) @ r.T + c + np.float32(300.0)).astype(np.float32)
+
+
+@pytest.mark.parametrize("name", sorted(HANDS))
+def test_expected_labels(name):
+    lm, label = HANDS[name]
+    assert classify_static(lm) == label
+    assert _legacy_classify(lm) == label
+
+
+@pytest.mark.parametrize("rules_cfg", RULES)
+@pytest.mark.parametrize("name", sorted(HANDS))
+@pytest.mark.parametrize("deg", [0, 15, -30])
+def test_vectorized_matches_scalar_primitives(name, rules_cfg, deg):
+    lm = _rotate(HANDS[name][0], deg)
+    ref = _legacy_finger_states(lm, rules_cfg)
+    got = finger_states(lm, rules_cfg)
+    assert [bool(x) for x in got[:5]] == [bool(x) for x in ref[:5]]
+    assert got[5] == pytest.approx(ref[5], rel=1e-5)
+
+    expect = _legacy_classify(lm, rules_cfg=rules_cfg)
+    assert classify_static(lm, rules_cfg=rules_cfg) == expect
+    # engine 的用法：每帧算一次 HandFeatures 传入
+    assert classify_static(lm, feats=HandFeatures(lm, FingerRules(rules_cfg))) == expect
+
+
+def test_pairwise_tip_ratio_matches_scalar():
+    lm = HANDS["pinch_ok"][0]
+    f = HandFeatures(lm)
+    for a in FINGERS:
+        for b in FINGERS:
+            assert f.ratio(TIP[a], TIP[b]) == pytest.approx(dist(lm[TIP[a]], lm[TIP[b]]) / palm_width(lm), rel=1e-5)
@@ -0,0 +1,59 @@
+import pytest
+
+from control.input_backend import NullBackend
+from control.mouse_worker import MouseMoveWorker
+
+# (t_s, x, y)：每 0.1 s 一个目标点，x 方向 1000 px/s
+SAMPLES = [(1.0, 100.0, 50.0), (1.1, 200.0, 60.0), (1.2, 300.0, 70.0)]
+
+
+def _worker(cap_ms=120.0):
+    return MouseMoveWorker(NullBackend(), max_extrapolate_ms=cap_ms)
+
+
+def test_defaults_compensate_latency_with_capped_extrapolation():
+    w = MouseMoveWorker(NullBackend())
+    assert w.render_delay_ms == 0.0 and w.max_extrapolate_ms == 120.0
+    w.configure({})
+    assert w.render_delay_ms == 0.0 and w.max_extrapolate_ms == 120.0
+
+
+@pytest.mark.parametrize("rt, expect", [
+    (1.0, (100.0, 50.0)),
+    (1.05, (150.0, 55.0)),
+    (1.1, (200.0, 60.0)),
+    (1.175, (275.0, 67.5)),
+])
+def test_interpolates_between_samples(rt, expect):
+    x, y, extrap = _worker()._sample_at(SAMPLES, rt)
+    assert (x, y) == pytest.approx(expect)
+    assert not extrap
+
+
+def test_at_latest_sample_is_not_extrapolated():
+    x, y, extrap = _worker()._sample_at(SAMPLES, 1.2)
+    assert (x, y) == pytest.approx((300.0, 70.0))
+    assert not extrap
+
+
+def test_extrapolates_with_last_two_samples_velocity():
+    x, y, extrap = _worker()._sample_at(SAMPLES, 1.25)
+    assert (x, y) == pytest.approx((350.0, 75.0))
+    assert extrap
+
+
+def test_extrapolation_is_clamped_to_cap():
+    w = _worker(cap_ms=50.0)
+    far = w._sample_at(SAMPLES, 2.0)
+    assert far[:2] == pytest.approx((350.0, 75.0))
+    assert far[2]
+    # 上限为 0：停在最新点
+    assert _worker(cap_ms=0.0)._sample_at(SAMPLES, 2.0)[:2] == pytest.approx((300.0, 70.0))
+
+
+def test_before_oldest_sample_holds_oldest():
+    assert _worker()._sample_at(SAMPLES, 0.5) == pytest.approx((100.0, 50.0, False))
+
+
+def test_single_sample_holds_position():
+    assert _worker()._sample_at(SAMPLES[-1:], 5.0) == (300.0, 70.0, False)
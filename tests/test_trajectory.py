@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from vision.trajectory import normalize_trajectories, normalize_trajectory, resample_polyline
+
+
+def _legacy_resample(points, n=64):
+    """向量化之前的逐目标点实现（原样保留，作为数值对照）。"""
+    if points is None or len(points) < 2:
+        return None
+    pts = np.asarray(points).astype(np.float32)
+    seg = np.linalg.norm(np.diff(pts, axis=0), axis=1)
+    s = np.concatenate([[0.0], np.cumsum(seg)])
+    total = float(s[-1])
+    if total < 1e-6:
+        return np.repeat(pts[:1], n, axis=0)
+    target = np.linspace(0.0, total, n, dtype=np.float32)
+    out = []
+    j = 0
+    for t in target:
+        while j < len(s) - 2 and s[j + 1] < t:
+            j += 1
+        s0, s1 = s[j], s[j + 1]
+        p0, p1 = pts[j], pts[j + 1]
+        if s1 - s0 < 1e-6:
+            out.append(p0)
+        else:
+            a = (t - s0) / (s1 - s0)
+            out.append(p0 * (1 - a) + p1 * a)
+    return np.stack(out, axis=0)
+
+
+def _legacy_normalize(points, n=64):
+    rs = _legacy_resample(points, n=n)
+    if rs is None:
+        return None
+    rs = rs - rs.mean(axis=0, keepdims=True)
+    scale = np.sqrt((rs ** 2).sum(axis=1).mean())
+    if scale < 1e-6:
+        scale = 1.0
+    return (rs / scale).astype(np.float32)
+
+
+def _cases():
+    rng = np.random.default_rng(0)
+    walks = [np.cumsum(rng.normal(0, 5, size=(int(rng.integers(2, 110)), 2)), axis=0) for _ in range(50)]
+    still = np.full((7, 2), 3.5)
+    dups = np.array([[0, 0], [0, 0], [10, 0], [10, 0], [10, 0], [10, 10], [10, 10], [0, 10]], dtype=np.float64)
+    # 重复点夹在正常段之间，且目标点恰好落在段端点上
+    square = np.array([[0, 0], [4, 0], [4, 0], [4, 4], [0, 4], [0, 0]], dtype=np.float64)
+    two = np.array([[1, 2], [5, 7]], dtype=np.float64)
+    return walks + [still, dups, square, two]
+
+
+CASES = _cases()
+
+
+@pytest.mark.parametrize("n", [1, 2, 7, 64])
+def test_resample_matches_legacy(n):
+    for p in CASES:
+        ref = _legacy_resample(p, n=n)
+        got = resample_polyline(p, n=n)
+        assert got.shape == ref.shape == (n, 2)
+        np.testing.assert_allclose(got, ref, atol=1e-4)
+
+
+@pytest.mark.parametrize("n", [1, 2, 7, 64])
+def test_normalize_single_and_batch_match_legacy(n):
+    ref = [_legacy_normalize(p, n=n) for p in CASES]
+    for p, r in zip(CASES, ref):
+        np.testing.assert_allclose(normalize_trajectory(p, n=n), r, atol=1e-4)
+    batch, valid = normalize_trajectories(CASES, n=n)
+    assert valid.all()
+    np.testing.assert_allclose(batch, np.stack(ref), atol=1e-4)
+
+
+def test_zero_length_polyline_repeats_first_point():
+    p = np.full((5, 2), 2.0)
+    np.testing.assert_array_equal(resample_polyline(p, n=4), np.full((4, 2), 2.0, dtype=np.float32))
+    np.testing.assert_array_equal(normalize_trajectory(p, n=4), np.zeros((4, 2), dtype=np.float32))
+
+
+def test_too_short_inputs():
+    assert resample_polyline(None) is None
+    assert resample_polyline(np.zeros((1, 2))) is None
+    assert normalize_trajectory(np.zeros((1, 2))) is None
+    batch, valid = normalize_trajectories([None, np.zeros((1, 2)), CASES[0]], n=8)
+    assert valid.tolist() == [False, False, True]
+    assert not batch[:2].any()
+    np.testing.assert_allclose(batch[2], _legacy_normalize(CASES[0], n=8), atol=1e-4)
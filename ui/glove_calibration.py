@@ -4,6 +4,8 @@ from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButt
 from PyQt6.QtGui import QImage, QPixmap
 from PyQt6.QtCore import Qt
 
+from vision.glove_tracker_c import learn_color_bins, learn_hs_hist
+
 def _to_pix(frame_bgr, target_w=760):
     rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
     h, w = rgb.shape[:2]
@@ -15,9 +17,11 @@ def _to_pix(frame_bgr, target_w=760):
     return QPixmap.fromImage(qimg)
 
 class GloveCalibrationDialog(QDialog):
-    def __init__(self, cfg: dict, parent=None):
+    def __init__(self, cfg: dict, parent=None, on_calibrated=None):
         super().__init__(parent)
         self.cfg = cfg
+        # 阈值写入 cfg 后的回调（让推理线程重建手套颜色查找表）
+        self.on_calibrated = on_calibrated
         self.setWindowTitle("手套HSV校准")
         self.resize(860, 640)
 
@@ -74,9 +78,21 @@ class GloveCalibrationDialog(QDialog):
         lower = np.clip(lower - np.array([5,30,30]), 0, 255).astype(int)
         upper = np.clip(upper + np.array([5,30,30]), 0, 255).astype(int)
 
+        # 非盒状颜色区域：新 HSV 盒内的样本像素实际占据的量化 BGR 色块
+        bgr = roi[mask]
+        in_box = cv2.inRange(pix.reshape(-1, 1, 3), lower.astype(np.uint8), upper.astype(np.uint8)).ravel() > 0
+        bins = learn_color_bins(bgr[in_box])
+        # 色调-饱和度直方图：供 glove.segmenter=hist_backproj 的 ROI 精修分割
+        hs_hist = np.round(learn_hs_hist(bgr[in_box])).astype(int).ravel().tolist()
+
         self.cfg.setdefault("glove", {})
         self.cfg["glove"]["hsv_lower"] = lower.tolist()
         self.cfg["glove"]["hsv_upper"] = upper.tolist()
+        self.cfg["glove"]["color_bins"] = bins
+        self.cfg["glove"]["hs_hist"] = hs_hist
+        if self.on_calibrated is not None:
+            self.on_calibrated()
 
         QMessageBox.information(self, "校准完成",
-                                f"已更新 HSV\nlower={self.cfg['glove']['hsv_lower']}\nupper={self.cfg['glove']['hsv_upper']}")
\ No newline at end of file
+                                f"已更新 HSV\nlower={self.cfg['glove']['hsv_lower']}\nupper={self.cfg['glove']['hsv_upper']}\n"
+                                f"颜色色块={len(bins)}")
\ No newline at end of file
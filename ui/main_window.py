@@ -1,3 +1,4 @@
+import copy
 import os
 import time
 import cv2
@@ -18,6 +19,8 @@ from control.state import SystemState
 from control.dispatcher import Dispatcher
 from control.mouse_controller import MouseController, MouseParams
 from control.mouse_worker import MouseMoveWorker
+from control.action_executor import ActionExecutor
+from control.input_backend import make_input_backend
 
 from ui.osd import OSD
 from ui.binding_manager import BindingManager
@@ -28,11 +31,15 @@ from ui.custom_gesture_recorder import CustomGestureRecorder
 from ui.debug_overlay import DebugOverlay
 
 from vision.camera import CameraThread
-from vision.bare_mediapipe import BareHandTracker
-from vision.gesture_engine import GestureEngine
-from vision.glove_tracker_c import GloveTrackerC
-from vision.dynamic_track import TrackWindow
-from vision.custom_gestures import CustomGestureManager
+from vision.frame_buffers import FrameMailbox, FramePool
+from vision.frame_source import make_frame_source
+from vision.infer_worker import InferenceWorker
+
+# _sync_ui_to_cfg 写入、但推理流水线（engine / tracker / 滤波）不读的 general 键：只改这些不刷新流水线
+_UI_ONLY_KEYS = frozenset((
+    "show_camera_preview", "mirror_camera", "osd_enabled", "recognition_enabled", "execution_enabled",
+    "mouse_move_output_enabled", "mouse_smoothing", "mouse_sensitivity", "mouse_deadzone_px", "mouse_filter",
+))
 
 
 class MainWindow(QWidget):
@@ -97,6 +104,9 @@ class MainWindow(QWidget):
         self.spin_sens.setSingleStep(0.1)
         self.spin_dead = QSpinBox()
         self.spin_dead.setRange(0, 20)
+        self.mouse_filter_box = QComboBox()
+        self.mouse_filter_box.addItems(["ema", "one_euro"])
+        self.mouse_filter_box.setToolTip("ema：固定系数平滑；one_euro：静止时强平滑、快速移动时低滞后（参数见 general.one_euro_*）")
 
         # -------- UI: recognition parameters (新增补齐) --------
         self.spin_dynamic_window = QSpinBox()
@@ -151,6 +161,9 @@ class MainWindow(QWidget):
         self.spin_custom_match.setSingleStep(0.01)
         self.spin_custom_match.setDecimals(2)
 
+        self.custom_matcher_box = QComboBox()
+        self.custom_matcher_box.addItems(["euclidean", "protractor", "dtw"])
+
         # -------- UI: finger_rules full controls --------
         fr = self.cfg["general"].setdefault("finger_rules", {})
         self.chk_use_dir = QCheckBox("启用方向判定")
@@ -217,6 +230,8 @@ class MainWindow(QWidget):
         mouse_row.addWidget(self.spin_sens)
         mouse_row.addWidget(QLabel("死区(px)"))
         mouse_row.addWidget(self.spin_dead)
+        mouse_row.addWidget(QLabel("滤波"))
+        mouse_row.addWidget(self.mouse_filter_box)
         mouse_row.addStretch(1)
 
         # group: recognition params
@@ -233,6 +248,7 @@ class MainWindow(QWidget):
         form_r.addRow("scroll_deadzone_px", self.spin_scroll_dead)
         form_r.addRow("scroll_max_step", self.spin_scroll_max)
         form_r.addRow("custom_match_threshold", self.spin_custom_match)
+        form_r.addRow("custom_matcher", self.custom_matcher_box)
         grp_recog.setLayout(form_r)
 
         # group: finger rules
@@ -267,60 +283,61 @@ class MainWindow(QWidget):
 
         # -------- Components --------
         self.osd = OSD()
-        self.dispatcher = Dispatcher(self.cfg, self.state)
-
-        self.mouse = MouseController(MouseParams(
-            smoothing=float(self.spin_smooth.value()),
-            sensitivity=float(self.spin_sens.value()),
-            deadzone_px=int(self.spin_dead.value())
-        ))
-        self.mouse_worker = MouseMoveWorker(hz=60)
+        # 输入注入后端：鼠标线程、光标映射、动作执行共用同一组常驻控制器
+        self.input_backend = make_input_backend(self.cfg["general"])
+        # 动作执行线程：按键/点击/启动程序不在 GUI 线程里执行
+        self.action_executor = ActionExecutor(self.input_backend, self.state)
+        self.action_executor.configure(self.cfg["general"])
+        self.action_executor.start()
+        self.dispatcher = Dispatcher(self.cfg, self.state, self.input_backend, executor=self._executor_or_none())
+
+        self.mouse = MouseController(self._mouse_params(), self.input_backend)
+        self.mouse_worker = MouseMoveWorker(self.input_backend)
+        self.mouse_worker.configure(self.cfg["general"])
         self.mouse_worker.start()
 
-        self.tracker = BareHandTracker(min_det=0.6, min_track=0.6)
-        glove_cfg = self.cfg.get("glove", {})
-        self.glove = GloveTrackerC(
-            hsv_lower=tuple(glove_cfg.get("hsv_lower", [20, 80, 80])),
-            hsv_upper=tuple(glove_cfg.get("hsv_upper", [40, 255, 255])),
-            erode=int(glove_cfg.get("erode", 1)),
-            dilate=int(glove_cfg.get("dilate", 2)),
-            min_area=int(glove_cfg.get("min_area", 1500))
-        )
-        self.engine = GestureEngine(self.cfg)
-
-        self.custom_mgr = CustomGestureManager(self.cfg)
-        # self._custom_track = TrackWindow(window_ms=600)
-        self._custom_track = TrackWindow(window_ms=900)  # 从600调到900更稳
-        self._hand_present_count = 0
-        self._custom_last_fire_ms = 0
-        self._custom_match_interval_ms = 180
-        self._custom_last_match_ms = 0
+        # 推理线程：持有 tracker / engine / 自定义模板匹配，GUI 线程只负责渲染与动作分发
+        # 采集线程只写最新帧，推理线程与 GUI 各自按序号拉取
+        self.frame_mailbox = FrameMailbox(pool=FramePool())
+        self.infer_worker = InferenceWorker(self.cfg, self.state, self.frame_mailbox, mode=self.mode_box.currentText())
+        self.infer_worker.result_signal.connect(self._on_infer_result)
+        self.infer_worker.start()
+        self.custom_mgr = self.infer_worker.pipeline.custom_mgr
         self._recorder = None
 
         self._glove_dialog = None
 
+        self._last_lm = None
+        self._last_glove_feats = None
+        self._last_raw_static = None
+        self._last_scroll = None
+        self._last_timings = {}
+        self._last_deliver_ms = 0.0
+        self._last_render_ms = 0.0
+
         self.cam = None
         self._latest_frame = None
+        self._preview_seq = 0
+        # 预览绘制/颜色转换复用的缓冲
+        self._vis_buf = None
+        self._rgb_buf = None
         self._start_camera()
 
         self.ui_fps = int(g.get("ui_fps", 24))
-        self.infer_fps = int(g.get("infer_fps", 12))
-        self._last_infer_ms = 0
 
         self.timer = QTimer(self)
         self.timer.setInterval(int(1000 / max(10, self.ui_fps)))
         self.timer.timeout.connect(self._tick)
         self.timer.start()
 
-        self._last_lm = None
-        self._last_glove_feats = None
-        self._last_raw_static = None
-        self._last_scroll = None
-
         # -------- sync config to UI now --------
         self._sync_cfg_to_ui()
+        self.mouse.update(self._mouse_params())
+        # 窗口显示后再提示启动配置里的无效绑定
+        QTimer.singleShot(0, self._warn_binding_errors)
 
         # -------- Signals --------
+        self.mode_box.currentTextChanged.connect(self.infer_worker.set_mode)
         self.preview_toggle.toggled.connect(self._on_preview_toggle)
         self.camera_device_toggle.toggled.connect(self._on_camera_device_toggle)
         self.mirror_toggle.toggled.connect(self._on_mirror_toggle)
@@ -332,6 +349,7 @@ class MainWindow(QWidget):
         self.spin_smooth.valueChanged.connect(self._on_mouse_params)
         self.spin_sens.valueChanged.connect(self._on_mouse_params)
         self.spin_dead.valueChanged.connect(self._on_mouse_params)
+        self.mouse_filter_box.currentTextChanged.connect(self._on_mouse_params)
 
         # recognition params sync
         for w in [
@@ -342,6 +360,7 @@ class MainWindow(QWidget):
             self.spin_custom_match
         ]:
             w.valueChanged.connect(self._on_general_params_changed)
+        self.custom_matcher_box.currentTextChanged.connect(self._on_general_params_changed)
 
         # finger rules sync
         self.chk_use_dir.toggled.connect(self._on_finger_rules_changed)
@@ -385,6 +404,7 @@ class MainWindow(QWidget):
         self.spin_smooth.setValue(float(g.get("mouse_smoothing", 0.35)))
         self.spin_sens.setValue(float(g.get("mouse_sensitivity", 1.0)))
         self.spin_dead.setValue(int(g.get("mouse_deadzone_px", 2)))
+        self.mouse_filter_box.setCurrentText(str(g.get("mouse_filter", "ema")))
 
         # general recog params
         self.spin_dynamic_window.setValue(int(g.get("dynamic_window_ms", 450)))
@@ -401,6 +421,7 @@ class MainWindow(QWidget):
         self.spin_scroll_max.setValue(float(g.get("scroll_max_step", 120)))
 
         self.spin_custom_match.setValue(float(g.get("custom_match_threshold", 0.22)))
+        self.custom_matcher_box.setCurrentText(str(g.get("custom_matcher", "euclidean")))
 
         # finger rules
         fr = g.setdefault("finger_rules", {})
@@ -429,8 +450,13 @@ class MainWindow(QWidget):
         self.state.execution_enabled = self.exec_toggle.isChecked()
         self.state.mouse_move_output_enabled = self.mouse_move_output_toggle.isChecked()
 
+    def _pipeline_general(self) -> dict:
+        """general 中推理流水线会读的部分（深拷贝，用于判断同步前后是否变化）。"""
+        return copy.deepcopy({k: v for k, v in self.cfg["general"].items() if k not in _UI_ONLY_KEYS})
+
     def _sync_ui_to_cfg(self):
         g = self.cfg["general"]
+        before = self._pipeline_general()
 
         g["show_camera_preview"] = bool(self.preview_toggle.isChecked())
         g["mirror_camera"] = bool(self.mirror_toggle.isChecked())
@@ -442,6 +468,7 @@ class MainWindow(QWidget):
         g["mouse_smoothing"] = float(self.spin_smooth.value())
         g["mouse_sensitivity"] = float(self.spin_sens.value())
         g["mouse_deadzone_px"] = int(self.spin_dead.value())
+        g["mouse_filter"] = self.mouse_filter_box.currentText()
 
         g["dynamic_window_ms"] = int(self.spin_dynamic_window.value())
         g["swipe_thresh_px"] = float(self.spin_swipe_thresh.value())
@@ -457,6 +484,7 @@ class MainWindow(QWidget):
         g["scroll_max_step"] = float(self.spin_scroll_max.value())
 
         g["custom_match_threshold"] = float(self.spin_custom_match.value())
+        g["custom_matcher"] = self.custom_matcher_box.currentText()
 
         fr = g.setdefault("finger_rules", {})
         fr["use_direction"] = bool(self.chk_use_dir.isChecked())
@@ -474,6 +502,10 @@ class MainWindow(QWidget):
         set2("pinky", self.spin_pinky_len, self.spin_pinky_cos)
         set2("thumb", self.spin_thumb_len, self.spin_thumb_cos)
 
+        # 只有流水线相关的值变了才重建 engine 配置快照（开关、光标参数等不触发）
+        if self._pipeline_general() != before:
+            self.infer_worker.refresh_config()
+
     # ---------------- camera device control ----------------
     def _start_camera(self):
         if self.cam is not None:
@@ -482,15 +514,13 @@ class MainWindow(QWidget):
         self.state.camera_device_enabled = True
         self.camera_device_toggle.setChecked(True)
 
+        # 帧来源由 general.frame_source 决定：camera / video / recording
         self.cam = CameraThread(
-            index=int(g.get("camera_index", 0)),
-            width=int(g.get("camera_width", 640)),
-            height=int(g.get("camera_height", 480)),
-            fps=int(g.get("camera_fps", 30)),
+            self.frame_mailbox,
+            make_frame_source(g),
             mirror=bool(g.get("mirror_camera", True))
         )
         self._latest_frame = None
-        self.cam.frame_signal.connect(self._on_camera_frame)
         self.cam.start()
 
     def _stop_camera(self):
@@ -502,6 +532,8 @@ class MainWindow(QWidget):
         except Exception:
             pass
         self.cam = None
+        self.frame_mailbox.clear()
+        self.frame_mailbox.release(self._latest_frame)
         self._latest_frame = None
         self.state.camera_device_enabled = False
         self.camera_device_toggle.setChecked(False)
@@ -511,14 +543,12 @@ class MainWindow(QWidget):
 
     def closeEvent(self, e):
         self._stop_camera()
+        self.infer_worker.stop()
+        self.infer_worker.wait(800)
         self.mouse_worker.stop()
+        self.action_executor.stop()
         e.accept()
 
-    def _on_camera_frame(self, frame):
-        self._latest_frame = frame
-        if self._glove_dialog is not None and self._glove_dialog.isVisible():
-            self._glove_dialog.update_frame(frame)
-
     # ---------------- UI handlers ----------------
     def _on_preview_toggle(self, v):
         self.state.camera_preview_enabled = bool(v)
@@ -561,15 +591,27 @@ class MainWindow(QWidget):
         if not v:
             self.mouse_worker.invalidate()
 
-    def _on_mouse_params(self, *_):
-        self.mouse.update(MouseParams(
+    def _executor_or_none(self):
+        return self.action_executor if bool(self.cfg["general"].get("action_executor", True)) else None
+
+    def _mouse_params(self) -> MouseParams:
+        g = self.cfg["general"]
+        return MouseParams(
             smoothing=float(self.spin_smooth.value()),
             sensitivity=float(self.spin_sens.value()),
-            deadzone_px=int(self.spin_dead.value())
-        ))
+            deadzone_px=int(self.spin_dead.value()),
+            filter=self.mouse_filter_box.currentText(),
+            min_cutoff=float(g.get("one_euro_min_cutoff", 1.0)),
+            beta=float(g.get("one_euro_beta", 0.007)),
+            d_cutoff=float(g.get("one_euro_d_cutoff", 1.0)),
+        )
+
+    def _on_mouse_params(self, *_):
+        self.mouse.update(self._mouse_params())
         self.cfg["general"]["mouse_smoothing"] = float(self.spin_smooth.value())
         self.cfg["general"]["mouse_sensitivity"] = float(self.spin_sens.value())
         self.cfg["general"]["mouse_deadzone_px"] = int(self.spin_dead.value())
+        self.cfg["general"]["mouse_filter"] = self.mouse_filter_box.currentText()
 
     def _on_general_params_changed(self, *_):
         # 实时写入 cfg，下一帧 engine 即可使用
@@ -585,10 +627,21 @@ class MainWindow(QWidget):
     def _open_binding_manager(self):
         dlg = BindingManager(self.cfg, parent=self)
         dlg.exec()
+        self.dispatcher.compile()
+        self._warn_binding_errors()
+
+    def _warn_binding_errors(self):
+        """编译绑定时被忽略的无效绑定（未知类型 / 字段校验失败）：提示出来，避免手势被静默禁用。"""
+        errs = self.dispatcher.binding_errors
+        if not errs:
+            return
+        more = f"\n……共 {len(errs)} 条" if len(errs) > 20 else ""
+        QMessageBox.warning(self, "绑定校验", "以下绑定无效，已忽略：\n" + "\n".join(errs[:20]) + more)
 
     def _open_gestures(self):
         dlg = GestureCatalogEditor(self.cfg, parent=self)
         dlg.exec()
+        self.infer_worker.refresh_config()
 
     def _open_actions(self):
         dlg = ActionCatalogViewer(self.cfg, parent=self)
@@ -596,7 +649,8 @@ class MainWindow(QWidget):
 
     def _open_glove_calib(self):
         if self._glove_dialog is None:
-            self._glove_dialog = GloveCalibrationDialog(self.cfg, parent=self)
+            self._glove_dialog = GloveCalibrationDialog(self.cfg, parent=self,
+                                                        on_calibrated=self.infer_worker.refresh_config)
         self._glove_dialog.show()
         self._glove_dialog.raise_()
 
@@ -619,6 +673,7 @@ class MainWindow(QWidget):
                         "enable_when": {},
                         "params": {"cooldown_ms": 600}
                     })
+                    self.infer_worker.refresh_config()
                 QMessageBox.information(self, "成功", f"已保存自定义手势：{gid}")
             else:
                 QMessageBox.warning(self, "失败", "保存模板失败（轨迹不足或数据异常）")
@@ -630,15 +685,21 @@ class MainWindow(QWidget):
             return
         try:
             self.cfg = load_config(path)
-            self.dispatcher = Dispatcher(self.cfg, self.state)
-            self.engine = GestureEngine(self.cfg)
-            self.custom_mgr = CustomGestureManager(self.cfg)
-
-            glove_cfg = self.cfg.get("glove", {})
-            self.glove.update_hsv(glove_cfg.get("hsv_lower", [20, 80, 80]), glove_cfg.get("hsv_upper", [40, 255, 255]))
+            self.input_backend = make_input_backend(self.cfg["general"])
+            self.mouse.backend = self.input_backend
+            self.mouse_worker.backend = self.input_backend
+            self.mouse_worker.configure(self.cfg["general"])
+            self.action_executor.backend = self.input_backend
+            self.action_executor.configure(self.cfg["general"])
+            self.dispatcher = Dispatcher(self.cfg, self.state, self.input_backend, executor=self._executor_or_none())
+            self._warn_binding_errors()
+            # engine / custom_mgr / glove 阈值在推理线程内整体替换
+            self.infer_worker.set_config(self.cfg)
+            self.custom_mgr = self.infer_worker.pipeline.custom_mgr
 
             # 重新同步 UI
             self._sync_cfg_to_ui()
+            self.mouse.update(self._mouse_params())
 
             QMessageBox.information(self, "加载成功", path)
         except Exception as ex:
@@ -657,93 +718,23 @@ class MainWindow(QWidget):
         except Exception as ex:
             QMessageBox.critical(self, "保存失败", str(ex))
 
-    # ---------------- main tick ----------------
-    def _tick(self):
-        debug = getattr(self, "_last_debug", {"note": "debug_not_ready"})
-        if self._latest_frame is None:
-            return
-
-        frame = self._latest_frame
-        h, w = frame.shape[:2]
-
-        now_ms = int(time.time() * 1000)
-        do_infer = self.state.recognition_enabled and self.state.camera_device_enabled and (
-            now_ms - self._last_infer_ms >= int(1000 / max(5, self.infer_fps))
-        )
-
-        event = None
-        raw_static = self._last_raw_static
-        scroll = self._last_scroll
-
-        mode = self.mode_box.currentText()
-
-        if do_infer:
-            self._last_infer_ms = now_ms
-
-            scale = float(self.cfg["general"].get("infer_scale", 0.6))
-            if 0.2 < scale < 1.0:
-                infer = cv2.resize(frame, (int(w * scale), int(h * scale)))
-            else:
-                infer = frame
-                scale = 1.0
-
-            if mode == "bare":
-                lm2 = self.tracker.process(infer)
-                if lm2 is not None and scale != 1.0:
-                    lm2 = lm2 / scale
-                self._last_lm = lm2
-                self._last_glove_feats = None
-
-                if lm2 is not None:
-                    self._hand_present_count += 1
-                    self._custom_track.add(float(lm2[8][0]), float(lm2[8][1]))
-                    if self._recorder is not None and self._recorder.isVisible() and self._recorder.recording:
-                        self._recorder.add_point(float(lm2[8][0]), float(lm2[8][1]))
-                #（这保证丢手时不会拿到一堆垃圾轨迹去匹配）
-                else:
-                    self._hand_present_count = 0
-                    self._custom_track.reset()
-                event, raw_static, scroll, debug = self.engine.update_bare(lm2, self.state)
-                self._last_debug = debug
-
-                # 自定义匹配：只在没有事件/滚动时尝试
-                if event is None and (scroll is None) and lm2 is not None:
-                    now = int(time.time() * 1000)
-
-                    # 手稳定存在一小段时间才匹配
-                    if self._hand_present_count >= 6:
-                        # 匹配限频
-                        if now - self._custom_last_match_ms >= self._custom_match_interval_ms:
-                            self._custom_last_match_ms = now
-
-                            # 触发冷却（防止反复触发）
-                            if now - self._custom_last_fire_ms >= 800:
-                                if len(self._custom_track.pts) >= 20:
-                                    pts = np.array([(x, y) for _, x, y in self._custom_track.pts], dtype=np.float32)
-
-                                    thr = float(self.cfg["general"].get("custom_match_threshold", 0.32))
-                                    m = self.custom_mgr.match(mode="bare", raw_points=pts, threshold=thr)
-
-                                    if m:
-                                        gid, dist = m
-                                        event = gid
-                                        self._custom_last_fire_ms = now
-                                        # 匹配到后清掉轨迹，避免立刻再次匹配到同一个
-                                        self._custom_track.reset()
-
-            else:
-                feats = self.glove.process(infer)
-                if scale != 1.0 and feats.center is not None:
-                    feats.center = (int(feats.center[0] / scale), int(feats.center[1] / scale))
-                    feats.fingertips = [(int(x / scale), int(y / scale)) for x, y in feats.fingertips]
-                self._last_glove_feats = feats
-                self._last_lm = None
+    # ---------------- inference results (GUI 线程, queued) ----------------
+    def _on_infer_result(self, res):
+        self._last_deliver_ms = (time.perf_counter() - res.t_done) * 1000.0
+        self._last_timings = res.timings
+        self._last_debug = res.debug
+        self._last_lm = res.lm
+        self._last_glove_feats = res.glove_feats
+        self._last_raw_static = res.raw_static
+        self._last_scroll = res.scroll
 
-                event, raw_static, scroll, debug = self.engine.update_glove(feats, self.state)
-                self._last_debug = debug
+        mode = res.mode
+        event = res.event
+        scroll = res.scroll
+        w, h = res.frame_w, res.frame_h
 
-            self._last_raw_static = raw_static
-            self._last_scroll = scroll
+        if res.lm is not None and self._recorder is not None and self._recorder.isVisible() and self._recorder.recording:
+            self._recorder.add_point(float(res.lm[8][0]), float(res.lm[8][1]))
 
         # 鼠标移动输出
         can_move = (
@@ -751,16 +742,17 @@ class MainWindow(QWidget):
             self.state.mouse_move_output_enabled and self.state.mouse_move_mode
         )
         if can_move:
+            t_s = res.t_capture_ns / 1e9 if res.t_capture_ns else None
             if mode == "bare" and self._last_lm is not None:
                 x, y = float(self._last_lm[8][0]), float(self._last_lm[8][1])
-                tgt = self.mouse.compute_target(x, y, frame_w=w, frame_h=h)
+                tgt = self.mouse.compute_target(x, y, frame_w=w, frame_h=h, t_s=t_s)
                 if tgt:
-                    self.mouse_worker.set_target(tgt[0], tgt[1])
+                    self.mouse_worker.set_target(tgt[0], tgt[1], res.t_capture_ns)
             elif mode == "glove" and self._last_glove_feats is not None and self._last_glove_feats.center is not None:
                 cx, cy = self._last_glove_feats.center
-                tgt = self.mouse.compute_target(float(cx), float(cy), frame_w=w, frame_h=h)
+                tgt = self.mouse.compute_target(float(cx), float(cy), frame_w=w, frame_h=h, t_s=t_s)
                 if tgt:
-                    self.mouse_worker.set_target(tgt[0], tgt[1])
+                    self.mouse_worker.set_target(tgt[0], tgt[1], res.t_capture_ns)
         else:
             self.mouse_worker.invalidate()
 
@@ -769,14 +761,16 @@ class MainWindow(QWidget):
             sv = int(scroll.get("sv", 0))
             sh = int(scroll.get("sh", 0))
             if sv != 0:
-                self.dispatcher.dispatch("__SCROLL_V__", cooldown_ms=0, extra_payload={"amount": sv})
+                self.dispatcher.dispatch("__SCROLL_V__", cooldown_ms=0, extra_payload={"amount": sv},
+                                         t_capture_ns=res.t_capture_ns)
             if sh != 0:
-                self.dispatcher.dispatch("__SCROLL_H__", cooldown_ms=0, extra_payload={"amount": sh})
+                self.dispatcher.dispatch("__SCROLL_H__", cooldown_ms=0, extra_payload={"amount": sh},
+                                         t_capture_ns=res.t_capture_ns)
 
         # 事件 -> 绑定
         if event:
             cd = int(self._gesture_cooldown(event))
-            action = self.dispatcher.dispatch(event, cooldown_ms=cd)
+            action = self.dispatcher.dispatch(event, cooldown_ms=cd, t_capture_ns=res.t_capture_ns)
 
             if action and action.get("type") == "toggle_camera_device":
                 self._toggle_camera_device()
@@ -784,9 +778,29 @@ class MainWindow(QWidget):
             if self.cfg["general"].get("osd_enabled", True) and self.osd_toggle.isChecked():
                 self._show_osd(mode, event, action)
 
-        # 预览渲染
-        if self.state.camera_preview_enabled:
-            vis = frame
+    # ---------------- main tick（仅渲染） ----------------
+    def _tick(self):
+        debug = getattr(self, "_last_debug", {"note": "debug_not_ready"})
+        got = self.frame_mailbox.get_latest(self._preview_seq, reader="preview")
+        if got is not None:
+            self.frame_mailbox.release(self._latest_frame)
+            self._preview_seq, self._latest_frame, _t_ns = got
+            if self._glove_dialog is not None and self._glove_dialog.isVisible():
+                self._glove_dialog.update_frame(self._latest_frame)
+        if self._latest_frame is None:
+            return
+
+        t0 = time.perf_counter()
+        frame = self._latest_frame
+        mode = self.mode_box.currentText()
+
+        # 预览渲染（无新帧时不重复渲染）
+        if self.state.camera_preview_enabled and got is not None:
+            # 帧同时被推理线程读取，绘制前先拷贝到预览缓冲
+            if self._vis_buf is None or self._vis_buf.shape != frame.shape:
+                self._vis_buf = np.empty_like(frame)
+            vis = self._vis_buf
+            np.copyto(vis, frame)
             if mode == "bare" and self._last_lm is not None:
                 p = self._last_lm[8].astype(int)
                 cv2.circle(vis, (p[0], p[1]), 6, (255, 0, 255), -1)
@@ -794,14 +808,17 @@ class MainWindow(QWidget):
                 feats = self._last_glove_feats
                 if feats.center:
                     cv2.circle(vis, feats.center, 7, (255, 255, 0), -1)
+                if feats.box is not None:
+                    cv2.polylines(vis, [cv2.boxPoints(feats.box).astype(np.int32)], True, (0, 255, 255), 2)
                 for x, y in feats.fingertips:
                     cv2.circle(vis, (x, y), 7, (0, 0, 255), -1)
             self._show_frame(vis)
-        else:
+        elif not self.state.camera_preview_enabled:
             if self.preview.pixmap() is not None:
                 self.preview.clear()
                 self.preview.setText("预览已关闭（识别仍在后台运行）")
                 self.preview.setStyleSheet("background:#111; color:#bbb;")
+        self._last_render_ms = (time.perf_counter() - t0) * 1000.0
 
         # 控制debug刷新频率，避免变化太快看不清
         now_debug_ms = int(time.time() * 1000)
@@ -811,6 +828,7 @@ class MainWindow(QWidget):
                 self.debug_overlay.update_text(self._format_debug(debug))
         else:
             self.debug_overlay.hide()
+
     def _toggle_camera_device(self):
         if self.state.camera_device_enabled:
             self._stop_camera()
@@ -818,10 +836,7 @@ class MainWindow(QWidget):
             self._start_camera()
 
     def _gesture_cooldown(self, gid: str):
-        for it in self.cfg.get("gesture_catalog", []):
-            if it.get("id") == gid:
-                return it.get("params", {}).get("cooldown_ms", self.cfg["general"].get("cooldown_ms", 450))
-        return self.cfg["general"].get("cooldown_ms", 450)
+        return self.infer_worker.pipeline.engine.conf.gesture_cooldown(gid)
 
     def _show_osd(self, mode: str, gesture_id: str, action: dict):
         if action is None:
@@ -843,7 +858,10 @@ class MainWindow(QWidget):
         self.osd.show_message(text, ms=900)
 
     def _show_frame(self, frame_bgr):
-        rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+        if self._rgb_buf is None or self._rgb_buf.shape != frame_bgr.shape:
+            self._rgb_buf = np.empty_like(frame_bgr)
+        # QPixmap.fromImage 会拷贝像素，缓冲可以下一帧复用
+        rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
         h, w, ch = rgb.shape
         qimg = QImage(rgb.data, w, h, w * ch, QImage.Format.Format_RGB888)
         pix = QPixmap.fromImage(qimg)
@@ -862,10 +880,46 @@ class MainWindow(QWidget):
             "three_pinch","moving","path_len","avg_speed",
             "pinch_middle_hold","close_hold","scroll_active","dx","dy",
             "swipe_dir_consistency",  # 新增：滑动方向一致性
-            "blocked_reason","event"
+            "blocked_reason","event","seq"
         ]
         lines = []
         for k in keys:
             if k in d:
                 lines.append(f"{k:>18}: {d[k]}")
+
+        # 分阶段耗时：推理线程各阶段 + 投递延迟 + GUI 渲染
+        tm = dict(self._last_timings)
+        tm["deliver_ms"] = self._last_deliver_ms
+        tm["render_ms"] = self._last_render_ms
+        if self.action_executor.last_latency_ms is not None:
+            tm["capture_to_action_ms"] = self.action_executor.last_latency_ms
+        elif self.dispatcher.last_latency_ms is not None:
+            tm["capture_to_action_ms"] = self.dispatcher.last_latency_ms
+        for k in ["resize_ms", "track_ms", "engine_ms", "custom_ms", "total_ms", "deliver_ms", "render_ms",
+                  "capture_to_result_ms", "capture_to_action_ms"]:
+            if k in tm:
+                lines.append(f"{k:>18}: {tm[k]:.1f}")
+
+        # 鼠标输出线程：节拍唤醒偏差与 采集->目标 延迟
+        ms = self.mouse_worker.jitter_stats()
+        if ms.get("latency_ms") is not None:
+            lines.append(f"{'mouse_latency_ms':>18}: {ms['latency_ms']:.1f}")
+        if "late_p99_us" in ms:
+            lines.append(f"{'mouse_late_p99_us':>18}: {ms['late_p99_us']:.0f}")
+            lines.append(f"{'mouse_missed':>18}: {ms['missed']}")
+
+        # 动作执行线程：队列深度，各动作类型的 次数 / 平均排队与执行耗时（ms）/ 丢弃 / 合并
+        ex = self.action_executor
+        lines.append(f"{'action_queue':>18}: {ex.depth()} (max {ex.max_depth})")
+        for t, st in ex.stats().items():
+            lines.append(f"{t[:18]:>18}: n={st['count']} wait={st['avg_wait_ms']:.1f} run={st['avg_run_ms']:.1f} "
+                         f"drop={st['dropped']} merge={st['coalesced']}")
+
+        # 帧信箱：发布/覆盖（推理线程未读取即被覆盖）/预览错过/推理跳帧
+        st = self.frame_mailbox.stats()
+        st["infer_skipped"] = self.infer_worker.frames_skipped
+        for k in ["cam_seq", "cam_published", "cam_overwritten", "cam_drop_rate", "preview_missed", "infer_skipped",
+                  "pool_allocated", "pool_in_use"]:
+            if k in st:
+                lines.append(f"{k:>18}: {st[k]}")
         return "\n".join(lines)
\ No newline at end of file
@@ -11,9 +11,12 @@ class BareHandTracker:
             min_detection_confidence=min_det,
             min_tracking_confidence=min_track
         )
+        self._rgb = None  # 复用的 RGB 缓冲
 
     def process(self, frame_bgr):
-        rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+        if self._rgb is None or self._rgb.shape != frame_bgr.shape:
+            self._rgb = np.empty_like(frame_bgr)
+        rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=self._rgb)
         res = self.hands.process(rgb)
 
         h, w = frame_bgr.shape[:2]
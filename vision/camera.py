@@ -1,15 +1,17 @@
+import time
+
 import cv2
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QThread
 
-class CameraThread(QThread):
-    frame_signal = pyqtSignal(object)
+from vision.frame_buffers import FrameMailbox
+from vision.frame_source import FrameSource
 
-    def __init__(self, index=0, width=640, height=480, fps=30, mirror=True):
+class CameraThread(QThread):
+    """采集线程：从 FrameSource 读帧，只把最新帧写入 mailbox，由推理线程/GUI 按需拉取。"""
+    def __init__(self, mailbox: FrameMailbox, source: FrameSource, mirror=True):
         super().__init__()
-        self.index = int(index)
-        self.width = int(width)
-        self.height = int(height)
-        self.fps = int(fps)
+        self.mailbox = mailbox
+        self.source = source
         self.mirror = bool(mirror)
         self._running = True
 
@@ -20,25 +22,51 @@ class CameraThread(QThread):
         self.mirror = bool(mirror)
 
     def run(self):
-        cap = cv2.VideoCapture(self.index, cv2.CAP_DSHOW)
-        if not cap.isOpened():
+        src = self.source
+        if not src.open():
+            src.release()
             return
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
-        cap.set(cv2.CAP_PROP_FPS, self.fps)
-
-        # warm-up: 丢弃几帧让曝光/协商稳定
-        for _ in range(5):
-            ok, _f = cap.read()
-            if not ok:
-                break
-
-        while self._running:
-            ok, frame = cap.read()
-            if not ok:
+
+        pool = self.mailbox.pool
+        raw = None  # 镜像时的采集中间缓冲（仅本线程使用）
+        shape = None
+        while self._running and not src.finished:
+            if pool is None:
+                ok, frame, _ts = src.read()
+                t_ns = time.monotonic_ns()
+                if not ok:
+                    continue
+                if self.mirror:
+                    frame = cv2.flip(frame, 1)
+                self.mailbox.put(frame, t_ns)
                 continue
-            if self.mirror:
-                frame = cv2.flip(frame, 1)
-            self.frame_signal.emit(frame)
 
-        cap.release()
\ No newline at end of file
+            # 复用缓冲：capture -> flip 均写入预分配的数组
+            if self.mirror or shape is None:
+                ok, raw, _ts = src.read(image=raw)
+                t_ns = time.monotonic_ns()
+                if not ok:
+                    continue
+                shape = raw.shape
+                frame = pool.acquire(shape, raw.dtype)
+                if self.mirror:
+                    cv2.flip(raw, 1, dst=frame)
+                else:
+                    frame[...] = raw
+            else:
+                frame = pool.acquire(shape)
+                ok, got, _ts = src.read(image=frame)
+                t_ns = time.monotonic_ns()
+                if not ok or got is not frame:
+                    # 来源实际分辨率变化：本帧拷贝一次，之后按实际尺寸申请
+                    pool.release(frame)
+                    if not ok:
+                        continue
+                    shape = got.shape
+                    frame = pool.acquire(shape, got.dtype)
+                    frame[...] = got
+            # 采集时刻（读到帧之后立即打点），后续延迟均以此为起点；界面里的回放按原始节奏输出，
+            # 用单调时钟打点即可与鼠标/动作延迟统计共用同一时钟（媒体时间戳供 headless 快速回放使用）
+            self.mailbox.put(frame, t_ns)
+
+        src.release()
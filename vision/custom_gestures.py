@@ -1,15 +1,175 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+
 import numpy as np
-from vision.trajectory import normalize_trajectory, template_distance
+from vision.trajectory import normalize_trajectory
+
+MATCHERS = ("euclidean", "protractor", "dtw")
+
+_N = 64
+_CHUNK = 16  # protractor 提前放弃的分块点数
+
+
+class _TemplateBank:
+    """
+    某一查询 mode 下的预编译模板：连续张量 + protractor 所需的复数形式与尾部范数，
+    以及 DTW 的 LB_Keogh 上下包络（按带宽缓存，模板变化时随 bank 一起重建）。
+    """
+    __slots__ = ("ids", "templ", "conj", "tail", "_env")
+
+    def __init__(self, ids, templ: np.ndarray):
+        self.ids = ids
+        self.templ = templ                                      # (K,64,2) float32
+        self.conj = (templ[:, :, 0] - 1j * templ[:, :, 1]).astype(np.complex64)  # (K,64) 共轭
+        self.tail = _tail_norms(templ)                          # (K,chunks+1)
+        self._env = {}                                          # band -> (lower, upper)
+
+    def envelope(self, band: int):
+        env = self._env.get(band)
+        if env is None:
+            env = _envelope(self.templ, band)
+            self._env[band] = env
+        return env
+
+
+def _tail_norms(x: np.ndarray) -> np.ndarray:
+    """x (...,64,2) → (...,chunks+1)：第 c 列为第 c 块起到末尾的 L2 范数，末列为 0。"""
+    sq = (x.astype(np.float64) ** 2).sum(axis=-1)
+    # 块数写明而不是 -1：没有模板（K=0）时 reshape 也成立
+    blocks = sq.reshape(sq.shape[:-1] + (sq.shape[-1] // _CHUNK, _CHUNK)).sum(axis=-1)
+    rest = np.cumsum(blocks[..., ::-1], axis=-1)[..., ::-1]
+    zeros = np.zeros(rest.shape[:-1] + (1,))
+    return np.sqrt(np.concatenate([rest, zeros], axis=-1))
+
+
+def _envelope(templ: np.ndarray, band: int):
+    """(K,n,2) → 逐点 [i-band, i+band] 窗口内各轴的 (lower, upper)，均为 (K,n,2)。"""
+    n = templ.shape[1]
+    lo = templ.copy()
+    hi = templ.copy()
+    for k in range(1, band + 1):
+        lo[:, k:] = np.minimum(lo[:, k:], templ[:, :n - k])
+        lo[:, :n - k] = np.minimum(lo[:, :n - k], templ[:, k:])
+        hi[:, k:] = np.maximum(hi[:, k:], templ[:, :n - k])
+        hi[:, :n - k] = np.maximum(hi[:, :n - k], templ[:, k:])
+    return lo, hi
+
+
+def lb_keogh(lo: np.ndarray, hi: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    LB_Keogh 下界（逐点欧氏代价的累加 DTW）：q 每个点到模板包络盒的距离之和。
+    带内任一对齐路径都至少经过 q 的每个点一次，且对齐到的模板点都在盒内，故不超过 DTW。
+    q 为 (n,2) 时返回 (K,)；为 (C,n,2) 时返回 (C,K)。
+    """
+    qq = q[..., None, :, :]
+    out = np.maximum(lo - qq, 0.0) + np.maximum(qq - hi, 0.0)
+    return np.sqrt((out * out).sum(axis=-1)).sum(axis=-1)
+
+
+def dtw_banded(templ: np.ndarray, q: np.ndarray, band: int, abandon: float = np.inf) -> np.ndarray:
+    """
+    一批模板 (K,n,2) 与查询 (n,2)（或逐对的 (K,n,2)）的 Sakoe–Chiba 带内 DTW（逐点欧氏代价之和）。
+    累计矩阵按带坐标存储（第 i 行只保存 j ∈ [i-band, i+band]），逐行推进、对整批模板向量化：
+      D[i,j] = c[i,j] + min(v[j], D[i,j-1])，v[j] = min(D[i-1,j-1], D[i-1,j])
+    行内递推可写成前缀和 + 前缀最小值，一行只需几次 NumPy 运算。
+    任一路径经过每一行且累计值单调不减，某行最小值已超过 abandon 的模板提前放弃（返回 inf）。
+    """
+    k, n = templ.shape[0], templ.shape[1]
+    w = 2 * band + 1
+    off = np.arange(w) - band
+    j = np.arange(n)[:, None] + off[None, :]                  # (n,w) 带内列号
+    valid = (j >= 0) & (j < n)
+    jc = np.clip(j, 0, n - 1)
+    qb = q[jc][None] if q.ndim == 2 else q[:, jc]               # (1|K,n,w,2)
+    diff = templ[:, :, None, :] - qb
+    cost = np.sqrt((diff * diff).sum(axis=3))                   # (K,n,w)
+    cost[:, ~valid] = 0.0                                       # 越界格代价置 0，结果再置 inf
+
+    prev = np.full((k, w + 1), np.inf)
+    prev[:, band] = 0.0                                         # 虚拟起点 D[-1,-1]
+    alive = np.ones(k, dtype=bool)
+    zero = np.zeros((k, 1))
+    for i in range(n):
+        v = np.minimum(prev[:, :w], prev[:, 1:])
+        c = np.cumsum(cost[:, i], axis=1)
+        c_prev = np.concatenate([zero, c[:, :-1]], axis=1)
+        row = c + np.minimum.accumulate(v - c_prev, axis=1)
+        row[:, ~valid[i]] = np.inf
+        prev[:, :w] = row
+        alive &= row.min(axis=1) <= abandon
+        if not alive.any():
+            break
+    out = prev[:, band].copy()
+    out[~alive] = np.inf
+    return out
+
 
 class CustomGestureManager:
     """
     cfg["custom_gestures"] = [
       {"id":"MY_CIRCLE", "mode":"bare", "type":"dynamic_template", "template":[[x,y]...64]}
     ]
+    模板按查询 mode 预编译成连续的 (K,64,2) float32 张量，match 一次向量化计算全部距离；
+    缓存记住编译时的列表对象本身（持有引用，id 不会被复用）与版本号：列表被整体替换时重建；
+    原地增删改模板后需调用 invalidate()（版本号 +1），add_template 会自动调用。
+
+    matcher（general.custom_matcher）：
+      euclidean  - 逐点平均距离（平移、尺度归一化）
+      protractor - 另对旋转闭式求最优角（可限幅），距离为旋转后的逐点 RMS；
+                   按块累加内积，用 Cauchy–Schwarz 上界提前放弃不可能过阈值的模板
+      dtw        - Sakoe–Chiba 带内 DTW（距离为累计代价 / n，与 euclidean 同量纲且不大于它），
+                   容忍各段相对长短变化；先用 LB_Keogh 下界排序与剪枝，再小批量精算
     """
     def __init__(self, cfg: dict):
         self.cfg = cfg
         self.cfg.setdefault("custom_gestures", [])
+        self._bank = {}       # mode -> _TemplateBank
+        self._bank_src = None  # 编译 _bank 时的 custom_gestures 列表对象
+        self._version = 0
+        self._bank_version = -1
+        self.stats = {"scored": 0, "abandoned": 0, "dtw_full": 0}
+
+    @property
+    def matcher(self) -> str:
+        m = str(self.cfg.get("general", {}).get("custom_matcher", "euclidean"))
+        return m if m in MATCHERS else "euclidean"
+
+    def invalidate(self):
+        """模板被原地修改（增删改）后调用：下次匹配时重建预编译模板。"""
+        self._version += 1
+        self._bank = {}
+
+    def _compiled(self, mode: str) -> _TemplateBank:
+        lst = self.cfg.get("custom_gestures", [])
+        if lst is not self._bank_src or self._version != self._bank_version:
+            self._bank = {}
+            self._bank_src = lst
+            self._bank_version = self._version
+
+        bank = self._bank.get(mode)
+        if bank is None:
+            ids = []
+            rows = []
+            for g in lst:
+                if g.get("type") != "dynamic_template":
+                    continue
+                if g.get("mode") not in (mode, "both"):
+                    continue
+                templ = np.asarray(g.get("template", []), dtype=np.float32)
+                if templ.shape != (_N, 2) or not g.get("id"):
+                    continue
+                ids.append(g.get("id"))
+                rows.append(templ)
+            templ = np.ascontiguousarray(np.stack(rows)) if rows else np.zeros((0, _N, 2), dtype=np.float32)
+            bank = _TemplateBank(ids, templ)
+            self._bank[mode] = bank
+        return bank
+
+    def has_templates(self, mode: str) -> bool:
+        """该查询 mode 下是否有可用模板（用已编译的缓存，不重复扫描配置）。"""
+        return len(self._compiled(mode).ids) > 0
 
     def list_ids(self, mode=None):
         out = []
@@ -22,35 +182,311 @@ class CustomGestureManager:
         return [x for x in out if x]
 
     def add_template(self, gid: str, mode: str, raw_points: np.ndarray) -> bool:
-        norm = normalize_trajectory(raw_points, n=64)
+        norm = normalize_trajectory(raw_points, n=_N)
         if norm is None:
             return False
         entry = {"id": gid, "mode": mode, "type": "dynamic_template", "template": norm.tolist()}
         # 覆盖同名
         self.cfg["custom_gestures"] = [x for x in self.cfg["custom_gestures"] if x.get("id") != gid]
         self.cfg["custom_gestures"].append(entry)
+        self.invalidate()
         return True
 
-    def match(self, mode: str, raw_points: np.ndarray, threshold: float = 0.22):
-        norm = normalize_trajectory(raw_points, n=64)
+    def _euclidean(self, bank: _TemplateBank, norm: np.ndarray) -> np.ndarray:
+        diff = bank.templ - norm[None, :, :]
+        return np.sqrt((diff * diff).sum(axis=2)).mean(axis=1)
+
+    def _protractor(self, bank: _TemplateBank, norm: np.ndarray, threshold) -> np.ndarray:
+        """被提前放弃的模板距离为 inf。"""
+        k = len(bank.ids)
+        q = (norm[:, 0] + 1j * norm[:, 1]).astype(np.complex64)
+        q_tail = _tail_norms(norm)
+        t_norm = bank.tail[:, 0]
+        q_norm = q_tail[0]
+
+        # dist² = (|t|² + |q|² - 2·sim) / n ≤ thr²  ⇔  sim ≥ need
+        need = -np.inf
+        if threshold is not None:
+            need = (t_norm ** 2 + q_norm ** 2 - _N * float(threshold) ** 2) / 2.0
+
+        z = np.zeros(k, dtype=np.complex128)
+        alive = np.arange(k)
+        for c in range(_N // _CHUNK):
+            sl = slice(c * _CHUNK, (c + 1) * _CHUNK)
+            z[alive] += bank.conj[alive, sl] @ q[sl]
+            # 剩余块对 |z| 的贡献 ≤ |t_rest|·|q_rest|（Cauchy–Schwarz）
+            ub = np.abs(z[alive]) + bank.tail[alive, c + 1] * q_tail[c + 1]
+            alive = alive[ub >= need[alive]] if threshold is not None else alive
+            if alive.size == 0:
+                break
+
+        self.stats["scored"] += k
+        self.stats["abandoned"] += k - alive.size
+
+        d = np.full(k, np.inf)
+        if alive.size:
+            za = z[alive]
+            theta = np.angle(za)
+            lim = math.radians(float(self.cfg.get("general", {}).get("protractor_max_rotation_deg", 45)))
+            theta = np.clip(theta, -lim, lim)
+            # 查询旋转 -theta 后与模板的内积实部：a·cosθ + b·sinθ
+            sim = za.real * np.cos(theta) + za.imag * np.sin(theta)
+            d2 = (t_norm[alive] ** 2 + q_norm ** 2 - 2.0 * sim) / _N
+            d[alive] = np.sqrt(np.maximum(d2, 0.0))
+        return d
+
+    def _dtw(self, bank: _TemplateBank, norm: np.ndarray, threshold) -> np.ndarray:
+        """未精算或被剪枝的模板距离为 inf。"""
+        k = len(bank.ids)
+        band = self._dtw_band()
+        lo, hi = bank.envelope(band)
+        lb = lb_keogh(lo, hi, norm)
+
+        best = np.inf if threshold is None else float(threshold) * _N
+        d = np.full(k, np.inf)
+        order = np.argsort(lb)
+        pos = 0
+        batch = 4
+        while pos < k:
+            cand = order[pos:pos + batch]
+            cand = cand[lb[cand] <= best]
+            if cand.size == 0:
+                break  # 按下界升序，其后都不可能更好
+            full = dtw_banded(bank.templ[cand], norm, band, abandon=best)
+            d[cand] = full
+            self.stats["dtw_full"] += cand.size
+            best = min(best, float(full.min()))
+            pos += batch
+            batch *= 2
+
+        self.stats["scored"] += k
+        self.stats["abandoned"] += int(np.isinf(d).sum())
+        return d / _N
+
+    def _dtw_band(self) -> int:
+        ratio = float(self.cfg.get("general", {}).get("dtw_band_ratio", 0.1))
+        return max(0, min(_N - 1, int(round(ratio * _N))))
+
+    def score_batch(self, mode: str, norms: np.ndarray, matcher: str = None, threshold: float = None):
+        """
+        多条已归一化查询 (C,64,2) 一次打分，返回 (ids, dists(C,K))。
+        dtw 下只精算按下界排序、仍可能成为全局最优的 (查询, 模板) 对，其余为 inf。
+        """
+        bank = self._compiled(mode)
+        c, k = len(norms), len(bank.ids)
+        if k == 0 or c == 0:
+            return bank.ids, np.zeros((c, 0))
+        m = matcher or self.matcher
+
+        if m == "protractor":
+            q = (norms[:, :, 0] + 1j * norms[:, :, 1]).astype(np.complex64)
+            z = q @ bank.conj.T                                   # (C,K)
+            lim = math.radians(float(self.cfg.get("general", {}).get("protractor_max_rotation_deg", 45)))
+            theta = np.clip(np.angle(z), -lim, lim)
+            sim = z.real * np.cos(theta) + z.imag * np.sin(theta)
+            qn = (norms.astype(np.float64) ** 2).sum(axis=(1, 2))
+            tn = bank.tail[:, 0] ** 2
+            return bank.ids, np.sqrt(np.maximum((qn[:, None] + tn[None, :] - 2.0 * sim) / _N, 0.0))
+
+        if m == "dtw":
+            band = self._dtw_band()
+            lo, hi = bank.envelope(band)
+            lb = lb_keogh(lo, hi, norms).ravel()
+            best = np.inf if threshold is None else float(threshold) * _N
+            d = np.full(c * k, np.inf)
+            order = np.argsort(lb)
+            pos, batch = 0, 4
+            while pos < len(order):
+                cand = order[pos:pos + batch]
+                cand = cand[lb[cand] <= best]
+                if cand.size == 0:
+                    break
+                full = dtw_banded(bank.templ[cand % k], norms[cand // k], band, abandon=best)
+                d[cand] = full
+                self.stats["dtw_full"] += cand.size
+                best = min(best, float(full.min()))
+                pos += batch
+                batch *= 2
+            return bank.ids, d.reshape(c, k) / _N
+
+        diff = bank.templ[None] - norms[:, None]                  # (C,K,64,2)
+        return bank.ids, np.sqrt((diff * diff).sum(axis=3)).mean(axis=2)
+
+    def scores(self, mode: str, norm: np.ndarray, matcher: str = None, threshold: float = None):
+        """
+        返回 (ids, dists)：norm 与该 mode 下全部模板的距离。
+        threshold 供 protractor / dtw 提前放弃使用（不可能过阈值或不可能最优的模板距离为 inf）。
+        """
+        bank = self._compiled(mode)
+        if not bank.ids or norm is None or norm.shape != (_N, 2):
+            return bank.ids, np.zeros(0, dtype=np.float32)
+        m = matcher or self.matcher
+        if m == "protractor":
+            return bank.ids, self._protractor(bank, norm, threshold)
+        if m == "dtw":
+            return bank.ids, self._dtw(bank, norm, threshold)
+        return bank.ids, self._euclidean(bank, norm)
+
+    def match(self, mode: str, raw_points: np.ndarray, threshold: float = 0.22, matcher: str = None):
+        norm = normalize_trajectory(raw_points, n=_N)
         if norm is None:
             return None
 
-        best_id = None
-        best_dist = 1e9
-        for g in self.cfg.get("custom_gestures", []):
-            if g.get("type") != "dynamic_template":
-                continue
-            if g.get("mode") not in (mode, "both"):
-                continue
-            templ = np.array(g.get("template", []), dtype=np.float32)
-            if templ.shape != (64, 2):
-                continue
-            d = template_distance(norm, templ)
-            if d < best_dist:
-                best_dist = d
-                best_id = g.get("id")
-
-        if best_id is not None and best_dist <= threshold:
-            return best_id, best_dist
-        return None
\ No newline at end of file
+        ids, d = self.scores(mode, norm, matcher=matcher, threshold=threshold)
+        if len(d) == 0:
+            return None
+        i = int(np.argmin(d))
+        best_dist = float(d[i])
+        if best_dist <= threshold:
+            return ids[i], best_dist
+        return None
+
+
+@dataclass
+class CustomMatch:
+    """流式检出的一次自定义手势：起止时刻为对应轨迹首末点的采集时刻（monotonic 毫秒）。"""
+    gid: str
+    dist: float
+    t_start_ms: float
+    t_end_ms: float
+
+
+class CustomGestureSpotter:
+    """
+    流式自定义手势检出：每来一个点增量维护累计弧长，对窗口内若干候选起点
+    （均以当前点为终点）一次 np.interp 批量重采样、归一化，再与全部模板批量打分。
+    某次最优距离过阈值后进入待定状态，距离不再下降（并持续 settle_ms）时立即发出，
+    随后丢弃已匹配段的点并进入短暂不应期。
+    """
+    REFRACTORY_MS = 800
+
+    def __init__(self, mgr: CustomGestureManager, mode: str = "bare", capacity: int = 256):
+        self.mgr = mgr
+        self.mode = mode
+        self.capacity = int(capacity)
+        self._t = np.zeros(self.capacity)
+        self._x = np.zeros(self.capacity)
+        self._y = np.zeros(self.capacity)
+        self._s = np.zeros(self.capacity)  # 累计弧长
+        self._n = 0
+        self._pending = None              # (CustomMatch, 最近一次改进的时刻)
+        self._last_fire_ms = None
+        self.last_ms = 0.0                # 最近一次 push 的耗时
+        self.last_best = None             # 最近一次最优 (gid, dist)
+        self.configure(mgr.cfg)
+
+    def configure(self, cfg: dict):
+        g = cfg.get("general", {}) or {}
+        self.threshold = float(g.get("custom_match_threshold", 0.32))
+        self.window_ms = float(g.get("custom_spot_window_ms", 1200))
+        self.min_ms = float(g.get("custom_spot_min_ms", 300))
+        self.min_points = max(2, int(g.get("custom_spot_min_points", 10)))
+        self.min_path_px = float(g.get("custom_spot_min_path_px", 60))
+        self.settle_ms = float(g.get("custom_spot_settle_ms", 0))
+        self.max_candidates = max(1, int(g.get("custom_spot_max_candidates", 12)))
+
+    def reset(self):
+        self._n = 0
+        self._pending = None
+
+    def suppress(self):
+        """本帧已有其它事件：丢弃待定匹配，避免同一段动作触发两次。"""
+        self._pending = None
+
+    def _drop_until(self, t_ms: float):
+        keep = self._t[:self._n] > t_ms
+        k = int(keep.sum())
+        if k < self._n:
+            i0 = self._n - k
+            for a in (self._t, self._x, self._y, self._s):
+                a[:k] = a[i0:self._n]
+            self._n = k
+
+    def _append(self, x: float, y: float, t_ms: float) -> bool:
+        n = self._n
+        if n:
+            dx = x - self._x[n - 1]
+            dy = y - self._y[n - 1]
+            seg = math.hypot(dx, dy)
+            if seg < 1e-3:
+                # 停顿：弧长不变，只推进末点时刻
+                self._t[n - 1] = t_ms
+                return False
+            s = self._s[n - 1] + seg
+        else:
+            s = 0.0
+        if n == self.capacity:
+            self._drop_until(self._t[n // 2])
+            n = self._n
+        self._t[n] = t_ms
+        self._x[n] = x
+        self._y[n] = y
+        self._s[n] = s
+        self._n = n + 1
+        self._drop_until(t_ms - self.window_ms)
+        return True
+
+    def _candidates(self) -> np.ndarray:
+        n = self._n
+        e = n - 1
+        t = self._t[:n]
+        s = self._s[:n]
+        ok = (t[e] - t <= self.window_ms) & (t[e] - t >= self.min_ms)
+        ok &= (e - np.arange(n) + 1 >= self.min_points) & (s[e] - s >= self.min_path_px)
+        idx = np.flatnonzero(ok)
+        if len(idx) > self.max_candidates:
+            pick = np.linspace(0, len(idx) - 1, self.max_candidates).round().astype(int)
+            idx = idx[pick]
+        return idx
+
+    def _normalize(self, starts: np.ndarray) -> np.ndarray:
+        """各候选 [start, end] 子轨迹按弧长批量重采样到 64 点并归一化，(C,64,2)。"""
+        n = self._n
+        s = self._s[:n]
+        s0 = s[starts][:, None]
+        u = np.linspace(0.0, 1.0, _N)[None, :]
+        target = (s0 + u * (s[n - 1] - s0)).ravel()
+        pts = np.stack([np.interp(target, s, self._x[:n]), np.interp(target, s, self._y[:n])], axis=1)
+        pts = pts.reshape(len(starts), _N, 2)
+        pts -= pts.mean(axis=1, keepdims=True)
+        scale = np.sqrt((pts ** 2).sum(axis=2).mean(axis=1))
+        scale[scale < 1e-6] = 1.0
+        return (pts / scale[:, None, None]).astype(np.float32)
+
+    def push(self, x: float, y: float, t_ms: float = None) -> Optional[CustomMatch]:
+        """加入一个点；有手势完成时返回 CustomMatch，否则 None。"""
+        t0 = time.perf_counter()
+        now = time.monotonic_ns() / 1e6 if t_ms is None else float(t_ms)
+        try:
+            self._append(float(x), float(y), now)
+            if self._last_fire_ms is not None and now - self._last_fire_ms < self.REFRACTORY_MS:
+                return None
+
+            best = None
+            # 当前 mode 没有模板：不选候选起点、不做重采样
+            starts = ()
+            if self._n >= self.min_points and self.mgr.has_templates(self.mode):
+                starts = self._candidates()
+            if len(starts):
+                ids, d = self.mgr.score_batch(self.mode, self._normalize(starts), threshold=self.threshold)
+                if d.size:
+                    ci, ki = np.unravel_index(int(np.argmin(d)), d.shape)
+                    dist = float(d[ci, ki])
+                    self.last_best = (ids[ki], dist)
+                    if dist <= self.threshold:
+                        best = CustomMatch(ids[ki], dist, float(self._t[starts[ci]]), float(self._t[self._n - 1]))
+
+            if best is not None and (self._pending is None or best.dist < self._pending[0].dist):
+                # 仍在改进：等到距离不再下降（至少下一帧）再发出
+                self._pending = (best, now)
+                return None
+
+            if self._pending is not None and now - self._pending[1] >= self.settle_ms:
+                m = self._pending[0]
+                self._pending = None
+                self._last_fire_ms = now
+                self._drop_until(m.t_end_ms)
+                return m
+            return None
+        finally:
+            self.last_ms = (time.perf_counter() - t0) * 1000.0
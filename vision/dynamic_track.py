@@ -2,65 +2,150 @@ import time
 import numpy as np
 
 class TrackWindow:
-    def __init__(self, window_ms=450):
+    """
+    定长 NumPy 环形缓冲的轨迹窗口（按时间裁剪）。
+    路径长度、各轴正/负步数增量维护：新点加入时累加，窗口裁剪时减去被移出的那一段，
+    length()/direction_consistency()/delta() 均为 O(1)。
+    """
+    def __init__(self, window_ms=450, capacity=512):
         self.window_ms = int(window_ms)
-        self.pts = []  # (t_ms, x, y)
+        self.capacity = int(capacity)
+        self._t = np.zeros(self.capacity, dtype=np.float64)
+        self._xy = np.zeros((self.capacity, 2), dtype=np.float64)
+        # 每个点相对前一点的“入段”：长度与 x/y 符号（窗口首点的入段不计入统计）
+        self._seg = np.zeros(self.capacity, dtype=np.float64)
+        self._sgn = np.zeros((self.capacity, 2), dtype=np.int8)
+        self._head = 0
+        self._n = 0
+
+        self._path = 0.0
+        self._pos = [0, 0]  # x/y 正向步数
+        self._neg = [0, 0]  # x/y 负向步数
+        self._lx = 0.0  # 末点坐标（Python float，避免逐点读 NumPy 标量）
+        self._ly = 0.0
 
     def set_window(self, window_ms: int):
         self.window_ms = int(window_ms)
 
     def reset(self):
-        self.pts.clear()
+        self._head = 0
+        self._n = 0
+        self._path = 0.0
+        self._pos = [0, 0]
+        self._neg = [0, 0]
+
+    def __len__(self):
+        return self._n
+
+    def _evict_head(self):
+        self._head = (self._head + 1) % self.capacity
+        self._n -= 1
+        if self._n == 0:
+            self.reset()
+            return
+        # 新的首点的入段不再属于窗口
+        i = self._head
+        self._path -= self._seg[i]
+        for a in (0, 1):
+            s = self._sgn[i, a]
+            if s > 0:
+                self._pos[a] -= 1
+            elif s < 0:
+                self._neg[a] -= 1
+        if self._n == 1:
+            self._path = 0.0
+
+    def add(self, x, y, t_ms: float = None):
+        # t_ms：该点对应帧的采集时刻（monotonic 毫秒）；缺省取当前时刻
+        now = time.monotonic_ns() / 1e6 if t_ms is None else float(t_ms)
+        x = float(x)
+        y = float(y)
+
+        if self._n == self.capacity:
+            self._evict_head()
+
+        i = (self._head + self._n) % self.capacity
+        self._t[i] = now
+        self._xy[i, 0] = x
+        self._xy[i, 1] = y
+        if self._n > 0:
+            dx = x - self._lx
+            dy = y - self._ly
+            seg = (dx * dx + dy * dy) ** 0.5
+            sx = (dx > 0) - (dx < 0)
+            sy = (dy > 0) - (dy < 0)
+            self._seg[i] = seg
+            self._sgn[i, 0] = sx
+            self._sgn[i, 1] = sy
+            self._path += seg
+            for a, s in ((0, sx), (1, sy)):
+                if s > 0:
+                    self._pos[a] += 1
+                elif s < 0:
+                    self._neg[a] += 1
+        self._n += 1
+        self._lx = x
+        self._ly = y
 
-    def add(self, x, y):
-        now = time.time() * 1000
-        self.pts.append((now, float(x), float(y)))
         cutoff = now - self.window_ms
-        while self.pts and self.pts[0][0] < cutoff:
-            self.pts.pop(0)
+        while self._n and self._t[self._head] < cutoff:
+            self._evict_head()
+
+    def first(self):
+        """窗口首点 (t_ms, x, y)；空窗口返回 None。"""
+        if self._n == 0:
+            return None
+        i = self._head
+        return self._t[i], self._xy[i, 0], self._xy[i, 1]
+
+    def last(self):
+        """窗口末点 (t_ms, x, y)；空窗口返回 None。"""
+        if self._n == 0:
+            return None
+        i = (self._head + self._n - 1) % self.capacity
+        return self._t[i], self._xy[i, 0], self._xy[i, 1]
+
+    def _order(self):
+        return (self._head + np.arange(self._n)) % self.capacity
+
+    def points(self) -> np.ndarray:
+        """按时间顺序返回窗口内坐标 (N,2) float32（拷贝）。"""
+        return self._xy[self._order()].astype(np.float32)
+
+    def times(self) -> np.ndarray:
+        """按时间顺序返回窗口内时间戳 (N,) 毫秒（拷贝）。"""
+        return self._t[self._order()].copy()
 
     def delta(self):
-        if len(self.pts) < 6:
+        if self._n < 6:
             return 0.0, 0.0
-        _, x0, y0 = self.pts[0]
-        _, x1, y1 = self.pts[-1]
-        return x1 - x0, y1 - y0
+        _, x0, y0 = self.first()
+        _, x1, y1 = self.last()
+        return float(x1 - x0), float(y1 - y0)
 
     def length(self):
-        if len(self.pts) < 2:
+        if self._n < 2:
             return 0.0
-        arr = np.array([(x, y) for _, x, y in self.pts], dtype=np.float32)
-        dif = np.diff(arr, axis=0)
-        seg = np.linalg.norm(dif, axis=1)
-        return float(seg.sum())
+        return max(0.0, float(self._path))
 
     def direction_consistency(self, axis: str = "x") -> float:
         """
         计算轨迹在指定轴向上的方向一致性。
         返回值范围 [0, 1]：1表示完全单向，0表示来回摆动。
-        
+
         axis: "x" 或 "y"
         """
-        if len(self.pts) < 3:
+        if self._n < 3:
             return 0.0
-        
-        arr = np.array([(x, y) for _, x, y in self.pts], dtype=np.float32)
-        if axis == "x":
-            vals = arr[:, 0]
-        else:
-            vals = arr[:, 1]
-        
-        diffs = np.diff(vals)
-        if len(diffs) == 0:
-            return 0.0
-        
+
+        a = 0 if axis == "x" else 1
         # 统计同向移动的占比
-        positive = np.sum(diffs > 0)
-        negative = np.sum(diffs < 0)
+        positive = self._pos[a]
+        negative = self._neg[a]
         total = positive + negative
         if total == 0:
             return 0.0
-        
+
         # 主方向占比
         return float(max(positive, negative) / total)
 
@@ -68,4 +153,4 @@ class TrackWindow:
         """
         判断轨迹在指定轴向是否是单向的（一致性 >= threshold）。
         """
-        return self.direction_consistency(axis) >= threshold
\ No newline at end of file
+        return self.direction_consistency(axis) >= threshold
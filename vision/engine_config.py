@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from vision.gesture_primitives import FingerRules
+
+
+@dataclass(frozen=True)
+class GestureSpec:
+    """gesture_catalog 中一项的预解析形式。"""
+    __slots__ = ("id", "params", "cooldown_ms", "stable_frames", "enable_when", "default_use")
+    id: str
+    params: Mapping
+    cooldown_ms: Optional[int]
+    stable_frames: Optional[int]
+    # 预解析的 enable_when：((state 字段名, 期望值), ...)
+    enable_when: Tuple[Tuple[str, bool], ...]
+    default_use: str
+
+    def param(self, key: str, default):
+        return self.params.get(key, default)
+
+    def enabled(self, state) -> bool:
+        for k, v in self.enable_when:
+            if hasattr(state, k) and bool(getattr(state, k)) != v:
+                return False
+        return True
+
+
+def _opt_int(v):
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class EngineConfig:
+    """
+    GestureEngine 每帧用到的配置快照（不可变）：general 阈值预先转型，
+    gesture_catalog 按 id 建索引，finger_rules 预合并。
+    配置变化时整体重建并替换，推理线程每帧只读取一次引用。
+    """
+    __slots__ = (
+        "dynamic_window_ms", "pinch_thr", "close_thr", "stable_frames", "cooldown_ms",
+        "swipe_thresh", "swipe_dir_consistency", "swipe_reverse_protect_ms",
+        "click_guard_move_px", "click_hold_frames", "click_max_speed",
+        "scroll_gain", "scroll_deadzone_px", "scroll_max_step",
+        "finger_rules", "gestures", "mouse_mode_gid",
+    )
+    dynamic_window_ms: int
+    pinch_thr: float
+    close_thr: float
+    stable_frames: int
+    cooldown_ms: int
+    swipe_thresh: float
+    swipe_dir_consistency: float
+    swipe_reverse_protect_ms: int
+    click_guard_move_px: float
+    click_hold_frames: int
+    click_max_speed: float
+    scroll_gain: float
+    scroll_deadzone_px: float
+    scroll_max_step: float
+    finger_rules: FingerRules
+    gestures: Mapping
+    mouse_mode_gid: str
+
+    @classmethod
+    def from_cfg(cls, cfg: dict) -> "EngineConfig":
+        g = cfg.get("general", {}) or {}
+
+        gestures = {}
+        mouse_mode_gid = None
+        for it in cfg.get("gesture_catalog", []) or []:
+            gid = it.get("id")
+            if not gid or gid in gestures:
+                # 与旧的线性查找一致：同 id 以第一项为准
+                continue
+            params = dict(it.get("params", {}) or {})
+            cond = it.get("enable_when", {}) or {}
+            gestures[gid] = GestureSpec(
+                id=gid,
+                params=MappingProxyType(params),
+                cooldown_ms=_opt_int(params.get("cooldown_ms")),
+                stable_frames=_opt_int(params.get("stable_frames")),
+                enable_when=tuple((str(k), bool(v)) for k, v in cond.items()),
+                default_use=str(it.get("default_use", "")),
+            )
+            if mouse_mode_gid is None and it.get("default_use") == "mouse_move_mode":
+                mouse_mode_gid = gid
+
+        return cls(
+            dynamic_window_ms=int(g.get("dynamic_window_ms", 450)),
+            pinch_thr=float(g.get("pinch_threshold_ratio", 0.33)),
+            close_thr=float(g.get("two_finger_close_ratio", 0.22)),
+            stable_frames=int(g.get("stable_frames", 2)),
+            cooldown_ms=int(g.get("cooldown_ms", 450)),
+            swipe_thresh=float(g.get("swipe_thresh_px", 80)),
+            swipe_dir_consistency=float(g.get("swipe_dir_consistency", 0.70)),
+            swipe_reverse_protect_ms=int(g.get("swipe_reverse_protect_ms", 350)),
+            click_guard_move_px=float(g.get("click_guard_move_px", 35)),
+            click_hold_frames=int(g.get("click_hold_frames", 2)),
+            click_max_speed=float(g.get("click_max_speed_px_per_s", 650)),
+            scroll_gain=float(g.get("scroll_gain", 1.6)),
+            scroll_deadzone_px=float(g.get("scroll_deadzone_px", 6)),
+            scroll_max_step=float(g.get("scroll_max_step", 120)),
+            finger_rules=FingerRules(g.get("finger_rules", {})),
+            gestures=MappingProxyType(gestures),
+            mouse_mode_gid=mouse_mode_gid or "V_SIGN",
+        )
+
+    def gesture(self, gid: str) -> Optional[GestureSpec]:
+        return self.gestures.get(gid)
+
+    def enabled(self, gid: str, state) -> bool:
+        """手势在目录中且 enable_when 满足。"""
+        spec = self.gestures.get(gid)
+        return spec is not None and spec.enabled(state)
+
+    def gesture_cooldown(self, gid: str) -> int:
+        spec = self.gestures.get(gid)
+        if spec is not None and spec.cooldown_ms is not None:
+            return spec.cooldown_ms
+        return self.cooldown_ms
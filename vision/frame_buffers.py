@@ -0,0 +1,164 @@
+import time
+import threading
+
+import numpy as np
+
+
+class FramePool:
+    """
+    可复用整帧缓冲池（按 shape/dtype 分组，引用计数）。
+    采集 acquire -> 写入（cap.read(image=)/cv2.flip(dst=)）-> 交给 mailbox；
+    消费者 retain/release，计数归零后缓冲回到空闲列表，稳态下每帧不再分配新内存。
+    """
+    def __init__(self, max_free: int = 6):
+        self.max_free = int(max_free)
+        self._lock = threading.Lock()
+        self._free = {}   # (shape, dtype) -> [ndarray]
+        self._refs = {}   # id(buf) -> [buf, count]
+
+        self.allocated = 0
+        self.reused = 0
+
+    def acquire(self, shape, dtype=np.uint8) -> np.ndarray:
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                buf = free.pop()
+                self.reused += 1
+            else:
+                buf = np.empty(shape, dtype=dtype)
+                self.allocated += 1
+            self._refs[id(buf)] = [buf, 1]
+            return buf
+
+    def retain(self, buf: np.ndarray):
+        with self._lock:
+            ref = self._refs.get(id(buf))
+            if ref is not None:
+                ref[1] += 1
+
+    def release(self, buf: np.ndarray):
+        with self._lock:
+            ref = self._refs.get(id(buf))
+            if ref is None:
+                return
+            ref[1] -= 1
+            if ref[1] > 0:
+                return
+            del self._refs[id(buf)]
+            key = (buf.shape, buf.dtype.str)
+            free = self._free.setdefault(key, [])
+            if len(free) < self.max_free:
+                free.append(buf)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pool_allocated": self.allocated,
+                "pool_reused": self.reused,
+                "pool_in_use": len(self._refs),
+            }
+
+
+class FrameMailbox:
+    """
+    单槽“最新帧”信箱：采集线程 put 覆盖写入，消费者按序号主动拉取。
+    - seq 单调递增，消费者记住自己上次取到的 seq 即可判断是否有新帧
+    - 每帧附带采集时刻 t_ns（time.monotonic_ns），贯穿后续推理/事件/动作
+    - 每个消费者以 reader 名字取帧，分别记录是否读到；每个消费者错过（未读就被覆盖）的帧计入 missed[reader]。
+      未被 drop_reader（默认推理线程）读取就被覆盖的帧另计入 overwritten（即推理丢帧，预览先看到也不算；
+      推理线程还没开始取帧时也计入）
+    - 指定 pool 时：put 接管调用方的那一份引用，被覆盖的帧归还给 pool；
+      消费者取到的帧已 retain，用完须调用 release
+    """
+    def __init__(self, pool: FramePool = None, drop_reader: str = "infer"):
+        self.pool = pool
+        self.drop_reader = drop_reader
+        self._cond = threading.Condition()
+        self._frame = None
+        self._t_ns = 0
+        self._seq = 0
+        # 当前这一帧已被哪些消费者读取
+        self._read_by = set()
+        self._readers = set()
+
+        self.published = 0
+        self.overwritten = 0
+        self.missed = {}
+        self.reads = 0
+
+    def put(self, frame, t_ns: int = None):
+        if t_ns is None:
+            t_ns = time.monotonic_ns()
+        with self._cond:
+            old = self._frame
+            if old is not None:
+                read_by = self._read_by
+                if self.drop_reader not in read_by:
+                    self.overwritten += 1
+                for r in self._readers:
+                    if r not in read_by:
+                        self.missed[r] = self.missed.get(r, 0) + 1
+                read_by.clear()
+            self._frame = frame
+            self._t_ns = int(t_ns)
+            self._seq += 1
+            self.published += 1
+            self._cond.notify_all()
+        if old is not None and self.pool is not None:
+            self.pool.release(old)
+
+    def clear(self):
+        with self._cond:
+            old = self._frame
+            self._frame = None
+            self._read_by.clear()
+        if old is not None and self.pool is not None:
+            self.pool.release(old)
+
+    def release(self, frame):
+        """归还 get_latest/wait_latest 取到的帧（未指定 pool 时为空操作）。"""
+        if frame is not None and self.pool is not None:
+            self.pool.release(frame)
+
+    def get_latest(self, after_seq: int = 0, reader: str = "infer"):
+        """非阻塞：有比 after_seq 更新的帧则返回 (seq, frame, t_ns)，否则 None。"""
+        with self._cond:
+            return self._take(after_seq, reader)
+
+    def wait_latest(self, after_seq: int, timeout_s: float, reader: str = "infer"):
+        """阻塞至多 timeout_s 等待比 after_seq 更新的帧，返回 (seq, frame, t_ns) 或 None。"""
+        with self._cond:
+            if self._frame is None or self._seq <= after_seq:
+                self._cond.wait(timeout_s)
+            return self._take(after_seq, reader)
+
+    def _take(self, after_seq: int, reader: str):
+        self._readers.add(reader)
+        if self._frame is None or self._seq <= after_seq:
+            return None
+        self._read_by.add(reader)
+        self.reads += 1
+        if self.pool is not None:
+            self.pool.retain(self._frame)
+        return self._seq, self._frame, self._t_ns
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def stats(self) -> dict:
+        with self._cond:
+            pub = self.published
+            st = {
+                "cam_seq": self._seq,
+                "cam_published": pub,
+                "cam_overwritten": self.overwritten,
+                "cam_drop_rate": round(self.overwritten / pub, 3) if pub else 0.0,
+            }
+            for r, n in self.missed.items():
+                st[f"{r}_missed"] = n
+        if self.pool is not None:
+            st.update(self.pool.stats())
+        return st
@@ -0,0 +1,223 @@
+import os
+import glob
+import time
+import platform
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class FrameSource:
+    """
+    帧来源接口：open -> read(image=) 循环 -> release。
+    read 返回 (ok, frame, ts_ns)；传入 image 且尺寸一致时尽量写入该缓冲。
+    ts_ns 为该帧的媒体时间戳：相机为采集时刻（time.monotonic_ns），回放为相对首帧的时间（循环时继续累加），
+    与回放节奏（realtime）无关，快速回放时引擎看到的时间间隔与原始录制一致。
+    finished=True 表示回放结束（相机源永远为 False）。
+    """
+    name = "base"
+
+    def __init__(self, realtime: bool = True, loop: bool = False):
+        # realtime：按原始帧率/时间戳节奏输出；False 则尽可能快
+        self.realtime = bool(realtime)
+        self.loop = bool(loop)
+        self.finished = False
+        self._t0 = None
+
+    def open(self) -> bool:
+        return False
+
+    def read(self, image: Optional[np.ndarray] = None):
+        return False, None, 0
+
+    def release(self):
+        pass
+
+    def _pace(self, t_rel_s: float):
+        """回放节奏控制：t_rel_s 为该帧相对首帧的时间。"""
+        if not self.realtime:
+            return
+        now = time.perf_counter()
+        if self._t0 is None:
+            self._t0 = now - t_rel_s
+        wait = self._t0 + t_rel_s - now
+        if wait > 0:
+            time.sleep(wait)
+
+    @staticmethod
+    def _into(image: Optional[np.ndarray], frame: np.ndarray) -> np.ndarray:
+        if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+            np.copyto(image, frame)
+            return image
+        return frame
+
+
+class CameraSource(FrameSource):
+    name = "camera"
+
+    def __init__(self, index=0, width=640, height=480, fps=30):
+        super().__init__(realtime=True)
+        self.index = int(index)
+        self.width = int(width)
+        self.height = int(height)
+        self.fps = int(fps)
+        self.cap = None
+
+    def open(self) -> bool:
+        if platform.system() == "Windows":
+            self.cap = cv2.VideoCapture(self.index, cv2.CAP_DSHOW)
+        else:
+            self.cap = cv2.VideoCapture(self.index)
+        if not self.cap.isOpened():
+            return False
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+
+        # warm-up: 丢弃几帧让曝光/协商稳定
+        for _ in range(5):
+            ok, _f = self.cap.read()
+            if not ok:
+                break
+        return True
+
+    def read(self, image: Optional[np.ndarray] = None):
+        ok, frame = self.cap.read(image=image)
+        return ok, frame, time.monotonic_ns()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class VideoFileSource(FrameSource):
+    name = "video"
+
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False, fps: float = 0.0):
+        super().__init__(realtime=realtime, loop=loop)
+        self.path = path
+        self.fps = float(fps)
+        self.cap = None
+        self._idx = 0
+
+    def open(self) -> bool:
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            return False
+        if self.fps <= 0:
+            self.fps = float(self.cap.get(cv2.CAP_PROP_FPS) or 0.0) or 30.0
+        return True
+
+    def read(self, image: Optional[np.ndarray] = None):
+        ok, frame = self.cap.read(image=image)
+        if not ok and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read(image=image)
+        if not ok:
+            self.finished = True
+            return False, None, 0
+        t_rel = self._idx / self.fps
+        self._pace(t_rel)
+        self._idx += 1
+        return True, frame, int(round(t_rel * 1e9))
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class RecordingSource(FrameSource):
+    """
+    录制回放：
+    - 目录：按文件名排序的 png/jpg/bmp 图片序列，按 fps 节奏回放
+    - .npz：frames (N,H,W,3) uint8，可选 ts_ns (N,) 采集时间戳（按原始间隔回放）
+    """
+    name = "recording"
+
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False, fps: float = 30.0):
+        super().__init__(realtime=realtime, loop=loop)
+        self.path = path
+        self.fps = float(fps) if fps and fps > 0 else 30.0
+        self._files = []
+        self._frames = None
+        self._t_rel = None
+        self._idx = 0
+        self._loop_offset = 0.0
+
+    def open(self) -> bool:
+        if os.path.isdir(self.path):
+            files = []
+            for ext in ("*.png", "*.jpg", "*.jpeg", "*.bmp"):
+                files.extend(glob.glob(os.path.join(self.path, ext)))
+            self._files = sorted(files)
+            n = len(self._files)
+        elif self.path.lower().endswith(".npz") and os.path.exists(self.path):
+            data = np.load(self.path)
+            self._frames = data["frames"]
+            if "ts_ns" in data.files and len(data["ts_ns"]) == len(self._frames):
+                ts = data["ts_ns"].astype(np.int64)
+                self._t_rel = (ts - ts[0]) / 1e9
+            n = len(self._frames)
+        else:
+            return False
+        return n > 0
+
+    def __len__(self):
+        return len(self._files) if self._frames is None else len(self._frames)
+
+    def _duration(self) -> float:
+        n = len(self)
+        if self._t_rel is not None:
+            return float(self._t_rel[-1]) + 1.0 / self.fps
+        return n / self.fps
+
+    def read(self, image: Optional[np.ndarray] = None):
+        if self._idx >= len(self):
+            if not self.loop:
+                self.finished = True
+                return False, None, 0
+            self._idx = 0
+            self._loop_offset += self._duration()
+
+        i = self._idx
+        if self._frames is not None:
+            stored = self._frames[i]
+            frame = self._into(image, stored)
+            if frame is stored:
+                # 不交出内部数组：调用方会把它当 image= 缓冲传回来写入，循环回放会被改写
+                frame = stored.copy()
+        else:
+            img = cv2.imread(self._files[i], cv2.IMREAD_COLOR)
+            if img is None:
+                self._idx += 1
+                return False, None, 0
+            frame = self._into(image, img)
+
+        t_rel = float(self._t_rel[i]) if self._t_rel is not None else i / self.fps
+        t_rel += self._loop_offset
+        self._pace(t_rel)
+        self._idx += 1
+        return True, frame, int(round(t_rel * 1e9))
+
+
+def make_frame_source(general: dict) -> FrameSource:
+    """按 general 配置选择帧来源：camera / video / recording。"""
+    kind = str(general.get("frame_source", "camera")).lower()
+    path = str(general.get("frame_source_path", "") or "")
+    realtime = bool(general.get("frame_source_realtime", True))
+    loop = bool(general.get("frame_source_loop", True))
+    fps = float(general.get("camera_fps", 30))
+
+    if kind == "video" and path:
+        return VideoFileSource(path, realtime=realtime, loop=loop)
+    if kind == "recording" and path:
+        return RecordingSource(path, realtime=realtime, loop=loop, fps=fps)
+    return CameraSource(
+        index=int(general.get("camera_index", 0)),
+        width=int(general.get("camera_width", 640)),
+        height=int(general.get("camera_height", 480)),
+        fps=int(fps),
+    )
@@ -3,10 +3,11 @@ import numpy as np
 
 from vision.dynamic_track import TrackWindow
 from vision.scroll_state import PinchScrollState
+from vision.engine_config import EngineConfig
+from vision.custom_gestures import CustomGestureSpotter
 from vision.gesture_primitives import (
     classify_static,
-    pinch_ratio,
-    close_ratio,
+    HandFeatures,
     TIP
 )
 
@@ -16,8 +17,11 @@ class GestureEngine:
     - 不改变你原有判定逻辑
     - 额外返回 debug dict（包含关键数值与 blocked_reason）
     """
-    def __init__(self, cfg: dict):
+    def __init__(self, cfg: dict, custom_mgr=None):
         self.cfg = cfg
+        # 配置快照：配置变化时由 reload_config 整体替换；每帧开始时取一次引用（_conf）
+        self.conf = EngineConfig.from_cfg(cfg)
+        self._conf = self.conf
         self._stable_last = None
         self._stable_count = 0
         self._cool = {}
@@ -39,13 +43,28 @@ class GestureEngine:
         self._last_swipe_dir = None  # "left"/"right"/"up"/"down" 或 None
         self._swipe_protect_until_ms = 0  # 保护期结束时间
 
+        # 当前帧的采集时刻（monotonic 毫秒）；所有时间判定以帧时间为准
+        self._frame_ms = None
+
+        # 自定义动态手势：逐帧喂入食指尖，流式检出（未提供 custom_mgr 时关闭）
+        self.custom = CustomGestureSpotter(custom_mgr, mode="bare") if custom_mgr is not None else None
+        self.last_custom = None
+
+    def reload_config(self):
+        """cfg 被修改后调用：重建快照并原子替换（下一帧生效）。"""
+        self.conf = EngineConfig.from_cfg(self.cfg)
+        if self.custom is not None:
+            self.custom.configure(self.cfg)
+
     def _now_ms(self):
-        return time.time() * 1000
+        if self._frame_ms is not None:
+            return self._frame_ms
+        return time.monotonic_ns() / 1e6
 
     def _cooldown_ok(self, key: str, cd_ms: int):
         now = self._now_ms()
-        last = self._cool.get(key, 0)
-        if now - last >= cd_ms:
+        last = self._cool.get(key)
+        if last is None or now - last >= cd_ms:
             self._cool[key] = now
             return True
         return False
@@ -59,37 +78,26 @@ class GestureEngine:
         return gid if gid and self._stable_count >= need else None
 
     def _gesture_item(self, gid: str):
-        for it in self.cfg.get("gesture_catalog", []):
-            if it.get("id") == gid:
-                return it
-        return None
+        return self._conf.gestures.get(gid)
 
     def _param(self, gid: str, key: str, default):
         it = self._gesture_item(gid)
         if it:
-            return it.get("params", {}).get(key, default)
+            return it.param(key, default)
         return default
 
     def _enable_when_ok(self, gid: str, state) -> bool:
         it = self._gesture_item(gid)
-        cond = (it or {}).get("enable_when", {}) or {}
-        for k, v in cond.items():
-            if hasattr(state, k) and bool(getattr(state, k)) != bool(v):
-                return False
-        return True
+        return it.enabled(state) if it else True
 
     def _mouse_mode_gesture_id(self) -> str:
-        for it in self.cfg.get("gesture_catalog", []):
-            if it.get("default_use") == "mouse_move_mode":
-                return it.get("id")
-        return "V_SIGN"
+        return self._conf.mouse_mode_gid
 
     def _avg_speed_px_per_s(self) -> float:
-        pts = self.track.pts
-        if len(pts) < 6:
+        if len(self.track) < 6:
             return 0.0
-        t0, x0, y0 = pts[0]
-        t1, x1, y1 = pts[-1]
+        t0, x0, y0 = self.track.first()
+        t1, x1, y1 = self.track.last()
         dt = (t1 - t0) / 1000.0
         if dt <= 1e-6:
             return 0.0
@@ -105,11 +113,11 @@ class GestureEngine:
         返回：(gid, raw_static, None, debug) 或 None
         """
         now = self._now_ms()
-        g = self.cfg["general"]
+        c = self._conf
         
         # 配置参数
-        dir_consistency_thr = float(g.get("swipe_dir_consistency", 0.70))  # 方向一致性阈值
-        reverse_protect_ms = int(g.get("swipe_reverse_protect_ms", 350))   # 反向保护时长
+        dir_consistency_thr = c.swipe_dir_consistency  # 方向一致性阈值
+        reverse_protect_ms = c.swipe_reverse_protect_ms   # 反向保护时长
         
         # 判断主轴
         is_horizontal = abs(dx) > abs(dy)
@@ -162,19 +170,47 @@ class GestureEngine:
         return gid, raw_static, None, debug
 
 
-    def update_bare(self, lm: np.ndarray, state):
-        g = self.cfg["general"]
-        self.track.set_window(int(g.get("dynamic_window_ms", 450)))
+    def update_bare(self, lm: np.ndarray, state, t_ms: float = None):
+        """t_ms：该帧采集时刻（monotonic 毫秒），用于轨迹/速度/冷却；缺省取当前时刻。"""
+        event, raw_static, scroll, debug = self._update_bare(lm, state, t_ms)
+        if self.custom is None:
+            return event, raw_static, scroll, debug
 
-        pinch_thr = float(g.get("pinch_threshold_ratio", 0.33))
-        close_thr = float(g.get("two_finger_close_ratio", 0.22))
-        stable_frames = int(g.get("stable_frames", 2))
-        cooldown_ms = int(g.get("cooldown_ms", 450))
-        swipe_thresh = float(g.get("swipe_thresh_px", 80))
+        if lm is None:
+            self.custom.reset()
+            return event, raw_static, scroll, debug
+
+        m = self.custom.push(lm[TIP["index"]][0], lm[TIP["index"]][1], self._now_ms())
+        if self.custom.last_best is not None:
+            debug["custom_best"] = "%s:%.3f" % (self.custom.last_best[0], self.custom.last_best[1])
+        # 自定义手势只在本帧没有其它事件/滚动时发出
+        if event is not None or scroll is not None:
+            self.custom.suppress()
+            return event, raw_static, scroll, debug
+        if m is None or not state.recognition_enabled or not self._enable_when_ok(m.gid, state):
+            return event, raw_static, scroll, debug
+
+        self.last_custom = m
+        debug["event"] = m.gid
+        debug["custom_dist"] = round(m.dist, 3)
+        debug["custom_span_ms"] = round(m.t_end_ms - m.t_start_ms, 1)
+        debug["blocked_reason"] = ""
+        return m.gid, raw_static, scroll, debug
 
-        click_guard_move_px = float(g.get("click_guard_move_px", 35))
-        click_hold_frames = int(g.get("click_hold_frames", 2))
-        click_max_speed = float(g.get("click_max_speed_px_per_s", 650))
+    def _update_bare(self, lm: np.ndarray, state, t_ms: float = None):
+        self._frame_ms = t_ms
+        c = self._conf = self.conf
+        self.track.set_window(c.dynamic_window_ms)
+
+        pinch_thr = c.pinch_thr
+        close_thr = c.close_thr
+        stable_frames = c.stable_frames
+        cooldown_ms = c.cooldown_ms
+        swipe_thresh = c.swipe_thresh
+
+        click_guard_move_px = c.click_guard_move_px
+        click_hold_frames = c.click_hold_frames
+        click_max_speed = c.click_max_speed
 
         debug = {
             "note": "engine_debug",
@@ -206,10 +242,11 @@ class GestureEngine:
             return None, None, None, debug
 
         # track update
-        self.track.add(lm[TIP["index"]][0], lm[TIP["index"]][1])
+        self.track.add(lm[TIP["index"]][0], lm[TIP["index"]][1], self._now_ms())
 
-        rules_cfg = self.cfg.get("general", {}).get("finger_rules", {})
-        raw_static = classify_static(lm, pinch_thr, close_thr, rules_cfg=rules_cfg)
+        # 本帧几何特征只算一次，静态分类与捏合/并拢比例共用
+        feats = HandFeatures(lm, c.finger_rules)
+        raw_static = classify_static(lm, pinch_thr, close_thr, feats=feats)
         confirmed_static = self._stable_confirm(raw_static, stable_frames)
 
         mm_gid = self._mouse_mode_gesture_id()
@@ -237,9 +274,9 @@ class GestureEngine:
         slow_enough = (speed <= click_max_speed)
 
         # pinch/close ratios
-        pr_index = float(pinch_ratio(lm, TIP["thumb"], TIP["index"]))
-        pr_middle = float(pinch_ratio(lm, TIP["thumb"], TIP["middle"]))
-        cr_im = float(close_ratio(lm, TIP["index"], TIP["middle"]))
+        pr_index = feats.ratio(TIP["thumb"], TIP["index"])
+        pr_middle = feats.ratio(TIP["thumb"], TIP["middle"])
+        cr_im = feats.ratio(TIP["index"], TIP["middle"])
 
         is_pinch_index = pr_index < pinch_thr
         is_pinch_middle = pr_middle < pinch_thr
@@ -284,9 +321,9 @@ class GestureEngine:
                         self.scroll.start(x, y)
                     dxs, dys = self.scroll.delta(x, y)
 
-                    scroll_gain = float(g.get("scroll_gain", 1.6))
-                    dead = float(g.get("scroll_deadzone_px", 6))
-                    max_step = float(g.get("scroll_max_step", 120))
+                    scroll_gain = c.scroll_gain
+                    dead = c.scroll_deadzone_px
+                    max_step = c.scroll_max_step
 
                     sv = 0
                     sh = 0
@@ -401,12 +438,15 @@ class GestureEngine:
             debug["blocked_reason"] = "no_event_matched"
         return None, raw_static, None, debug
 
-    def update_glove(self, feats, state):
+    def update_glove(self, feats, state, t_ms: float = None):
         # 同样返回 debug
-        g = self.cfg["general"]
-        self.track.set_window(int(g.get("dynamic_window_ms", 450)))
-        cooldown_ms = int(g.get("cooldown_ms", 450))
-        swipe_thresh = float(g.get("swipe_thresh_px", 80))
+        self._frame_ms = t_ms
+        if self.custom is not None:
+            self.custom.reset()
+        c = self._conf = self.conf
+        self.track.set_window(c.dynamic_window_ms)
+        cooldown_ms = c.cooldown_ms
+        swipe_thresh = c.swipe_thresh
 
         debug = {
             "note": "glove_debug",
@@ -421,7 +461,7 @@ class GestureEngine:
             return None, None, None, debug
 
         cx, cy = feats.center
-        self.track.add(cx, cy)
+        self.track.add(cx, cy, self._now_ms())
         state.mouse_move_mode = (len(feats.fingertips) >= 2)
 
         if not state.recognition_enabled:
@@ -452,6 +492,19 @@ class GestureEngine:
                     return gid, "GLOVE_TRACKING", None, debug
                 debug["blocked_reason"] = "cooldown_swipe"
 
+        # 指尖数静态手势：目录中存在 GLOVE_FINGERS_<n> 时才会触发
+        fingers_gid = "GLOVE_FINGERS_%d" % len(feats.fingertips)
+        spec = c.gesture(fingers_gid)
+        need = spec.stable_frames if spec is not None and spec.stable_frames is not None else c.stable_frames
+        confirmed = self._stable_confirm(fingers_gid, need)
+        debug["fingers_confirmed"] = confirmed
+        if confirmed and spec is not None and spec.enabled(state):
+            if self._cooldown_ok(confirmed, c.gesture_cooldown(confirmed)):
+                debug["event"] = confirmed
+                debug["blocked_reason"] = ""
+                return confirmed, "GLOVE_TRACKING", None, debug
+            debug["blocked_reason"] = "cooldown_static:%s" % confirmed
+
         if not debug["blocked_reason"]:
             debug["blocked_reason"] = "no_event_matched"
         return None, "GLOVE_TRACKING", None, debug
\ No newline at end of file
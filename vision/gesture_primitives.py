@@ -43,70 +43,104 @@ def _default_rules():
         "others_fold_len_thr": 0.45
     }
 
+FINGERS = ("thumb", "index", "middle", "ring", "pinky")
+_TIP_IDX = np.array([TIP[k] for k in FINGERS])
+_MCP_IDX = np.array([MCP[k] for k in FINGERS])
+# 拇指没有 PIP 规则（y 回退只用于四指），占位用 MCP
+_PIP_IDX = np.array([MCP["thumb"]] + [PIP[k] for k in FINGERS[1:]])
+_TIP_POS = {TIP[k]: i for i, k in enumerate(FINGERS)}
+
+
+class FingerRules:
+    """finger_rules 合并默认值后的紧凑形式（阈值按 FINGERS 顺序排成数组）。"""
+    __slots__ = ("use_direction", "single_finger_enhance", "others_fold_len_thr", "len_thr", "cos_thr")
+
+    def __init__(self, rules_cfg=None):
+        rules = _default_rules()
+        if isinstance(rules_cfg, dict):
+            # 浅合并
+            rules.update({k: v for k, v in rules_cfg.items() if k in rules})
+        d = _default_rules()
+        self.use_direction = bool(rules.get("use_direction", True))
+        self.single_finger_enhance = bool(rules.get("single_finger_enhance", True))
+        self.others_fold_len_thr = float(rules.get("others_fold_len_thr", 0.45))
+        self.len_thr = np.array([float((rules.get(k) or {}).get("len_thr", d[k]["len_thr"])) for k in FINGERS])
+        self.cos_thr = np.array([float((rules.get(k) or {}).get("cos_thr", d[k]["cos_thr"])) for k in FINGERS])
+
+
+class HandFeatures:
+    """
+    一帧 landmarks 的全部几何特征，一次向量化计算，供所有判定复用：
+    - len_ratio[5]：|tip-mcp| / palm_w
+    - cos[5]：(tip-mcp) 与 (tip-palm_center) 的方向余弦（向量过短为 -1）
+    - tip_ratio[5,5]：指尖两两距离 / palm_w
+    - ext[5]：按 rules 判定的伸展标志（thumb, index, middle, ring, pinky）
+    """
+    __slots__ = ("lm", "rules", "palm_w", "center", "len_ratio", "cos", "tip_ratio", "ext")
+
+    def __init__(self, lm, rules: FingerRules = None):
+        rules = rules or FingerRules()
+        self.lm = lm
+        self.rules = rules
+        self.palm_w = float(np.hypot(*(lm[MCP["index"]] - lm[MCP["pinky"]]))) + 1e-6
+        self.center = (lm[MCP["index"]] + lm[MCP["pinky"]] + lm[0]) / 3.0
+
+        tips = lm[_TIP_IDX]
+        v = tips - lm[_MCP_IDX]
+        u = tips - self.center
+        nv = np.sqrt((v * v).sum(axis=1))
+        nu = np.sqrt((u * u).sum(axis=1))
+        self.len_ratio = nv / self.palm_w
+        ok = (nv >= 1e-6) & (nu >= 1e-6)
+        self.cos = np.where(ok, (v * u).sum(axis=1) / np.where(ok, nv * nu, 1.0), -1.0)
+
+        d = tips[:, None, :] - tips[None, :, :]
+        self.tip_ratio = np.sqrt((d * d).sum(axis=2)) / self.palm_w
+
+        if rules.use_direction:
+            ext = (self.len_ratio > rules.len_thr) & (self.cos >= rules.cos_thr)
+        else:
+            # 回退：y 规则
+            ext = tips[:, 1] < lm[_PIP_IDX][:, 1]
+        # 拇指：长度 + 方向（方向阈值较低，严格大于）
+        ext[0] = (self.len_ratio[0] > rules.len_thr[0]) and (self.cos[0] > rules.cos_thr[0])
+        self.ext = ext
+
+    def ratio(self, tip_a: int, tip_b: int) -> float:
+        """两个指尖（landmark 下标）距离 / palm_w。"""
+        return float(self.tip_ratio[_TIP_POS[tip_a], _TIP_POS[tip_b]])
+
+
+
 def finger_states(lm, rules_cfg=None):
     """
     返回：thumb_ext, ext_index, ext_middle, ext_ring, ext_pinky, len_ratios(dict)
     len_ratios：每指 |tip-mcp| / palm_w，用于单指增强
     """
-    rules = _default_rules()
-    if isinstance(rules_cfg, dict):
-        # 浅合并
-        rules.update({k: v for k, v in rules_cfg.items() if k in rules})
+    f = HandFeatures(lm, FingerRules(rules_cfg))
+    len_ratio = {k: float(f.len_ratio[i]) for i, k in enumerate(FINGERS)}
+    e = [bool(x) for x in f.ext]
+    return e[0], e[1], e[2], e[3], e[4], len_ratio
 
-    pw = palm_width(lm)
-    c = palm_center(lm)
-
-    # 每指长度比
-    len_ratio = {
-        "thumb": dist(lm[TIP["thumb"]], lm[MCP["thumb"]]) / pw,
-        "index": dist(lm[TIP["index"]], lm[MCP["index"]]) / pw,
-        "middle": dist(lm[TIP["middle"]], lm[MCP["middle"]]) / pw,
-        "ring": dist(lm[TIP["ring"]], lm[MCP["ring"]]) / pw,
-        "pinky": dist(lm[TIP["pinky"]], lm[MCP["pinky"]]) / pw,
-    }
-
-    use_dir = bool(rules.get("use_direction", True))
-
-    if use_dir:
-        ext_index = is_finger_extended_dir(lm, MCP["index"], TIP["index"], c, pw,
-                                           rules["index"]["len_thr"], rules["index"]["cos_thr"])
-        ext_middle = is_finger_extended_dir(lm, MCP["middle"], TIP["middle"], c, pw,
-                                            rules["middle"]["len_thr"], rules["middle"]["cos_thr"])
-        ext_ring = is_finger_extended_dir(lm, MCP["ring"], TIP["ring"], c, pw,
-                                          rules["ring"]["len_thr"], rules["ring"]["cos_thr"])
-        ext_pinky = is_finger_extended_dir(lm, MCP["pinky"], TIP["pinky"], c, pw,
-                                           rules["pinky"]["len_thr"], rules["pinky"]["cos_thr"])
-    else:
-        # 回退：y 规则
-        ext_index = is_extended_y(lm, TIP["index"], PIP["index"])
-        ext_middle = is_extended_y(lm, TIP["middle"], PIP["middle"])
-        ext_ring = is_extended_y(lm, TIP["ring"], PIP["ring"])
-        ext_pinky = is_extended_y(lm, TIP["pinky"], PIP["pinky"])
-
-    # 拇指：长度 + 方向（方向阈值较低）
-    thumb_len_thr = float(rules["thumb"]["len_thr"])
-    thumb_cos_thr = float(rules["thumb"]["cos_thr"])
-    thumb_dir = cos_sim(lm[TIP["thumb"]] - lm[MCP["thumb"]], lm[TIP["thumb"]] - c)
-    thumb_ext = (len_ratio["thumb"] > thumb_len_thr) and (thumb_dir > thumb_cos_thr)
-
-    return thumb_ext, ext_index, ext_middle, ext_ring, ext_pinky, len_ratio
-
-def classify_static(lm, pinch_thr_ratio=0.33, close_thr_ratio=0.22, rules_cfg=None):
+def classify_static(lm, pinch_thr_ratio=0.33, close_thr_ratio=0.22, rules_cfg=None, feats: HandFeatures = None):
     """
     返回静态手势ID或 None
+    feats：已计算好的 HandFeatures（engine 每帧算一次后传入）；为 None 时按 rules_cfg 现算
     """
     if lm is None:
         return None
 
-    thumb_ext, ext_index, ext_middle, ext_ring, ext_pinky, len_ratio = finger_states(lm, rules_cfg=rules_cfg)
-    n_other = sum([ext_index, ext_middle, ext_ring, ext_pinky])
+    f = feats if feats is not None else HandFeatures(lm, FingerRules(rules_cfg))
+    thumb_ext, ext_index, ext_middle, ext_ring, ext_pinky = (bool(x) for x in f.ext)
+    len_ratio = f.len_ratio
+    n_other = ext_index + ext_middle + ext_ring + ext_pinky
 
     # OPEN_PALM (严格化：5指伸展 + 手掌朝上)
     # 目的：作为隐式中立手势，普通张手不触发
     if n_other == 4 and thumb_ext:
         # 方向判定：手掌中心(c)应该在食指指尖(lm[8])的下方 (y坐标更大)
         # 且保证拇指充分伸展（len_ratio > 0.65，默认0.5可能太松）
-        c = palm_center(lm)
+        c = f.center
         if lm[TIP["index"]][1] < c[1]:
             # 可选：进一步检查其他指尖是否也在掌心上方
             if lm[TIP["pinky"]][1] < c[1]:
@@ -117,18 +151,16 @@ def classify_static(lm, pinch_thr_ratio=0.33, close_thr_ratio=0.22, rules_cfg=No
         return "FIST"
 
     # 单指增强：要求其它指明确收拢
-    rules = _default_rules()
-    if isinstance(rules_cfg, dict):
-        rules.update({k: v for k, v in rules_cfg.items() if k in rules})
-    enhance = bool(rules.get("single_finger_enhance", True))
-    others_fold_thr = float(rules.get("others_fold_len_thr", 0.45))
+    rules = f.rules
+    enhance = rules.single_finger_enhance
+    others_fold_thr = rules.others_fold_len_thr
 
     def others_fold(exclude: set) -> bool:
         # exclude: {"thumb"} / {"index"} / etc
-        for k in ["thumb", "index", "middle", "ring", "pinky"]:
+        for i, k in enumerate(FINGERS):
             if k in exclude:
                 continue
-            if len_ratio[k] >= others_fold_thr:
+            if len_ratio[i] >= others_fold_thr:
                 return False
         return True
 
@@ -152,9 +184,8 @@ def classify_static(lm, pinch_thr_ratio=0.33, close_thr_ratio=0.22, rules_cfg=No
             return "THUMB_PINKY"
 
     # OK_SIGN（thumb_tip 与 index_tip 接近 + 其它至少两指伸出）
-    pw = palm_width(lm)
-    pinch = dist(lm[TIP["thumb"]], lm[TIP["index"]]) / pw
-    if pinch < pinch_thr_ratio and sum([ext_middle, ext_ring, ext_pinky]) >= 2:
+    pinch = f.ratio(TIP["thumb"], TIP["index"])
+    if pinch < pinch_thr_ratio and (ext_middle + ext_ring + ext_pinky) >= 2:
         return "OK_SIGN"
 
     return None
@@ -1,53 +1,657 @@
+import time
+
 import cv2
 import numpy as np
 
 class GloveFeatures:
-    def __init__(self, mask=None, contour=None, center=None, fingertips=None, roi=None, roi_offset=(0,0)):
+    def __init__(self, mask=None, contour=None, center=None, fingertips=None, roi=None, roi_offset=(0,0),
+                 mask_offset=(0,0), full_search=True, fingertip_scores=None, fingertip_dirs=None, box=None,
+                 track_conf=None):
         self.mask = mask
         self.contour = contour
         self.center = center
         self.fingertips = fingertips or []
+        # 与 fingertips 一一对应：指缝深度得分（相对手掌尺寸）与 中心→指尖 的单位方向
+        self.fingertip_scores = fingertip_scores or []
+        self.fingertip_dirs = fingertip_dirs or []
         self.roi = roi
         self.roi_offset = roi_offset  # (x0,y0) of roi in full frame
+        self.mask_offset = mask_offset  # (x0,y0) of mask in full frame（ROI 跟踪时 mask 只覆盖搜索窗口）
+        self.full_search = full_search  # 本帧是否做了全帧搜索
+        self.box = box                  # CamShift 模式：带方向的框 ((cx,cy),(w,h),angle)
+        self.track_conf = track_conf    # CamShift 模式：跟踪置信度（窗口内平均反投影 / 255）
+
+LUT_BITS = 5                    # 每通道量化位数：32×32×32 个 BGR 色块
+LUT_BINS = 1 << LUT_BITS
+_LUT_RANGES = [0, 256, 0, 256, 0, 256]
+
+
+def _lut_centers_bgr() -> np.ndarray:
+    """全部量化色块中心的 BGR 值，(32768,1,3) uint8，顺序与 LUT 展平下标一致（b,g,r）。"""
+    q = (np.arange(LUT_BINS) << (8 - LUT_BITS)) + (1 << (7 - LUT_BITS))
+    b, g, r = np.meshgrid(q, q, q, indexing="ij")
+    return np.stack([b, g, r], axis=-1).reshape(-1, 1, 3).astype(np.uint8)
+
+
+def color_bin_index(bgr: np.ndarray) -> np.ndarray:
+    """BGR 像素 (...,3) uint8 → LUT 展平下标。"""
+    q = (bgr >> (8 - LUT_BITS)).astype(np.int32)
+    return (q[..., 0] << (2 * LUT_BITS)) | (q[..., 1] << LUT_BITS) | q[..., 2]
+
+
+def build_color_lut(hsv_lower, hsv_upper, color_bins=None) -> np.ndarray:
+    """
+    量化 BGR → {0,255} 查找表 (32,32,32) float32。
+    color_bins（校准学到的展平下标列表）非空时直接使用，可表示非盒状颜色区域；
+    否则按色块中心的 HSV 是否落在 [hsv_lower, hsv_upper] 内生成。
+    """
+    if color_bins:
+        lut = np.zeros(LUT_BINS ** 3, dtype=np.float32)
+        idx = np.asarray(color_bins, dtype=np.int64)
+        lut[idx[(idx >= 0) & (idx < lut.size)]] = 255.0
+    else:
+        hsv = cv2.cvtColor(_lut_centers_bgr(), cv2.COLOR_BGR2HSV)
+        lut = cv2.inRange(hsv, np.asarray(hsv_lower, dtype=np.uint8),
+                          np.asarray(hsv_upper, dtype=np.uint8)).astype(np.float32)
+    return lut.reshape(LUT_BINS, LUT_BINS, LUT_BINS)
+
+
+def learn_color_bins(bgr_pixels: np.ndarray, min_frac: float = 0.0005, grow: int = 1) -> list:
+    """
+    由校准采到的手套像素 (N,3) BGR 学习颜色区域：出现次数足够多的量化色块，
+    再在色块空间里向邻域扩 grow 格（容忍光照小变化）。返回升序的展平下标列表。
+    """
+    idx = color_bin_index(np.asarray(bgr_pixels, dtype=np.uint8).reshape(-1, 3))
+    if idx.size == 0:
+        return []
+    counts = np.bincount(idx, minlength=LUT_BINS ** 3)
+    vol = (counts >= max(3, int(min_frac * idx.size))).reshape(LUT_BINS, LUT_BINS, LUT_BINS)
+    for _ in range(int(grow)):
+        for ax in range(3):
+            src = vol.copy()
+            lo = [slice(None)] * 3
+            hi = [slice(None)] * 3
+            lo[ax] = slice(0, -1)
+            hi[ax] = slice(1, None)
+            vol[tuple(lo)] |= src[tuple(hi)]
+            vol[tuple(hi)] |= src[tuple(lo)]
+    return np.flatnonzero(vol).tolist()
+
+
+def _wrap_lut(lut: np.ndarray):
+    """calcBackProject 需要真正的 3 维 Mat；旧版 cv2 没有 cv2.Mat 时返回 None 走 NumPy 查表。"""
+    try:
+        return cv2.Mat(lut, wrap_channels=False)
+    except (AttributeError, TypeError):
+        return None
+
+
+def find_fingertips(cnt: np.ndarray, center, depth_ratio: float = 0.15, max_angle_deg: float = 80.0, area=None):
+    """
+    由凸包缺陷（指缝）找指尖，与手的朝向无关。
+    有效指缝：深度 > depth_ratio × 等效半径，且指缝处两侧夹角 < max_angle_deg；
+    其两端的凸包点为指尖候选，得分为指缝深度 / 等效半径，离中心不够远（不超过指缝到中心距离的 1.3 倍）的剔除，
+    再按得分做向量化的两两距离抑制。没有有效指缝时，最远凸包点足够远则视为单指。
+    返回 (tips [(x,y)], scores [float], dirs [(dx,dy)])，按得分降序、最多 5 个。
+    """
+    if center is None or cnt is None or len(cnt) < 5:
+        return [], [], []
+    if area is None:
+        area = cv2.contourArea(cnt)
+    r_eq = (area / np.pi) ** 0.5 + 1e-6
+    pts = cnt.reshape(-1, 2)
+    c = np.asarray(center, dtype=np.float32)
+
+    hull_idx = cv2.convexHull(cnt, returnPoints=False)
+    cand = None
+    try:
+        defects = cv2.convexityDefects(cnt, hull_idx) if len(hull_idx) > 3 else None
+    except cv2.error:
+        # 自相交等退化轮廓
+        defects = None
+
+    if defects is not None:
+        d = defects.reshape(-1, 4)
+        d = d[d[:, 3] > depth_ratio * r_eq * 256.0]          # 深度为 8 位定点
+        if len(d):
+            sef = pts[d[:, :3]].astype(np.float32)            # (m,3,2)：起点/终点/指缝
+            v = sef[:, :2] - sef[:, 2:3]
+            n = np.sqrt((v * v).sum(axis=2))
+            cosang = (v[:, 0] * v[:, 1]).sum(axis=1) / (n[:, 0] * n[:, 1] + 1e-6)
+            ok = cosang > np.cos(np.radians(max_angle_deg))
+            if ok.any():
+                sef = sef[ok]
+                palm_r = float(np.median(np.sqrt(((sef[:, 2] - c) ** 2).sum(axis=1))))
+                cand = sef[:, :2].reshape(-1, 2)
+                score = np.repeat(d[ok, 3].astype(np.float32) / (256.0 * r_eq), 2)
+                dist = np.sqrt(((cand - c) ** 2).sum(axis=1))
+                far = dist > 1.3 * palm_r
+                cand, score, dist = cand[far], score[far], dist[far]
+                if not len(cand):
+                    cand = None
+
+    if cand is None:
+        hull = pts[hull_idx.reshape(-1)].astype(np.float32)
+        dist = np.sqrt(((hull - c) ** 2).sum(axis=1))
+        i = int(np.argmax(dist))
+        if dist[i] <= 1.6 * r_eq:
+            return [], [], []
+        cand = hull[i:i + 1]
+        dist = dist[i:i + 1]
+        score = (dist - r_eq) / r_eq
+
+    # 两两距离抑制：同一指尖常同时是相邻两条指缝的端点
+    if len(cand) > 1:
+        order = np.argsort(-(score + 1e-4 * dist))
+        cand, score, dist = cand[order], score[order], dist[order]
+        diff = cand[:, None, :] - cand[None, :, :]
+        close = (diff * diff).sum(axis=2) < max(8.0, 0.3 * r_eq) ** 2
+        keep = np.ones(len(cand), dtype=bool)
+        for i in range(len(cand)):
+            if keep[i]:
+                keep[i + 1:] &= ~close[i, i + 1:]
+        cand, score, dist = cand[keep][:5], score[keep][:5], dist[keep][:5]
+
+    dirs = (cand - c) / (dist[:, None] + 1e-6)
+    tips = [(int(x), int(y)) for x, y in cand.tolist()]
+    return tips, score.tolist(), [tuple(v) for v in dirs.tolist()]
+
+
+HS_BINS = (30, 32)              # 色调 × 饱和度
+_HS_RANGES = [0, 180, 0, 256]
+
+
+def _smooth_hs_hist(hist: np.ndarray) -> np.ndarray:
+    """3×3 平滑后峰值归一到 255：样本有限 + 暗部噪声会让色调/饱和度散到相邻格，不平滑时边缘像素大量漏检。"""
+    hist = cv2.GaussianBlur(hist, (3, 3), 0)
+    cv2.normalize(hist, hist, 0, 255, cv2.NORM_MINMAX)
+    return hist
+
+
+def learn_hs_hist(bgr_pixels: np.ndarray, bins=HS_BINS) -> np.ndarray:
+    """手套像素 (N,3) BGR → 色调-饱和度直方图 (30,32) float32，峰值归一到 255（供反投影分割）。"""
+    px = np.asarray(bgr_pixels, dtype=np.uint8).reshape(-1, 1, 3)
+    if not px.shape[0]:
+        return np.zeros(bins, dtype=np.float32)
+    hsv = cv2.cvtColor(px, cv2.COLOR_BGR2HSV)
+    return _smooth_hs_hist(cv2.calcHist([hsv], [0, 1], None, list(bins), _HS_RANGES))
+
+
+# HSV 自适应常量：第 0 行对应下界、第 1 行对应上界
+_ADAPT_RELAX = np.array([[-5, -40, -40], [5, 40, 40]], dtype=np.float32)    # 取样用的放宽阈值盒
+_ADAPT_MARGIN = np.array([[-5, -30, -30], [5, 30, 30]], dtype=np.float32)   # 分位数外加的余量（与校准相同）
+_ADAPT_OUT_IN = (np.array([[1.0], [0.25]], dtype=np.float32),                # 相对基线可下移的比例
+                 np.array([[0.25], [1.0]], dtype=np.float32))                # 相对基线可上移的比例
+_HSV_TOP = np.array([179, 255, 255], dtype=np.float32)
+
 
 class SegmenterBase:
-    """方案C预留：轻量分割模型接口（stub）。"""
+    """ROI 精细分割接口：segment 返回与 ROI 同尺寸的 0/255 mask，或 None（不精修，沿用颜色阈值轮廓）。"""
+    def __init__(self):
+        self.stats = {}
+
     def segment(self, bgr_roi: np.ndarray):
         return None  # return binary mask or None
 
+    def learn_due(self) -> bool:
+        """本帧是否需要 observe（跟踪器据此决定要不要画轮廓 mask）。"""
+        return False
+
+    def observe(self, bgr_roi: np.ndarray, mask_roi: np.ndarray):
+        """在线学习钩子：颜色阈值轮廓可信时传入 ROI 及其中手套的 0/255 mask。"""
+        pass
+
+
+class HistBackprojSegmenter(SegmenterBase):
+    """
+    色调-饱和度直方图反投影分割（纯 CPU）。
+    直方图来自校准（glove.hs_hist），没有时用第一次 observe 的手套像素；之后每 learn_every 次可信跟踪
+    按 learn_rate 混入 ROI 内手套像素的分布（只从颜色阈值轮廓学习，不从自己的输出学习）。
+    ROI 先按 scale 缩小，反投影 + 阈值 + 开运算后最近邻放大回 ROI 尺寸。
+    时间预算：按每像素耗时的 EMA 预测本次耗时，超过 budget_ms 就进一步缩小，缩到 min_scale 仍超则跳过本帧。
+    """
+    def __init__(self, hist=None, scale=0.5, thresh=30, budget_ms=2.0, learn_rate=0.05, learn_every=5,
+                 min_scale=0.2):
+        super().__init__()
+        self.scale = float(scale)
+        self.thresh = int(thresh)
+        self.budget_ms = float(budget_ms)
+        self.learn_rate = float(learn_rate)
+        self.learn_every = max(1, int(learn_every))
+        self.min_scale = float(min_scale)
+        self.hist = None
+        self._hist_src = None
+        self._ns_per_px = 0.0     # 每个缩小后像素的耗时（EMA）
+        self._since_learn = 0
+        self.set_hist(hist)
+        self.stats = {"calls": 0, "refined": 0, "skipped": 0, "over_budget": 0, "learned": 0,
+                      "last_ms": 0.0, "avg_ms": 0.0, "max_ms": 0.0, "scale": self.scale}
+
+    def set_hist(self, hist):
+        """设置校准直方图；传入同一个对象（cfg 未重新校准）时保留在线学到的直方图。"""
+        if hist is self._hist_src and self.hist is not None:
+            return
+        self._hist_src = hist
+        if hist is None:
+            self.hist = None
+            return
+        h = np.asarray(hist, dtype=np.float32).reshape(HS_BINS)
+        self.hist = h.copy() if h.max() > 0 else None
+
+    def segment(self, bgr_roi: np.ndarray):
+        st = self.stats
+        st["calls"] += 1
+        hist = self.hist
+        if hist is None or bgr_roi is None or bgr_roi.size == 0:
+            return None
+        t0 = time.perf_counter()
+        h, w = bgr_roi.shape[:2]
+        s = min(1.0, self.scale)
+        if self._ns_per_px > 0:
+            pred_ms = self._ns_per_px * (w * s) * (h * s) / 1e6
+            if pred_ms > self.budget_ms:
+                s *= (self.budget_ms / pred_ms) ** 0.5
+                if s < self.min_scale:
+                    st["skipped"] += 1
+                    st["last_ms"] = 0.0
+                    return None
+        sw, sh = max(8, int(w * s)), max(8, int(h * s))
+        small = bgr_roi if (sw, sh) == (w, h) else cv2.resize(bgr_roi, (sw, sh), interpolation=cv2.INTER_LINEAR)
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        bp = cv2.calcBackProject([hsv], [0, 1], hist, _HS_RANGES, 1)
+        _, m = cv2.threshold(bp, self.thresh, 255, cv2.THRESH_BINARY)
+        m = cv2.morphologyEx(m, cv2.MORPH_OPEN, None)
+        if (sw, sh) != (w, h):
+            m = cv2.resize(m, (w, h), interpolation=cv2.INTER_NEAREST)
+
+        ms = (time.perf_counter() - t0) * 1000.0
+        ns_px = ms * 1e6 / (sw * sh)
+        self._ns_per_px = ns_px if self._ns_per_px <= 0 else 0.8 * self._ns_per_px + 0.2 * ns_px
+        st["refined"] += 1
+        st["last_ms"] = ms
+        st["avg_ms"] = ms if st["refined"] == 1 else 0.9 * st["avg_ms"] + 0.1 * ms
+        st["max_ms"] = max(st["max_ms"], ms)
+        st["scale"] = s
+        if ms > self.budget_ms:
+            st["over_budget"] += 1
+        return m
+
+    def learn_due(self) -> bool:
+        if self.hist is None:
+            return True
+        if self.learn_rate <= 0:
+            return False
+        self._since_learn += 1
+        return self._since_learn >= self.learn_every
+
+    def observe(self, bgr_roi: np.ndarray, mask_roi: np.ndarray):
+        self._since_learn = 0
+        h, w = bgr_roi.shape[:2]
+        sw, sh = max(8, int(w * self.scale)), max(8, int(h * self.scale))
+        if (sw, sh) != (w, h):
+            bgr_roi = cv2.resize(bgr_roi, (sw, sh), interpolation=cv2.INTER_LINEAR)
+            mask_roi = cv2.resize(mask_roi, (sw, sh), interpolation=cv2.INTER_NEAREST)
+        hsv = cv2.cvtColor(bgr_roi, cv2.COLOR_BGR2HSV)
+        new = cv2.calcHist([hsv], [0, 1], mask_roi, list(HS_BINS), _HS_RANGES)
+        if new.max() <= 0:
+            return
+        new = _smooth_hs_hist(new)
+        # 引用整体替换，segment 读到的总是完整的一张直方图
+        if self.hist is None:
+            self.hist = new
+        else:
+            self.hist = cv2.addWeighted(self.hist, 1.0 - self.learn_rate, new, self.learn_rate, 0.0)
+        self.stats["learned"] += 1
+
 class GloveTrackerC:
-    def __init__(self, hsv_lower=(20,80,80), hsv_upper=(40,255,255), erode=1, dilate=2, min_area=1500, segmenter=None):
-        self.hsv_lower = np.array(hsv_lower, dtype=np.uint8)
-        self.hsv_upper = np.array(hsv_upper, dtype=np.uint8)
+    """
+    颜色分割可用量化 BGR 查找表（update_hsv 时构建，calcBackProject 一次查表，省去 cvtColor + inRange）；
+    校准学到的非盒状颜色区域（color_bins）总是走查找表。只有 HSV 盒时默认仍用 cvtColor + inRange：
+    OpenCV 的 HSV 转换有 SIMD 优化，实测比逐像素查表略快（见 bench/bench_glove_lut.py）。
+
+    track_roi=True 时只在上一帧外接框附近的窗口里分割与找轮廓：
+    窗口按估计速度平移，并按速度放大边距（roi_pad_px + roi_speed_gain × 像素/帧）；
+    连续 roi_max_misses 次窗口内丢失、轮廓贴到窗口边缘、或每隔 roi_full_every 帧，回退到全帧搜索。
+
+    track_mode="camshift" 时，找到手套后改用色调-饱和度直方图反投影 + cv2.CamShift 跟踪：
+    只在上一帧外接框附近的区域（按 camshift_scale 缩小）做 cvtColor + 反投影，得到带方向的框，
+    再在同一块反投影上取轮廓求中心与指尖。
+    置信度（窗口内平均反投影）低于 camshift_min_conf、轮廓过小或贴边、或每隔 roi_full_every 帧，回退到轮廓检测。
+    直方图来自校准（set_track_hist），没有时由第一次轮廓检测到的手套像素学习。
+
+    hsv_adapt=True 时 HSV 阈值盒随光照缓慢漂移（见 _adapt_hsv），全帧连续 hsv_adapt_rollback_frames 帧
+    找不到手套则回滚到校准基线；重新校准 / 改配置阈值即重设基线。
+    """
+    def __init__(self, hsv_lower=(20,80,80), hsv_upper=(40,255,255), erode=1, dilate=2, min_area=1500, segmenter=None,
+                 track_roi=True, roi_pad_px=16, roi_speed_gain=2.0, roi_max_misses=1, roi_full_every=15,
+                 color_lut=False, color_bins=None, fingertip_depth_ratio=0.15, fingertip_max_angle_deg=80.0,
+                 track_mode="contour", track_hist=None, camshift_min_conf=0.3, camshift_thresh=30, camshift_scale=0.5,
+                 hsv_adapt=False, hsv_adapt_every=10, hsv_adapt_rate=0.2, hsv_adapt_max_step=(1, 4, 4),
+                 hsv_adapt_max_drift=(8, 60, 60), hsv_adapt_rollback_frames=90):
+        self.color_lut = bool(color_lut)
+        self.hsv_adapt = bool(hsv_adapt)
+        self.hsv_adapt_every = max(1, int(hsv_adapt_every))
+        self.hsv_adapt_rate = float(hsv_adapt_rate)
+        self.hsv_adapt_max_step = np.asarray(hsv_adapt_max_step, dtype=np.float32)
+        self.hsv_adapt_max_drift = np.asarray(hsv_adapt_max_drift, dtype=np.float32)
+        self.hsv_adapt_rollback_frames = max(1, int(hsv_adapt_rollback_frames))
+        self.fingertip_depth_ratio = float(fingertip_depth_ratio)
+        self.fingertip_max_angle_deg = float(fingertip_max_angle_deg)
+        self.update_hsv(hsv_lower, hsv_upper, color_bins)
         self.erode = int(erode)
         self.dilate = int(dilate)
         self.min_area = int(min_area)
         self.segmenter = segmenter or SegmenterBase()
 
-    def update_hsv(self, lower, upper):
+        self.track_roi = bool(track_roi)
+        self.roi_pad_px = int(roi_pad_px)
+        self.roi_speed_gain = float(roi_speed_gain)
+        self.roi_max_misses = max(1, int(roi_max_misses))
+        self.roi_full_every = max(1, int(roi_full_every))
+
+        self.track_mode = str(track_mode)
+        self.camshift_min_conf = float(camshift_min_conf)
+        self.camshift_thresh = int(camshift_thresh)
+        self.camshift_scale = float(camshift_scale)
+        self._track_hist = None
+        self._track_hist_src = None
+        self.set_track_hist(track_hist)
+        self.reset_tracking()
+
+    def reset_tracking(self):
+        self._rect = None          # 上一帧外接框 (x, y, w, h)
+        self._center = None
+        self._vel = (0.0, 0.0)     # 中心位移（像素/帧，EMA）
+        self._miss = 0
+        self._since_full = 0
+        self._frame_shape = None
+        self._cs_win = None        # CamShift 跟踪窗口 (x, y, w, h)
+        self._adapt_since = 0
+        self._adapt_lost = 0
+        self.stats = {"frames": 0, "full": 0, "roi": 0, "roi_miss": 0, "edge_retry": 0,
+                      "camshift": 0, "camshift_lost": 0, "hsv_adapt": 0, "hsv_rollback": 0, "hsv_adapt_ms": 0.0}
+
+    def set_track_hist(self, hist):
+        """CamShift 用的色调-饱和度直方图（校准 glove.hs_hist）；同一对象重复传入时保留已学到的直方图。"""
+        if hist is self._track_hist_src and self._track_hist is not None:
+            return
+        self._track_hist_src = hist
+        if hist is None:
+            self._track_hist = None
+            return
+        h = np.asarray(hist, dtype=np.float32).reshape(HS_BINS)
+        self._track_hist = h.copy() if h.max() > 0 else None
+
+    def update_hsv(self, lower, upper, color_bins=None):
+        key = (tuple(int(v) for v in lower), tuple(int(v) for v in upper), tuple(color_bins or ()))
+        if key == getattr(self, "_lut_key", None):
+            return
+        self._lut_key = key
         self.hsv_lower = np.array(lower, dtype=np.uint8)
         self.hsv_upper = np.array(upper, dtype=np.uint8)
+        self.color_bins = list(color_bins) if color_bins else None
+        # 校准/配置给出的基线：在线自适应只在其附近有限范围内漂移，跟丢太久时回滚到这里
+        self._hsv_base = (self.hsv_lower.copy(), self.hsv_upper.copy())
+        self._rebuild_lut()
 
-    def _hsv_mask(self, frame_bgr):
+    def _rebuild_lut(self):
+        lut = build_color_lut(self.hsv_lower, self.hsv_upper, self.color_bins)
+        # 引用整体替换，推理线程读到的总是完整的一张表
+        self._lut = (lut, _wrap_lut(lut), (lut > 0).astype(np.uint8) * 255)
+
+    def _set_hsv_bounds(self, lower, upper):
+        """自适应/回滚改阈值：不动基线与 _lut_key（配置未变时 update_hsv 不会覆盖自适应结果）。"""
+        self.hsv_lower = lower
+        self.hsv_upper = upper
+        if self.color_lut and not self.color_bins:
+            self._rebuild_lut()
+
+    def rollback_hsv(self):
+        """把 HSV 阈值恢复为校准基线。"""
+        lo, hi = self._hsv_base
+        if np.array_equal(lo, self.hsv_lower) and np.array_equal(hi, self.hsv_upper):
+            return
+        self._set_hsv_bounds(lo.copy(), hi.copy())
+        self.stats["hsv_rollback"] += 1
+
+    def _adapt_hsv(self, frame_bgr, cnt, area):
+        """
+        光照漂移自适应：每 hsv_adapt_every 帧，从可信轮廓（面积 ≥ 1.5×min_area）内、且落在放宽阈值盒内的像素
+        取 5%/95% 分位数，加上与校准相同的余量得到目标阈值；每次最多移动 rate×差值、且不超过 max_step，
+        累计偏离基线不超过 max_drift（收窄方向不超过 1/4）。学到的 color_bins 生效时阈值盒不参与分割，不做自适应。
+        """
+        if not self.hsv_adapt or self.color_bins:
+            return
+        self._adapt_since += 1
+        if self._adapt_since < self.hsv_adapt_every or area < 1.5 * self.min_area:
+            return
+        self._adapt_since = 0
+        t0 = time.perf_counter()
+        x, y, w, h = cv2.boundingRect(cnt)
+        roi = frame_bgr[y:y + h, x:x + w]
+        k = 1
+        if w * h > 4000:
+            # 隔点采样（最近邻缩小得到连续内存，比切片视图做 cvtColor 快），像素数量足够估计分位数
+            k = 2
+            roi = cv2.resize(roi, ((w + 1) // 2, (h + 1) // 2), interpolation=cv2.INTER_NEAREST)
+        m = np.zeros(roi.shape[:2], dtype=np.uint8)
+        cv2.drawContours(m, [(cnt - np.array([[[x, y]]], dtype=np.int32)) // k], -1, 255, -1)
+        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+        cur = np.stack([self.hsv_lower, self.hsv_upper]).astype(np.float32)      # (2,3)：下界 / 上界
+        relax = np.clip(cur + _ADAPT_RELAX, 0, 255).astype(np.uint8)
+        ok = cv2.inRange(hsv, relax[0], relax[1])
+        cv2.bitwise_and(ok, m, dst=ok)
+        n = cv2.countNonZero(ok)
+        if n >= 200:
+            # 逐通道直方图的累计分布取 5%/95% 分位数（比对像素数组做 percentile 快一个数量级）
+            cdf = np.cumsum(np.column_stack([cv2.calcHist([hsv], [c], ok, [256], [0, 256]) for c in range(3)]), axis=0)
+            q = np.stack([(cdf < 0.05 * n).sum(axis=0), (cdf < 0.95 * n).sum(axis=0)]).astype(np.float32)
+            step = self.hsv_adapt_max_step
+            new = cur + np.clip(self.hsv_adapt_rate * (q + _ADAPT_MARGIN - cur), -step, step)
+            # 向外放宽最多 max_drift；向内收窄最多其 1/4（样本只来自已检出的区域，收窄过头会越跟越窄）
+            base = np.stack(self._hsv_base).astype(np.float32)
+            drift = self.hsv_adapt_max_drift
+            new = np.clip(new, np.maximum(base - drift * _ADAPT_OUT_IN[0], 0), np.minimum(base + drift * _ADAPT_OUT_IN[1], _HSV_TOP))
+            new[0] = np.minimum(new[0], new[1])
+            new = np.rint(new).astype(np.uint8)
+            if not (np.array_equal(new[0], self.hsv_lower) and np.array_equal(new[1], self.hsv_upper)):
+                self._set_hsv_bounds(new[0].copy(), new[1].copy())
+            self.stats["hsv_adapt"] += 1
+        self.stats["hsv_adapt_ms"] += (time.perf_counter() - t0) * 1000.0
+
+    def _color_mask(self, frame_bgr):
+        lut, lut_mat, lut_u8 = self._lut
+        if self.color_lut or self.color_bins:
+            if lut_mat is not None:
+                return cv2.calcBackProject([frame_bgr], [0, 1, 2], lut_mat, _LUT_RANGES, 1)
+            return lut_u8.reshape(-1)[color_bin_index(frame_bgr)]
         hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV)
-        mask = cv2.inRange(hsv, self.hsv_lower, self.hsv_upper)
+        return cv2.inRange(hsv, self.hsv_lower, self.hsv_upper)
+
+    def _hsv_mask(self, frame_bgr):
+        mask = self._color_mask(frame_bgr)
         if self.erode > 0:
             mask = cv2.erode(mask, None, iterations=self.erode)
         if self.dilate > 0:
             mask = cv2.dilate(mask, None, iterations=self.dilate)
         return mask
 
-    def process(self, frame_bgr):
-        # 1) HSV mask on full frame
-        mask = self._hsv_mask(frame_bgr)
-        cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    def _search(self, frame_bgr, win):
+        """在窗口 win=(x0,y0,x1,y1) 内分割，返回 (mask, 最大轮廓或 None)；轮廓为全帧坐标。"""
+        x0, y0, x1, y1 = win
+        mask = self._hsv_mask(frame_bgr[y0:y1, x0:x1])
+        cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(x0, y0))
         if not cnts:
-            return GloveFeatures(mask=mask)
+            return mask, None
+        cnt = max(cnts, key=cv2.contourArea)
+        if cv2.contourArea(cnt) < self.min_area:
+            return mask, None
+        return mask, cnt
+
+    def _roi_window(self, fw, fh):
+        x, y, w, h = self._rect
+        vx, vy = self._vel
+        pad = self.roi_pad_px + self.roi_speed_gain * (vx * vx + vy * vy) ** 0.5
+        # 按速度预测平移，再按边距扩展
+        x0 = int(max(0, x + vx - pad))
+        y0 = int(max(0, y + vy - pad))
+        x1 = int(min(fw, x + w + vx + pad))
+        y1 = int(min(fh, y + h + vy + pad))
+        if x1 - x0 < 8 or y1 - y0 < 8:
+            return None
+        return x0, y0, x1, y1
 
+    def _locate(self, frame_bgr):
+        """ROI 跟踪 + 全帧回退，返回 (mask, mask_offset, 轮廓或 None, 是否全帧)。"""
+        fh, fw = frame_bgr.shape[:2]
+        if self._frame_shape != (fh, fw):
+            # 分辨率（或推理缩放）变化：旧坐标失效
+            self.reset_tracking()
+            self._frame_shape = (fh, fw)
+        self.stats["frames"] += 1
+
+        win = None
+        if self.track_roi and self._rect is not None and self._since_full < self.roi_full_every:
+            win = self._roi_window(fw, fh)
+
+        if win is not None:
+            self.stats["roi"] += 1
+            self._since_full += 1
+            mask, cnt = self._search(frame_bgr, win)
+            if cnt is not None:
+                bx, by, bw, bh = cv2.boundingRect(cnt)
+                x0, y0, x1, y1 = win
+                # 轮廓贴到窗口内侧边缘（且不是画面边缘）：可能被截断，改做全帧
+                touch = ((bx <= x0 and x0 > 0) or (by <= y0 and y0 > 0) or
+                         (bx + bw >= x1 and x1 < fw) or (by + bh >= y1 and y1 < fh))
+                if not touch:
+                    self._miss = 0
+                    return mask, (x0, y0), cnt, False
+                self.stats["edge_retry"] += 1
+            else:
+                self.stats["roi_miss"] += 1
+                self._miss += 1
+                if self._miss < self.roi_max_misses:
+                    return mask, win[:2], None, False
+
+        self.stats["full"] += 1
+        self._since_full = 0
+        self._miss = 0
+        mask, cnt = self._search(frame_bgr, (0, 0, fw, fh))
+        return mask, (0, 0), cnt, True
+
+    def _update_motion(self, cnt, center):
+        self._rect = cv2.boundingRect(cnt)
+        if center is not None and self._center is not None:
+            vx = center[0] - self._center[0]
+            vy = center[1] - self._center[1]
+            self._vel = (0.5 * self._vel[0] + 0.5 * vx, 0.5 * self._vel[1] + 0.5 * vy)
+        self._center = center
+
+    def _camshift(self, frame_bgr):
+        """CamShift 跟踪一帧；置信度不足或需要重新锚定时返回 None（由调用方回退到轮廓检测）。"""
+        hist = self._track_hist
+        fh, fw = frame_bgr.shape[:2]
+        if (self._cs_win is None or hist is None or self._frame_shape != (fh, fw)
+                or self._since_full >= self.roi_full_every):
+            return None
+        self._since_full += 1
+        # 搜索区域：与 ROI 模式相同（上一帧轮廓外接框按速度平移并放大边距）
+        win = self._roi_window(fw, fh) if self._rect is not None else None
+        if win is None:
+            return self._camshift_lost()
+        sx0, sy0, sx1, sy1 = win
+        x, y, w, h = self._cs_win
+        vx, vy = self._vel
+        # 缩小后做反投影 / CamShift / 轮廓（最近邻缩放不混色），坐标再放大回去
+        k = self.camshift_scale if 0.2 <= self.camshift_scale < 1.0 else 1.0
+        crop = frame_bgr[sy0:sy1, sx0:sx1]
+        if k != 1.0:
+            crop = cv2.resize(crop, None, fx=k, fy=k, interpolation=cv2.INTER_NEAREST)
+        ch, cw = crop.shape[:2]
+        hsv = cv2.cvtColor(crop, cv2.COLOR_BGR2HSV)
+        bp = cv2.calcBackProject([hsv], [0, 1], hist, _HS_RANGES, 1)
+
+        wx = int(min(max(0, (x + vx - sx0) * k), cw - 1))
+        wy = int(min(max(0, (y + vy - sy0) * k), ch - 1))
+        win = (wx, wy, max(1, min(int(w * k), cw - wx)), max(1, min(int(h * k), ch - wy)))
+        box, (wx, wy, ww, wh) = cv2.CamShift(bp, win, (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 1))
+        if ww < 3 or wh < 3:
+            return self._camshift_lost()
+        conf = float(cv2.mean(bp[wy:wy + wh, wx:wx + ww])[0]) / 255.0
+        if conf < self.camshift_min_conf:
+            return self._camshift_lost()
+
+        _, mask = cv2.threshold(bp, self.camshift_thresh, 255, cv2.THRESH_BINARY)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, None)
+        cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not cnts:
+            return self._camshift_lost()
         cnt = max(cnts, key=cv2.contourArea)
-        area = cv2.contourArea(cnt)
-        if area < self.min_area:
-            return GloveFeatures(mask=mask)
+        area = cv2.contourArea(cnt) / (k * k)
+        bx, by, bw, bh = cv2.boundingRect(cnt)
+        # 轮廓过小，或贴到搜索区域内侧边缘（可能被截断）：交给轮廓检测
+        if area < self.min_area or ((bx <= 0 and sx0 > 0) or (by <= 0 and sy0 > 0) or
+                                    (bx + bw >= cw and sx1 < fw) or (by + bh >= ch and sy1 < fh)):
+            return self._camshift_lost()
+        if k != 1.0:
+            cnt = (cnt * (1.0 / k)).astype(np.int32)
+        cnt += np.array([[[sx0, sy0]]], dtype=np.int32)
+
+        self.stats["frames"] += 1
+        self.stats["camshift"] += 1
+        self._adapt_lost = 0
+        self._adapt_hsv(frame_bgr, cnt, area)
+        self._cs_win = (int(wx / k) + sx0, int(wy / k) + sy0, int(ww / k), int(wh / k))
+        (cx, cy), (bw2, bh2), ang = box
+        box = ((cx / k + sx0, cy / k + sy0), (bw2 / k, bh2 / k), ang)
+        # 中心仍取轮廓矩心，与轮廓模式一致（框中心只覆盖反投影窗口，手指伸出时会偏向掌心）
+        M = cv2.moments(cnt)
+        center = (int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"])) if M["m00"] > 1e-6 else (int(box[0][0]), int(box[0][1]))
+        self._update_motion(cnt, center)
+        fingertips, scores, dirs = find_fingertips(cnt, center, self.fingertip_depth_ratio,
+                                                   self.fingertip_max_angle_deg, area)
+        # mask 为缩小后的反投影阈值图，与帧坐标不对应，不返回
+        return GloveFeatures(contour=cnt, center=center, fingertips=fingertips, mask_offset=(sx0, sy0),
+                             full_search=False, fingertip_scores=scores, fingertip_dirs=dirs, box=box, track_conf=conf)
+
+    def _camshift_lost(self):
+        self.stats["camshift_lost"] += 1
+        self._cs_win = None
+        return None
+
+    def _seed_camshift(self, frame_bgr, cnt):
+        """轮廓检测成功后（重新）锚定 CamShift 窗口；没有直方图时从轮廓内像素学习。"""
+        x, y, w, h = cv2.boundingRect(cnt)
+        self._cs_win = (x, y, w, h)
+        if self._track_hist is None:
+            roi = frame_bgr[y:y + h, x:x + w]
+            m = np.zeros((h, w), dtype=np.uint8)
+            cv2.drawContours(m, [cnt], -1, 255, -1, offset=(-x, -y))
+            self._track_hist = learn_hs_hist(roi[m > 0])
+
+    def process(self, frame_bgr):
+        # 0) CamShift 模式：已锁定时先走反投影跟踪
+        if self.track_mode == "camshift":
+            feats = self._camshift(frame_bgr)
+            if feats is not None:
+                return feats
+
+        # 1) HSV mask：ROI 跟踪窗口或全帧
+        mask, mask_offset, cnt, full = self._locate(frame_bgr)
+        if cnt is None:
+            if full:
+                self._rect = None
+                self._center = None
+                self._vel = (0.0, 0.0)
+                # 自适应后长时间全帧找不到：可能漂到了背景色上，回滚到校准基线
+                self._adapt_lost += 1
+                if self.hsv_adapt and self._adapt_lost >= self.hsv_adapt_rollback_frames:
+                    self._adapt_lost = 0
+                    self.rollback_hsv()
+            return GloveFeatures(mask=mask, mask_offset=mask_offset, full_search=full)
+        self._adapt_lost = 0
+        self._adapt_hsv(frame_bgr, cnt, cv2.contourArea(cnt))
 
         # 2) ROI by bounding rect for optional segmenter
         x, y, w, h = cv2.boundingRect(cnt)
@@ -56,32 +660,32 @@ class GloveTrackerC:
         x1 = min(frame_bgr.shape[1], x + w + pad); y1 = min(frame_bgr.shape[0], y + h + pad)
         roi = frame_bgr[y0:y1, x0:x1]
 
-        # 3) optional segmenter refine (stub returns None now)
+        # 3) optional segmenter refine：先用颜色阈值轮廓喂在线学习，再精修
+        if self.segmenter.learn_due():
+            cmask = np.zeros(roi.shape[:2], dtype=np.uint8)
+            cv2.drawContours(cmask, [cnt], -1, 255, -1, offset=(-x0, -y0))
+            self.segmenter.observe(roi, cmask)
         seg = self.segmenter.segment(roi)
         if seg is not None:
             # seg expected 0/255 mask in ROI coords
             mask_roi = seg.astype(np.uint8)
-            cnts2, _ = cv2.findContours(mask_roi, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            cnts2, _ = cv2.findContours(mask_roi, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(x0, y0))
             if cnts2:
-                cnt_roi = max(cnts2, key=cv2.contourArea)
-                cnt = cnt_roi + np.array([[[x0, y0]]], dtype=np.int32)
+                cnt_seg = max(cnts2, key=cv2.contourArea)
+                if cv2.contourArea(cnt_seg) >= self.min_area:
+                    cnt = cnt_seg
 
         # 4) center
         M = cv2.moments(cnt)
         center = None
         if M["m00"] > 1e-6:
             center = (int(M["m10"]/M["m00"]), int(M["m01"]/M["m00"]))
+        self._update_motion(cnt, center)
+        if self.track_mode == "camshift":
+            self._seed_camshift(frame_bgr, cnt)
+
+        # 5) fingertips from convexity defects
+        fingertips, scores, dirs = find_fingertips(cnt, center, self.fingertip_depth_ratio, self.fingertip_max_angle_deg)
 
-        # 5) fingertips from hull (rough)
-        fingertips = []
-        hull = cv2.convexHull(cnt, returnPoints=True)
-        if hull is not None and len(hull) > 5:
-            pts = hull[:, 0, :]
-            pts_sorted = pts[np.argsort(pts[:, 1])]
-            top = pts_sorted[:12]
-            for p in top:
-                if all(np.linalg.norm(p - np.array(q)) > 25 for q in fingertips):
-                    fingertips.append((int(p[0]), int(p[1])))
-            fingertips = fingertips[:5]
-
-        return GloveFeatures(mask=mask, contour=cnt, center=center, fingertips=fingertips, roi=roi, roi_offset=(x0,y0))
\ No newline at end of file
+        return GloveFeatures(mask=mask, contour=cnt, center=center, fingertips=fingertips, roi=roi, roi_offset=(x0,y0),
+                             mask_offset=mask_offset, full_search=full, fingertip_scores=scores, fingertip_dirs=dirs)
\ No newline at end of file
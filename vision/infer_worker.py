@@ -0,0 +1,83 @@
+import time
+import threading
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from vision.frame_buffers import FrameMailbox
+from vision.pipeline import InferencePipeline
+
+
+class InferenceWorker(QThread):
+    """
+    推理线程：持有 InferencePipeline（tracker / engine / 自定义匹配），
+    从 FrameMailbox 拉取最新一帧做推理，按 infer_fps 限频，结果通过 result_signal 投递回 GUI 线程。
+    """
+    result_signal = pyqtSignal(object)
+
+    def __init__(self, cfg: dict, state, mailbox: FrameMailbox, mode: str = "bare"):
+        super().__init__()
+        self.state = state
+        self.mailbox = mailbox
+        self.pipeline = InferencePipeline(cfg, state)
+
+        self._mode = mode
+        self._running = True
+        # 推理期间持有；配置替换与推理互斥
+        self._pipe_lock = threading.Lock()
+        # cfg 被原地修改后置位，由推理线程在两帧之间重建快照
+        self._refresh_pending = False
+
+        self._last_seq = 0
+        # 两次推理之间被跳过（推理线程没取到）的帧数累计
+        self.frames_skipped = 0
+
+    # ---------------- GUI 线程调用 ----------------
+    def set_mode(self, mode: str):
+        self._mode = mode
+
+    def set_config(self, cfg: dict):
+        # 等当前这一帧推理结束后整体替换（最多阻塞一次推理的时间）
+        with self._pipe_lock:
+            self.pipeline.set_config(cfg)
+            self._refresh_pending = False
+
+    def refresh_config(self):
+        # 只做标记：engine 快照 / 手套跟踪器 / 关键点滤波的重建都在推理线程里、下一帧推理前进行，
+        # 不与 process() 并发改写这些状态（调参时每次改动都会调用，不阻塞 GUI）
+        self._refresh_pending = True
+
+    def stop(self):
+        self._running = False
+
+    # ---------------- 推理线程 ----------------
+    def run(self):
+        last_start = 0.0
+        while self._running:
+            infer_fps = int(self.pipeline.cfg["general"].get("infer_fps", 12))
+            interval = 1.0 / max(5, infer_fps)
+            wait = last_start + interval - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+
+            got = self.mailbox.wait_latest(self._last_seq, 0.2, reader="infer")
+            if got is None:
+                continue
+            seq, frame, t_ns = got
+            if self._last_seq and seq > self._last_seq + 1:
+                self.frames_skipped += seq - self._last_seq - 1
+            self._last_seq = seq
+            try:
+                if not (self.state.recognition_enabled and self.state.camera_device_enabled):
+                    continue
+
+                last_start = time.perf_counter()
+                with self._pipe_lock:
+                    if self._refresh_pending:
+                        # 先清标记再重建：重建期间再次改动会在下一帧再应用一次
+                        self._refresh_pending = False
+                        self.pipeline.refresh_config()
+                    res = self.pipeline.process(frame, self._mode, seq=seq, t_ns=t_ns)
+            finally:
+                # 结果里不再引用整帧，推理结束即可归还缓冲
+                self.mailbox.release(frame)
+            self.result_signal.emit(res)
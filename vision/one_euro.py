@@ -0,0 +1,49 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+
+def _alpha(dt: float, cutoff):
+    """一阶低通在截止频率 cutoff（Hz，可为数组）、采样间隔 dt（秒）下的平滑系数。"""
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    One-Euro 滤波（Casiez et al., CHI 2012）：截止频率 = min_cutoff + beta × |平滑后的速度|。
+    静止时截止频率低、抖动被压住；快速移动时截止频率升高、滞后变小。
+    x 可为标量或任意形状的数组（如光标 (2,) 或关键点 (21,2)），逐元素独立滤波；时间戳单位为秒。
+    beta 与坐标单位相关（速度按 单位/秒 计）。
+    """
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.007, d_cutoff: float = 1.0):
+        self.min_cutoff = float(min_cutoff)
+        self.beta = float(beta)
+        self.d_cutoff = float(d_cutoff)
+        self.reset()
+
+    def reset(self):
+        self._x: Optional[np.ndarray] = None
+        self._dx: Optional[np.ndarray] = None
+        self._t: Optional[float] = None
+
+    def __call__(self, x, t_s: float) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float64)
+        if self._x is None or self._x.shape != x.shape:
+            self._x = x.copy()
+            self._dx = np.zeros_like(x)
+            self._t = float(t_s)
+            return self._x.copy()
+
+        dt = float(t_s) - self._t
+        if dt <= 0:
+            # 同一时刻重复输入（或时钟回退）：不更新
+            return self._x.copy()
+        self._t = float(t_s)
+
+        dx = (x - self._x) / dt
+        self._dx += _alpha(dt, self.d_cutoff) * (dx - self._dx)
+        a = _alpha(dt, self.min_cutoff + self.beta * np.abs(self._dx))
+        self._x += a * (x - self._x)
+        return self._x.copy()
@@ -0,0 +1,214 @@
+import copy
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from vision.bare_mediapipe import BareHandTracker
+from vision.gesture_engine import GestureEngine
+from vision.glove_tracker_c import GloveTrackerC, GloveFeatures, SegmenterBase, HistBackprojSegmenter
+from vision.custom_gestures import CustomGestureManager
+from vision.one_euro import OneEuroFilter
+
+
+@dataclass
+class InferResult:
+    """一次推理的结果（由推理线程产出，经 queued signal 送回 GUI 线程）。"""
+    mode: str
+    frame_w: int
+    frame_h: int
+    # 帧序号与采集时刻（time.monotonic_ns），lm / glove_feats / event 均对应这一帧
+    seq: int = 0
+    t_capture_ns: int = 0
+    lm: Optional[np.ndarray] = None
+    glove_feats: Optional[GloveFeatures] = None
+    event: Optional[str] = None
+    raw_static: Optional[str] = None
+    scroll: Optional[dict] = None
+    debug: dict = field(default_factory=dict)
+    # 各阶段耗时（ms）：resize / track（手套模式含 segment）/ engine（含 custom）/ custom / total
+    timings: dict = field(default_factory=dict)
+    # perf_counter 时间点，GUI 侧据此计算投递延迟
+    t_done: float = 0.0
+
+
+class InferencePipeline:
+    """
+    不依赖 Qt 的推理流水线：resize -> tracker -> engine（含自定义手势流式检出）。
+    持有 tracker / engine / custom_mgr，可在推理线程或无界面脚本中直接调用。
+    """
+    def __init__(self, cfg: dict, state):
+        self.state = state
+        self.tracker = BareHandTracker(min_det=0.6, min_track=0.6)
+        self.glove = GloveTrackerC()
+        # 送入 engine 的关键点滤波（general.landmark_filter），res.lm 保持原始值
+        self.lm_filter = OneEuroFilter()
+
+        # 推理缩放输出缓冲（仅推理线程使用，尺寸变化时重建）
+        self._infer_buf = None
+
+        self.set_config(cfg)
+
+    def set_config(self, cfg: dict):
+        self.cfg = cfg
+        self.custom_mgr = CustomGestureManager(cfg)
+        self.engine = GestureEngine(cfg, custom_mgr=self.custom_mgr)
+        # 新配置：手套部分全部重新应用
+        self._glove_applied = {}
+        self._apply_glove_cfg()
+        self._apply_filter_cfg()
+        self.glove.reset_tracking()
+
+    def _glove_changed(self, name: str, value) -> bool:
+        """与上次应用到跟踪器的配置值比较（列表按内容比较）；变化时记下新值并返回 True。"""
+        if name in self._glove_applied and self._glove_applied[name] == value:
+            return False
+        self._glove_applied[name] = copy.deepcopy(value)
+        return True
+
+    def _apply_glove_cfg(self):
+        """
+        只重建配置里真正变化的部分：颜色表、跟踪模式、CamShift 直方图、自适应回滚、分割器各自按值比较，
+        调其它参数时不会重建 LUT、清空跟踪或丢掉在线学到的直方图。标量参数直接赋值。
+        """
+        glove_cfg = self.cfg.get("glove", {}) or {}
+        self.glove.color_lut = bool(glove_cfg.get("color_lut", False))
+        lower = glove_cfg.get("hsv_lower", [20, 80, 80])
+        upper = glove_cfg.get("hsv_upper", [40, 255, 255])
+        bins = glove_cfg.get("color_bins") if glove_cfg.get("color_model", "auto") == "auto" else None
+        if self._glove_changed("hsv", (lower, upper, bins)):
+            self.glove.update_hsv(lower, upper, bins)
+        self.glove.erode = int(glove_cfg.get("erode", 1))
+        self.glove.dilate = int(glove_cfg.get("dilate", 2))
+        self.glove.min_area = int(glove_cfg.get("min_area", 1500))
+        self.glove.fingertip_depth_ratio = float(glove_cfg.get("fingertip_depth_ratio", 0.15))
+        self.glove.fingertip_max_angle_deg = float(glove_cfg.get("fingertip_max_angle_deg", 80))
+        self.glove.track_roi = bool(glove_cfg.get("track_roi", True))
+        self.glove.roi_pad_px = int(glove_cfg.get("roi_pad_px", 16))
+        self.glove.roi_speed_gain = float(glove_cfg.get("roi_speed_gain", 2.0))
+        self.glove.roi_max_misses = max(1, int(glove_cfg.get("roi_max_misses", 1)))
+        self.glove.roi_full_every = max(1, int(glove_cfg.get("roi_full_every", 15)))
+        mode = str(glove_cfg.get("track_mode", "contour"))
+        if self._glove_changed("track_mode", mode) and mode != self.glove.track_mode:
+            self.glove.reset_tracking()
+        self.glove.track_mode = mode
+        self.glove.camshift_min_conf = float(glove_cfg.get("camshift_min_conf", 0.3))
+        self.glove.camshift_thresh = int(glove_cfg.get("camshift_thresh", 30))
+        self.glove.camshift_scale = float(glove_cfg.get("camshift_scale", 0.5))
+        hs_hist = glove_cfg.get("hs_hist")
+        hist_changed = self._glove_changed("hs_hist", hs_hist)
+        if hist_changed:
+            self.glove.set_track_hist(hs_hist)
+        self.glove.hsv_adapt = bool(glove_cfg.get("hsv_adapt", False))
+        self.glove.hsv_adapt_every = max(1, int(glove_cfg.get("hsv_adapt_every", 10)))
+        self.glove.hsv_adapt_rate = float(glove_cfg.get("hsv_adapt_rate", 0.2))
+        self.glove.hsv_adapt_max_step = np.asarray(glove_cfg.get("hsv_adapt_max_step", [1, 4, 4]), dtype=np.float32)
+        self.glove.hsv_adapt_max_drift = np.asarray(glove_cfg.get("hsv_adapt_max_drift", [8, 60, 60]), dtype=np.float32)
+        self.glove.hsv_adapt_rollback_frames = max(1, int(glove_cfg.get("hsv_adapt_rollback_frames", 90)))
+        # 只在关闭自适应的那一次回滚；阈值随校准变化时 update_hsv 已重置基线
+        if self._glove_changed("hsv_adapt", self.glove.hsv_adapt) and not self.glove.hsv_adapt:
+            self.glove.rollback_hsv()
+
+        # ROI 精修分割器：none / hist_backproj（切换类型时重建，保持同类型时只更新参数，保留在线学到的直方图）
+        kind = str(glove_cfg.get("segmenter", "none"))
+        seg = self.glove.segmenter
+        if kind == "hist_backproj":
+            created = not isinstance(seg, HistBackprojSegmenter)
+            if created:
+                seg = HistBackprojSegmenter()
+            seg.scale = float(glove_cfg.get("segmenter_scale", 0.5))
+            seg.thresh = int(glove_cfg.get("segmenter_thresh", 30))
+            seg.budget_ms = float(glove_cfg.get("segmenter_budget_ms", 2.0))
+            seg.learn_rate = float(glove_cfg.get("segmenter_learn_rate", 0.05))
+            if created or hist_changed:
+                seg.set_hist(hs_hist)
+            if created:
+                self.glove.segmenter = seg
+        elif type(seg) is not SegmenterBase:
+            self.glove.segmenter = SegmenterBase()
+
+    def refresh_config(self):
+        """
+        cfg 原地被修改（UI 调参/编辑手势目录/手套校准）后调用：重建 engine 的配置快照与手套颜色表。
+        会改写 tracker / engine 状态，必须在执行 process() 的线程里、两帧之间调用（InferenceWorker 负责排队）。
+        """
+        self.engine.reload_config()
+        self._apply_glove_cfg()
+        self._apply_filter_cfg()
+
+    def _apply_filter_cfg(self):
+        g = self.cfg["general"]
+        on = bool(g.get("landmark_filter", False))
+        if not on:
+            self.lm_filter.reset()
+        self._lm_filter_on = on
+        self.lm_filter.min_cutoff = float(g.get("one_euro_min_cutoff", 1.0))
+        self.lm_filter.beta = float(g.get("one_euro_beta", 0.007))
+        self.lm_filter.d_cutoff = float(g.get("one_euro_d_cutoff", 1.0))
+
+    def process(self, frame: np.ndarray, mode: str, seq: int = 0, t_ns: int = None) -> InferResult:
+        t0 = time.perf_counter()
+        if t_ns is None:
+            t_ns = time.monotonic_ns()
+        t_ms = t_ns / 1e6
+        h, w = frame.shape[:2]
+        res = InferResult(mode=mode, frame_w=w, frame_h=h, seq=int(seq), t_capture_ns=int(t_ns))
+        tm = res.timings
+
+        scale = float(self.cfg["general"].get("infer_scale", 0.6))
+        if 0.2 < scale < 1.0:
+            iw, ih = int(w * scale), int(h * scale)
+            if self._infer_buf is None or self._infer_buf.shape != (ih, iw) + frame.shape[2:]:
+                self._infer_buf = np.empty((ih, iw) + frame.shape[2:], dtype=frame.dtype)
+            infer = cv2.resize(frame, (iw, ih), dst=self._infer_buf)
+        else:
+            infer = frame
+            scale = 1.0
+        t1 = time.perf_counter()
+        tm["resize_ms"] = (t1 - t0) * 1000.0
+
+        if mode == "bare":
+            lm2 = self.tracker.process(infer)
+            if lm2 is not None and scale != 1.0:
+                lm2 = lm2 / scale
+            t2 = time.perf_counter()
+            tm["track_ms"] = (t2 - t1) * 1000.0
+            res.lm = lm2
+            if lm2 is None:
+                self.lm_filter.reset()
+            elif self._lm_filter_on:
+                lm2 = self.lm_filter(lm2, t_ns / 1e9).astype(np.float32)
+
+            # 丢手时 engine 会清空自定义轨迹，不会拿残缺轨迹去匹配
+            event, raw_static, scroll, debug = self.engine.update_bare(lm2, self.state, t_ms)
+            tm["engine_ms"] = (time.perf_counter() - t2) * 1000.0
+            tm["custom_ms"] = self.engine.custom.last_ms if lm2 is not None else 0.0
+
+        else:
+            feats = self.glove.process(infer)
+            if scale != 1.0 and feats.center is not None:
+                feats.center = (int(feats.center[0] / scale), int(feats.center[1] / scale))
+                feats.fingertips = [(int(x / scale), int(y / scale)) for x, y in feats.fingertips]
+                if feats.box is not None:
+                    (bx, by), (bw, bh), ang = feats.box
+                    feats.box = ((bx / scale, by / scale), (bw / scale, bh / scale), ang)
+            t2 = time.perf_counter()
+            tm["track_ms"] = (t2 - t1) * 1000.0
+            if feats.contour is not None and "last_ms" in self.glove.segmenter.stats:
+                tm["segment_ms"] = self.glove.segmenter.stats["last_ms"]
+            res.glove_feats = feats
+
+            event, raw_static, scroll, debug = self.engine.update_glove(feats, self.state, t_ms)
+            tm["engine_ms"] = (time.perf_counter() - t2) * 1000.0
+
+        res.event = event
+        res.raw_static = raw_static
+        res.scroll = scroll
+        res.debug = debug
+        debug["seq"] = res.seq
+        res.t_done = time.perf_counter()
+        tm["capture_to_result_ms"] = (time.monotonic_ns() - t_ns) / 1e6
+        tm["total_ms"] = (res.t_done - t0) * 1000.0
+        return res
@@ -1,9 +1,26 @@
 import numpy as np
 
+def _resample_index(s: np.ndarray, t: np.ndarray):
+    """
+    在累计弧长 s 上定位目标 t 所在的段：j 为满足 s[j+1] >= t 的最小下标（夹到最后一段），
+    a 为段内插值系数；零长度段取段起点。s 可为 (L,) 或 (B,L)，t 相应为 (n,) 或 (B,n)。
+    """
+    if s.ndim == 1:
+        j = np.searchsorted(s[1:], t, side="left")
+    else:
+        j = (s[:, None, 1:] < t[:, :, None]).sum(axis=2)
+    j = np.minimum(j, s.shape[-1] - 2)
+    s0 = np.take_along_axis(s, j, axis=-1)
+    s1 = np.take_along_axis(s, j + 1, axis=-1)
+    ds = s1 - s0
+    flat = ds < 1e-6
+    a = np.where(flat, 0.0, (t - s0) / np.where(flat, 1.0, ds))
+    return j, a
+
 def resample_polyline(points: np.ndarray, n=64) -> np.ndarray:
     if points is None or len(points) < 2:
         return None
-    pts = points.astype(np.float32)
+    pts = np.asarray(points, dtype=np.float32)
     dif = np.diff(pts, axis=0)
     seg = np.linalg.norm(dif, axis=1)
     s = np.concatenate([[0.0], np.cumsum(seg)])
@@ -11,20 +28,10 @@ def resample_polyline(points: np.ndarray, n=64) -> np.ndarray:
     if total < 1e-6:
         return np.repeat(pts[:1], n, axis=0)
 
-    target = np.linspace(0.0, total, n, dtype=np.float32)
-    out = []
-    j = 0
-    for t in target:
-        while j < len(s) - 2 and s[j + 1] < t:
-            j += 1
-        s0, s1 = s[j], s[j + 1]
-        p0, p1 = pts[j], pts[j + 1]
-        if s1 - s0 < 1e-6:
-            out.append(p0)
-        else:
-            a = (t - s0) / (s1 - s0)
-            out.append(p0 * (1 - a) + p1 * a)
-    return np.stack(out, axis=0)
+    target = np.linspace(0.0, total, n, dtype=np.float32).astype(np.float64)
+    j, a = _resample_index(s, target)
+    a = a[:, None]
+    return (pts[j] * (1 - a) + pts[j + 1] * a).astype(np.float32)
 
 def normalize_trajectory(points: np.ndarray, n=64) -> np.ndarray:
     rs = resample_polyline(points, n=n)
@@ -38,7 +45,46 @@ def normalize_trajectory(points: np.ndarray, n=64) -> np.ndarray:
     rs = rs / scale
     return rs.astype(np.float32)
 
+def normalize_trajectories(points_list, n=64):
+    """
+    批量版 normalize_trajectory（离线评估用）：不等长轨迹用末点补齐后一次性重采样与归一化。
+    返回 (out(B,n,2) float32, valid(B,) bool)；点数 < 2 的轨迹对应行全 0、valid 为 False。
+    """
+    b = len(points_list)
+    out = np.zeros((b, n, 2), dtype=np.float32)
+    valid = np.array([p is not None and len(p) >= 2 for p in points_list], dtype=bool)
+    if not valid.any():
+        return out, valid
+
+    rows = [np.asarray(p, dtype=np.float32) for p, ok in zip(points_list, valid) if ok]
+    m = max(len(p) for p in rows)
+    pts = np.empty((len(rows), m, 2), dtype=np.float32)
+    for i, p in enumerate(rows):
+        pts[i, :len(p)] = p
+        pts[i, len(p):] = p[-1]  # 补齐段长度为 0，不影响弧长
+
+    seg = np.linalg.norm(np.diff(pts, axis=1), axis=2)
+    s = np.concatenate([np.zeros((len(rows), 1)), np.cumsum(seg, axis=1)], axis=1)
+    total = s[:, -1]
+    target = (np.linspace(0.0, 1.0, n, dtype=np.float32)[None, :] * total[:, None].astype(np.float32)).astype(np.float64)
+    # np.linspace(0, total) 末点恰为 total；乘法可能有舍入，这里显式对齐
+    target[:, -1] = total.astype(np.float32)
+    j, a = _resample_index(s, target)
+    a = a[:, :, None]
+    p0 = np.take_along_axis(pts, j[:, :, None], axis=1)
+    p1 = np.take_along_axis(pts, j[:, :, None] + 1, axis=1)
+    rs = (p0 * (1 - a) + p1 * a).astype(np.float32)
+    # 零长度轨迹：与单条版本一致，重复首点
+    still = total < 1e-6
+    rs[still] = pts[still, :1]
+
+    rs = rs - rs.mean(axis=1, keepdims=True)
+    scale = np.sqrt((rs ** 2).sum(axis=2).mean(axis=1))
+    scale[scale < 1e-6] = 1.0
+    out[valid] = (rs / scale[:, None, None]).astype(np.float32)
+    return out, valid
+
 def template_distance(a: np.ndarray, b: np.ndarray) -> float:
     if a is None or b is None or a.shape != b.shape:
         return 1e9
-    return float(np.linalg.norm(a - b, axis=1).mean())
\ No newline at end of file
+    return float(np.linalg.norm(a - b, axis=1).mean())